@@ -0,0 +1,207 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from typing import NamedTuple
+
+from product_basket import Basket, Product
+from shipping_policy import DEFAULT_SHIPPING_POLICY, ShippingPolicy
+
+
+class TierStats(NamedTuple):
+    """Non-empty tracked baskets whose total price falls in one shipping tier."""
+
+    low: int  # Lowest total price of the tier
+    high: int | None  # First total price above the tier (None for the last)
+    baskets: int
+    revenue: int  # Sum of the baskets' total prices
+
+
+class AggregateRegistry:
+    """
+    Live figures across a set of tracked baskets, kept up to date by deltas.
+
+    Tracked baskets report every line change to the registry, which updates
+    per-product unit counters, the reserved weight and a histogram of baskets
+    and revenue by shipping tier in O(1) per change. Products are also
+    bucketed by units held, with the L distinct unit counts kept in a sorted
+    list, so the most-carted products are read without scanning the counters;
+    a change that opens or empties a bucket costs O(L) to keep it sorted.
+
+    The registry holds a reference to every tracked basket until it is
+    untracked, so a basket that is dropped, e.g. evicted from a store, must be
+    untracked too or it keeps counting in the figures.
+    """
+
+    def __init__(self, shipping_policy: ShippingPolicy | None = None) -> None:
+        """
+        Initialize a registry that tracks no baskets.
+
+        :param shipping_policy: Tiers of the histogram (default tiers if None);
+            the tiers in effect now are used even if the policy changes later
+        :raises TypeError: if shipping_policy is not a ShippingPolicy
+        """
+        if shipping_policy is None:
+            shipping_policy = DEFAULT_SHIPPING_POLICY
+        elif not isinstance(shipping_policy, ShippingPolicy):
+            raise TypeError(
+                f"Expected a ShippingPolicy object, got {type(shipping_policy).__name__}"
+            )
+        self._thresholds = shipping_policy.thresholds
+        self._tier_baskets = [0] * (len(self._thresholds) + 1)
+        self._tier_revenue = [0] * (len(self._thresholds) + 1)
+        self._baskets: dict[int, list] = {}  # id -> [basket, counted total price]
+        self._products: dict[int, Product] = {}
+        self._units: dict[int, int] = {}  # Product ID -> units held
+        self._by_units: dict[int, set[int]] = {}  # Units held -> product IDs
+        self._levels: list[int] = []  # Sorted keys of _by_units
+        self._total_units = 0
+        self._reserved_weight = 0
+
+    def __len__(self) -> int:
+        return len(self._baskets)
+
+    def track(self, basket: Basket) -> None:
+        """
+        Starts tracking a basket, counting its current lines.
+
+        :param basket: The basket to track
+        :raises TypeError: if basket is not a Basket
+        :raises ValueError: if the basket is already tracked
+        """
+        if not isinstance(basket, Basket):
+            raise TypeError(f"Expected a Basket object, got {type(basket).__name__}")
+        if basket._aggregates is not None:
+            raise ValueError("The basket is already tracked.")
+        basket._aggregates = self
+        self._baskets[id(basket)] = [basket, None]
+        for product, quantity in basket.iter_lines():
+            self._count(product, quantity)
+        self._move(id(basket), basket.total_price)
+
+    def untrack(self, basket: Basket) -> None:
+        """
+        Stops tracking a basket, e.g. at checkout, and subtracts its lines.
+
+        :param basket: A basket tracked by this registry
+        :raises TypeError: if basket is not a Basket
+        :raises ValueError: if the basket is not tracked by this registry
+        """
+        if not isinstance(basket, Basket):
+            raise TypeError(f"Expected a Basket object, got {type(basket).__name__}")
+        if basket._aggregates is not self:
+            raise ValueError("The basket is not tracked by this registry.")
+        for product, quantity in basket.iter_lines():
+            self._count(product, -quantity)
+        self._move(id(basket), None)
+        del self._baskets[id(basket)]
+        basket._aggregates = None
+
+    def record_change(self, basket: Basket, product: Product, change: int) -> None:
+        """Applies a change in a tracked basket's line, after its totals moved."""
+        self._count(product, change)
+        self._move(id(basket), basket._total_price)
+
+    def _count(self, product: Product, change: int) -> None:
+        """Adds units of a product to the counters."""
+        product_id = product.id
+        old = self._units.get(product_id, 0)
+        new = old + change
+        if old:
+            self._unbucket(product_id, old)
+        if new:
+            self._units[product_id] = new
+            self._products[product_id] = product
+            bucket = self._by_units.get(new)
+            if bucket is None:
+                bucket = self._by_units[new] = set()
+                insort(self._levels, new)
+            bucket.add(product_id)
+        else:
+            del self._units[product_id]
+            del self._products[product_id]
+        self._total_units += change
+        self._reserved_weight += product.weight * change
+
+    def _unbucket(self, product_id: int, units: int) -> None:
+        bucket = self._by_units[units]
+        bucket.discard(product_id)
+        if not bucket:
+            del self._by_units[units]
+            del self._levels[bisect_left(self._levels, units)]
+
+    def _move(self, basket_id: int, total_price: int | None) -> None:
+        """
+        Moves a basket's revenue to the tier of its new total (None drops it).
+
+        Empty baskets pay no shipping, so a total of 0 is kept out of the tiers.
+        """
+        state = self._baskets[basket_id]
+        old = state[1]
+        if old:
+            tier = bisect_right(self._thresholds, old)
+            self._tier_baskets[tier] -= 1
+            self._tier_revenue[tier] -= old
+        if total_price:
+            tier = bisect_right(self._thresholds, total_price)
+            self._tier_baskets[tier] += 1
+            self._tier_revenue[tier] += total_price
+        state[1] = total_price
+
+    @property
+    def total_units(self) -> int:
+        """Returns the number of product units held in tracked baskets."""
+        return self._total_units
+
+    @property
+    def reserved_weight(self) -> int:
+        """Returns the total weight of products held in tracked baskets."""
+        return self._reserved_weight
+
+    def units(self, product_id: int) -> int:
+        """Returns the units of a product held in tracked baskets."""
+        return self._units.get(product_id, 0)
+
+    def top_products(self, count: int = 10) -> list[tuple[Product, int]]:
+        """
+        Returns the most-carted products with their units, most units first.
+
+        Ties are ordered by product ID. Only the buckets of the returned
+        products are visited, and each is scanned once for its lowest IDs
+        instead of sorted, in O(b * log count) for a bucket of b products.
+
+        :param count: Maximum number of products returned
+        :raises TypeError: if count is not a positive integer
+        """
+        if not isinstance(count, int) or count < 1:
+            raise TypeError(f"Expected a positive integer, got {type(count).__name__}")
+        top: list[tuple[Product, int]] = []
+        for units in reversed(self._levels):
+            bucket = self._by_units[units]
+            for product_id in heapq.nsmallest(count - len(top), bucket):
+                top.append((self._products[product_id], units))
+            if len(top) == count:
+                break
+        return top
+
+    def tiers(self) -> list[TierStats]:
+        """Returns the non-empty baskets and revenue in each shipping tier."""
+        lows = (0, *self._thresholds)
+        highs = (*self._thresholds, None)
+        return [
+            TierStats(low, high, baskets, revenue)
+            for low, high, baskets, revenue in zip(
+                lows, highs, self._tier_baskets, self._tier_revenue
+            )
+        ]
+
+    def snapshot(self, top: int = 10) -> dict:
+        """Returns all figures as plain Python data."""
+        return {
+            "baskets": len(self._baskets),
+            "total_units": self._total_units,
+            "reserved_weight": self._reserved_weight,
+            "tiers": [tier._asdict() for tier in self.tiers()],
+            "top_products": [
+                {"id": product.id, "name": product.name, "units": units}
+                for product, units in self.top_products(top)
+            ],
+        }
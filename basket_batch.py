@@ -0,0 +1,197 @@
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from product_basket import Basket
+from shipping_policy import DEFAULT_SHIPPING_POLICY, ShippingPolicy
+
+IntArray = npt.NDArray[np.int64]
+
+
+class BasketBatch:
+    """A columnar view of many baskets priced in vectorized passes."""
+
+    def __init__(
+        self,
+        basket_ids: npt.ArrayLike,
+        total_price: npt.ArrayLike,
+        total_weight: npt.ArrayLike,
+        item_count: npt.ArrayLike,
+        shipping_policy: ShippingPolicy = DEFAULT_SHIPPING_POLICY,
+    ) -> None:
+        """
+        Initialize a batch from per-basket columns.
+
+        :param basket_ids: Identifier of each basket
+        :param total_price: Total product price of each basket
+        :param total_weight: Total product weight of each basket
+        :param item_count: Number of product units in each basket
+        :param shipping_policy: Shipping tiers applied to every basket
+        :raises ValueError: if the columns have different lengths
+        """
+        self._policies = [shipping_policy]
+        self._policy_index: IntArray | None = None  # Row -> _policies (None: all 0)
+        self._basket_ids = np.asarray(basket_ids)
+        self._total_price = np.asarray(total_price, dtype=np.int64)
+        self._total_weight = np.asarray(total_weight, dtype=np.int64)
+        self._item_count = np.asarray(item_count, dtype=np.int64)
+
+        lengths = {
+            len(column)
+            for column in (
+                self._basket_ids,
+                self._total_price,
+                self._total_weight,
+                self._item_count,
+            )
+        }
+        if len(lengths) > 1:
+            raise ValueError("All batch columns must have the same length.")
+
+    @classmethod
+    def from_baskets(
+        cls,
+        baskets: Sequence[Basket],
+        basket_ids: Iterable | None = None,
+        shipping_policy: ShippingPolicy | None = None,
+    ) -> "BasketBatch":
+        """
+        Builds a batch from live baskets using their maintained totals.
+
+        :param baskets: Baskets to price
+        :param basket_ids: Identifiers of the baskets (defaults to their positions)
+        :param shipping_policy: Shipping tiers applied to every basket (each
+            basket's own policy if None)
+        :raises TypeError: if an element is not a Basket
+        """
+        for basket in baskets:
+            if not isinstance(basket, Basket):
+                raise TypeError(
+                    f"Expected a Basket object, got {type(basket).__name__}"
+                )
+
+        count = len(baskets)
+        ids = np.arange(count) if basket_ids is None else np.asarray(list(basket_ids))
+        batch = cls(
+            ids,
+            np.fromiter((b.total_price for b in baskets), np.int64, count),
+            np.fromiter((b.total_weight for b in baskets), np.int64, count),
+            np.fromiter((b.item_count for b in baskets), np.int64, count),
+            DEFAULT_SHIPPING_POLICY if shipping_policy is None else shipping_policy,
+        )
+        if shipping_policy is None:
+            # Baskets sharing a policy object are priced in one pass, as in checkout.
+            indices: dict[int, int] = {}
+            policies: list[ShippingPolicy] = []
+            for basket in baskets:
+                policy = basket.shipping_policy
+                if id(policy) not in indices:
+                    indices[id(policy)] = len(policies)
+                    policies.append(policy)
+            if policies:
+                batch._policies = policies
+            if len(policies) > 1:
+                batch._policy_index = np.fromiter(
+                    (indices[id(b.shipping_policy)] for b in baskets), np.int64, count
+                )
+        return batch
+
+    @classmethod
+    def from_lines(
+        cls,
+        basket_ids: npt.ArrayLike,
+        prices: npt.ArrayLike,
+        weights: npt.ArrayLike,
+        quantities: npt.ArrayLike,
+        shipping_policy: ShippingPolicy = DEFAULT_SHIPPING_POLICY,
+    ) -> "BasketBatch":
+        """
+        Builds a batch from raw line columns, one row per (basket, product) line.
+
+        The resulting batch holds one row per distinct basket ID, in sorted order.
+
+        :param basket_ids: Basket identifier of each line
+        :param prices: Unit price of each line
+        :param weights: Unit weight of each line
+        :param quantities: Quantity of each line
+        :param shipping_policy: Shipping tiers applied to every basket
+        :raises ValueError: if the columns have different lengths
+        """
+        line_ids = np.asarray(basket_ids)
+        line_prices = np.asarray(prices, dtype=np.int64)
+        line_weights = np.asarray(weights, dtype=np.int64)
+        line_quantities = np.asarray(quantities, dtype=np.int64)
+        if not (
+            len(line_ids)
+            == len(line_prices)
+            == len(line_weights)
+            == len(line_quantities)
+        ):
+            raise ValueError("All line columns must have the same length.")
+
+        unique_ids, groups = np.unique(line_ids, return_inverse=True)
+        order = np.argsort(groups, kind="stable")
+        bounds = np.zeros(len(unique_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(groups, minlength=len(unique_ids)), out=bounds[1:])
+
+        def group_sums(values: IntArray) -> IntArray:
+            # Prefix sums keep the reduction exact in int64, unlike bincount weights.
+            prefix = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum(values[order], out=prefix[1:])
+            return prefix[bounds[1:]] - prefix[bounds[:-1]]
+
+        return cls(
+            unique_ids,
+            group_sums(line_prices * line_quantities),
+            group_sums(line_weights * line_quantities),
+            group_sums(line_quantities),
+            shipping_policy,
+        )
+
+    def __len__(self) -> int:
+        return len(self._basket_ids)
+
+    @property
+    def basket_ids(self) -> npt.NDArray:
+        """Returns the identifier of each basket."""
+        return self._basket_ids
+
+    @property
+    def item_count(self) -> IntArray:
+        """Returns the number of product units in each basket."""
+        return self._item_count
+
+    @property
+    def total_price(self) -> IntArray:
+        """Returns the total price of products in each basket."""
+        return self._total_price
+
+    @property
+    def total_weight(self) -> IntArray:
+        """Returns the total weight of products in each basket."""
+        return self._total_weight
+
+    @property
+    def get_shipping_cost(self) -> IntArray:
+        """Returns the shipping cost of each basket under its policy."""
+        if self._policy_index is None:
+            policy = self._policies[0]
+            tiers = np.searchsorted(policy.thresholds, self._total_price, side="right")
+            costs = np.asarray(policy.costs, dtype=np.int64)[tiers]
+            return np.where(self._total_price == 0, 0, costs)
+
+        costs = np.zeros(len(self._total_price), dtype=np.int64)
+        for index, policy in enumerate(self._policies):
+            selected = self._policy_index == index
+            tiers = np.searchsorted(
+                policy.thresholds, self._total_price[selected], side="right"
+            )
+            costs[selected] = np.asarray(policy.costs, dtype=np.int64)[tiers]
+        costs[self._total_price == 0] = 0
+        return costs
+
+    @property
+    def get_price(self) -> IntArray:
+        """Returns the final price of each basket including shipping."""
+        return self._total_price + self.get_shipping_cost
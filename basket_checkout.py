@@ -0,0 +1,371 @@
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import numpy.typing as npt
+
+from basket_limits import DEFAULT_BASKET_LIMITS, BasketLimits
+from product_basket import Basket
+from shipping_policy import DEFAULT_SHIPPING_POLICY, ShippingPolicy
+
+IntArray = npt.NDArray[np.int64]
+
+# Reasons reported for baskets over their limits, by violation code.
+VIOLATIONS = (None, "max_items", "max_weight")
+
+# Shared-memory block layout, in int64 columns:
+#
+#   basket starts    (baskets + 1), index of each basket's first line
+#   max items        baskets
+#   max weight       baskets
+#   policy index     baskets, index into the shipping tier tables
+#   prices           lines, unit price of each line
+#   weights          lines
+#   quantities       lines
+#   results          RESULT_COLUMNS x baskets, written by the workers
+_INPUT_COLUMNS = ("max_items", "max_weight", "policy")
+_LINE_COLUMNS = ("prices", "weights", "quantities")
+RESULT_COLUMNS = (
+    "total_price",
+    "total_weight",
+    "item_count",
+    "shipping_cost",
+    "price",
+    "violation",
+)
+
+PolicyTable = tuple[tuple[int, ...], tuple[int, ...]]
+
+
+class CheckoutResult:
+    """Per-basket checkout results, in the order the baskets were given."""
+
+    def __init__(self, columns: dict[str, IntArray]) -> None:
+        """
+        Initialize the results from their columns.
+
+        :param columns: One array per name in RESULT_COLUMNS
+        """
+        self._columns = columns
+
+    def __len__(self) -> int:
+        return len(self._columns["price"])
+
+    @property
+    def total_price(self) -> IntArray:
+        """Returns the total price of products in each basket."""
+        return self._columns["total_price"]
+
+    @property
+    def total_weight(self) -> IntArray:
+        """Returns the total weight of products in each basket."""
+        return self._columns["total_weight"]
+
+    @property
+    def item_count(self) -> IntArray:
+        """Returns the number of product units in each basket."""
+        return self._columns["item_count"]
+
+    @property
+    def get_shipping_cost(self) -> IntArray:
+        """Returns the shipping cost of each basket."""
+        return self._columns["shipping_cost"]
+
+    @property
+    def get_price(self) -> IntArray:
+        """Returns the final price of each basket including shipping."""
+        return self._columns["price"]
+
+    @property
+    def violations(self) -> list[str | None]:
+        """Returns the limit each basket exceeds ("max_items", "max_weight") or None."""
+        return [VIOLATIONS[code] for code in self._columns["violation"].tolist()]
+
+
+def _layout(basket_count: int, line_count: int) -> dict[str, tuple[int, int]]:
+    """Returns the (offset, length) in int64 units of each column of the block."""
+    layout = {}
+    offset = 0
+    for name, length in [
+        ("starts", basket_count + 1),
+        *((name, basket_count) for name in _INPUT_COLUMNS),
+        *((name, line_count) for name in _LINE_COLUMNS),
+        *((name, basket_count) for name in RESULT_COLUMNS),
+    ]:
+        layout[name] = (offset, length)
+        offset += length
+    return layout
+
+
+def _columns(buffer, basket_count: int, line_count: int) -> dict[str, IntArray]:
+    """Returns int64 views of every column of a block."""
+    layout = _layout(basket_count, line_count)
+    words = np.ndarray((_block_words(layout),), dtype=np.int64, buffer=buffer)
+    return {
+        name: words[offset : offset + length]
+        for name, (offset, length) in layout.items()
+    }
+
+
+def _block_words(layout: dict[str, tuple[int, int]]) -> int:
+    """Returns the size of a block in int64 units."""
+    return sum(length for _, length in layout.values())
+
+
+def _price(
+    columns: dict[str, IntArray], policies: Sequence[PolicyTable], low: int, high: int
+) -> None:
+    """Prices and validates baskets `low` to `high`, writing the result columns."""
+    starts = columns["starts"][low : high + 1]
+    first, last = starts[0], starts[-1]
+    bounds = starts - first
+
+    def basket_sums(values: IntArray) -> IntArray:
+        # Prefix sums keep the reduction exact in int64, as in BasketBatch.
+        prefix = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(values, out=prefix[1:])
+        return prefix[bounds[1:]] - prefix[bounds[:-1]]
+
+    quantities = columns["quantities"][first:last]
+    total_price = basket_sums(columns["prices"][first:last] * quantities)
+    total_weight = basket_sums(columns["weights"][first:last] * quantities)
+    item_count = basket_sums(quantities)
+
+    shipping_cost = np.zeros(high - low, dtype=np.int64)
+    policy = columns["policy"][low:high]
+    for index, (thresholds, costs) in enumerate(policies):
+        selected = policy == index
+        tiers = np.searchsorted(thresholds, total_price[selected], side="right")
+        shipping_cost[selected] = np.asarray(costs, dtype=np.int64)[tiers]
+    shipping_cost[total_price == 0] = 0
+
+    violation = np.zeros(high - low, dtype=np.int64)
+    violation[total_weight > columns["max_weight"][low:high]] = 2
+    violation[item_count > columns["max_items"][low:high]] = 1  # Checked first
+
+    for name, values in [
+        ("total_price", total_price),
+        ("total_weight", total_weight),
+        ("item_count", item_count),
+        ("shipping_cost", shipping_cost),
+        ("price", total_price + shipping_cost),
+        ("violation", violation),
+    ]:
+        columns[name][low:high] = values
+
+
+def _price_shard(
+    block_name: str,
+    basket_count: int,
+    line_count: int,
+    policies: Sequence[PolicyTable],
+    low: int,
+    high: int,
+) -> None:
+    """Worker entry point: attaches to the shared block and prices one shard."""
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        columns = _columns(block.buf, basket_count, line_count)
+        _price(columns, policies, low, high)
+        del columns
+    finally:
+        block.close()
+
+
+def checkout(
+    baskets: Sequence[Basket],
+    limits: BasketLimits | None = None,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+    shard_size: int = 50_000,
+) -> CheckoutResult:
+    """
+    Reprices and validates many live baskets from their lines, across processes.
+
+    Baskets are read through their public API in this process and encoded as
+    int64 line columns in one shared-memory block; workers attach to it, price
+    contiguous shards of baskets with NumPy and write their results back into
+    the block, so no Product objects are pickled. Results match each basket's
+    own `get_price`. Reading the baskets is serial Python and dominates the
+    cost, so extra workers add little here; feeds that already hold line
+    columns should use `checkout_lines`, which does no per-line Python work.
+
+    :param baskets: Baskets to check out
+    :param limits: Limits to validate against (each basket's own if None)
+    :param max_workers: Worker processes (1 prices in this process)
+    :param executor: Process pool to reuse instead of starting one
+    :param shard_size: Maximum number of baskets per worker task
+    :raises TypeError: if an element is not a Basket or limits is invalid
+    :raises ValueError: if shard_size is less than 1
+    """
+    if limits is not None and not isinstance(limits, BasketLimits):
+        raise TypeError(f"Expected a BasketLimits object, got {type(limits).__name__}")
+    if shard_size < 1:
+        raise ValueError("Shard size must be at least 1.")
+
+    starts = [0]
+    prices: list[int] = []
+    weights: list[int] = []
+    quantities: list[int] = []
+    max_items = []
+    max_weight = []
+    policy_index = []
+    policies: dict[int, int] = {}
+    tables: list[PolicyTable] = []
+    for basket in baskets:
+        if not isinstance(basket, Basket):
+            raise TypeError(f"Expected a Basket object, got {type(basket).__name__}")
+        for product, quantity in basket.iter_lines():
+            prices.append(product.price)
+            weights.append(product.weight)
+            quantities.append(quantity)
+        starts.append(len(prices))
+        basket_limits = basket.limits if limits is None else limits
+        max_items.append(basket_limits.max_items)
+        max_weight.append(basket_limits.max_weight)
+        policy = basket.shipping_policy
+        if id(policy) not in policies:
+            policies[id(policy)] = len(tables)
+            tables.append((policy.thresholds, policy.costs))
+        policy_index.append(policies[id(policy)])
+
+    return _checkout(
+        {
+            "starts": starts,
+            "max_items": max_items,
+            "max_weight": max_weight,
+            "policy": policy_index,
+            "prices": prices,
+            "weights": weights,
+            "quantities": quantities,
+        },
+        tables,
+        max_workers,
+        executor,
+        shard_size,
+    )
+
+
+def checkout_lines(
+    basket_ids: npt.ArrayLike,
+    prices: npt.ArrayLike,
+    weights: npt.ArrayLike,
+    quantities: npt.ArrayLike,
+    limits: BasketLimits = DEFAULT_BASKET_LIMITS,
+    shipping_policy: ShippingPolicy = DEFAULT_SHIPPING_POLICY,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+    shard_size: int = 50_000,
+) -> CheckoutResult:
+    """
+    Reprices and validates baskets given as raw line columns, across processes.
+
+    Lines are grouped by basket with vectorized NumPy passes and copied into
+    the shared-memory block, so the calling process does no per-line Python
+    work before the workers price their shards. The results hold one row per
+    distinct basket ID, in sorted order, as in `BasketBatch.from_lines`.
+
+    :param basket_ids: Basket identifier of each line
+    :param prices: Unit price of each line
+    :param weights: Unit weight of each line
+    :param quantities: Quantity of each line
+    :param limits: Limits every basket is validated against
+    :param shipping_policy: Shipping tiers applied to every basket
+    :param max_workers: Worker processes (1 prices in this process)
+    :param executor: Process pool to reuse instead of starting one
+    :param shard_size: Maximum number of baskets per worker task
+    :raises TypeError: if limits or shipping_policy is invalid
+    :raises ValueError: if the columns have different lengths or shard_size
+        is less than 1
+    """
+    if not isinstance(limits, BasketLimits):
+        raise TypeError(f"Expected a BasketLimits object, got {type(limits).__name__}")
+    if not isinstance(shipping_policy, ShippingPolicy):
+        raise TypeError(
+            f"Expected a ShippingPolicy object, got {type(shipping_policy).__name__}"
+        )
+    if shard_size < 1:
+        raise ValueError("Shard size must be at least 1.")
+    line_ids = np.asarray(basket_ids)
+    line_prices = np.asarray(prices, dtype=np.int64)
+    line_weights = np.asarray(weights, dtype=np.int64)
+    line_quantities = np.asarray(quantities, dtype=np.int64)
+    if not (
+        len(line_ids) == len(line_prices) == len(line_weights) == len(line_quantities)
+    ):
+        raise ValueError("All line columns must have the same length.")
+
+    unique_ids, groups = np.unique(line_ids, return_inverse=True)
+    order = np.argsort(groups, kind="stable")
+    starts = np.zeros(len(unique_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(groups, minlength=len(unique_ids)), out=starts[1:])
+    basket_count = len(unique_ids)
+    return _checkout(
+        {
+            "starts": starts,
+            "max_items": np.full(basket_count, limits.max_items, dtype=np.int64),
+            "max_weight": np.full(basket_count, limits.max_weight, dtype=np.int64),
+            "policy": np.zeros(basket_count, dtype=np.int64),
+            "prices": line_prices[order],
+            "weights": line_weights[order],
+            "quantities": line_quantities[order],
+        },
+        [(shipping_policy.thresholds, shipping_policy.costs)],
+        max_workers,
+        executor,
+        shard_size,
+    )
+
+
+def _checkout(
+    inputs: dict[str, Sequence[int] | IntArray],
+    tables: Sequence[PolicyTable],
+    max_workers: int | None,
+    executor: Executor | None,
+    shard_size: int,
+) -> CheckoutResult:
+    """Copies the input columns into a shared block and prices it in shards."""
+    basket_count = len(inputs["starts"]) - 1
+    line_count = len(inputs["prices"])
+    words = _block_words(_layout(basket_count, line_count))
+    block = shared_memory.SharedMemory(create=True, size=words * 8)
+    try:
+        columns = _columns(block.buf, basket_count, line_count)
+        for name, values in inputs.items():
+            columns[name][:] = values
+
+        shards = [
+            (low, min(low + shard_size, basket_count))
+            for low in range(0, basket_count, shard_size)
+        ]
+        if max_workers == 1 and executor is None:
+            for low, high in shards:
+                _price(columns, tables, low, high)
+        else:
+            pool = executor or ProcessPoolExecutor(max_workers)
+            try:
+                futures = [
+                    pool.submit(
+                        _price_shard,
+                        block.name,
+                        basket_count,
+                        line_count,
+                        tables,
+                        low,
+                        high,
+                    )
+                    for low, high in shards
+                ]
+                for future in futures:
+                    future.result()
+            finally:
+                if executor is None:
+                    pool.shutdown()
+
+        result = CheckoutResult({name: columns[name].copy() for name in RESULT_COLUMNS})
+        del columns
+    finally:
+        block.close()
+        block.unlink()
+    return result
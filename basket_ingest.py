@@ -0,0 +1,222 @@
+import csv
+import json
+import os
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from product_basket import Basket, Product
+
+# Event fields: "session" and "type" always; "product_id" for add, remove and
+# delete; "name", "price", "weight" and optionally "quantity" for add;
+# optionally "quantity" for remove.
+EVENT_TYPES = ("add", "remove", "delete", "close")
+
+Event = dict[str, Any]
+
+
+class BasketSummary(NamedTuple):
+    """The final state of a session's basket."""
+
+    session: str
+    reason: str  # "closed", "evicted" or "end_of_feed"
+    lines: int
+    item_count: int
+    total_price: int
+    total_weight: int
+    shipping_cost: int
+    price: int
+    rejected: int  # Events the basket refused, e.g. over its limits
+
+
+def read_jsonl(path: str | os.PathLike) -> Iterator[Event]:
+    """Yields the events of a JSON Lines file one line at a time."""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_csv(path: str | os.PathLike) -> Iterator[Event]:
+    """Yields the events of a CSV file with a header row one row at a time."""
+    with open(path, encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file):
+            yield {field: value for field, value in row.items() if value != ""}
+
+
+def read_events(path: str | os.PathLike) -> Iterator[Event]:
+    """
+    Yields the events of a JSONL (.jsonl, .ndjson) or CSV (.csv) file.
+
+    :raises ValueError: if the file extension is not supported
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return read_jsonl(path)
+    if suffix == ".csv":
+        return read_csv(path)
+    raise ValueError(f"Unsupported event file type {suffix!r}.")
+
+
+class BasketBuilder:
+    """
+    Replays a stream of add/remove/delete/close events into per-session baskets.
+
+    Memory stays bounded by `max_sessions` open baskets and `product_cache_size`
+    cached products: when too many sessions are open, the least recently active
+    one is closed and summarized, and the least recently used product is
+    dropped from the cache. Remove and delete events for a session that is
+    not open, e.g. late events after its close, are ignored rather than
+    opening an empty basket.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        product_cache_size: int = 100_000,
+        basket_factory: Callable[[], Basket] = Basket,
+    ) -> None:
+        """
+        Initialize a builder with no open sessions.
+
+        :param max_sessions: Maximum number of open session baskets
+        :param product_cache_size: Maximum number of cached products
+        :param basket_factory: Creates the basket of a new session
+        :raises ValueError: if a bound is less than 1
+        """
+        if max_sessions < 1 or product_cache_size < 1:
+            raise ValueError("Builder bounds must be at least 1.")
+        self._max_sessions = max_sessions
+        self._product_cache_size = product_cache_size
+        self._basket_factory = basket_factory
+        self._sessions: OrderedDict[str, list] = OrderedDict()  # [basket, rejected]
+        self._products: OrderedDict[int, Product] = OrderedDict()
+        self._ignored = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def cached_products(self) -> int:
+        """Returns the number of products in the cache."""
+        return len(self._products)
+
+    @property
+    def ignored_events(self) -> int:
+        """Returns the number of remove/delete events for sessions not open."""
+        return self._ignored
+
+    def process(self, events: Iterable[Event]) -> Iterator[BasketSummary]:
+        """
+        Applies events in order and yields summaries as sessions close.
+
+        Sessions still open when the events run out are summarized last.
+
+        :param events: Event mappings, e.g. from read_events
+        :raises ValueError: if an event is malformed
+        """
+        for number, event in enumerate(events, 1):
+            try:
+                summary = self._apply(event)
+            except (KeyError, TypeError, ValueError) as error:
+                raise ValueError(f"Malformed event {number}: {error!r}") from None
+            if summary is not None:
+                yield summary
+        while self._sessions:
+            session, state = self._sessions.popitem(last=False)
+            yield self._summarize(session, state, "end_of_feed")
+
+    def _apply(self, event: Event) -> BasketSummary | None:
+        """Applies one event; returns the summary of a session it closes, if any."""
+        session = str(event["session"])
+        kind = event["type"]
+        if kind not in EVENT_TYPES:
+            raise ValueError(f"unknown event type {kind!r}")
+        if kind == "close":
+            state = self._sessions.pop(session, None)
+            return None if state is None else self._summarize(session, state, "closed")
+
+        product_id = int(event["product_id"])
+        quantity = int(event.get("quantity", 1))
+        state = self._sessions.get(session)
+        if state is None and kind != "add":
+            self._ignored += 1
+            return None
+        basket = None if state is None else state[0]
+        product = self._product(product_id, event, basket) if kind == "add" else None
+
+        evicted = None
+        if state is None:
+            if len(self._sessions) >= self._max_sessions:
+                oldest, oldest_state = self._sessions.popitem(last=False)
+                evicted = self._summarize(oldest, oldest_state, "evicted")
+            state = self._sessions[session] = [self._basket_factory(), 0]
+        else:
+            self._sessions.move_to_end(session)
+
+        basket = state[0]
+        try:
+            if kind == "add":
+                basket.add_product(product, quantity)
+            elif kind == "remove":
+                basket.remove_quantity(product_id, quantity)
+            else:
+                basket.delete_product(product_id)
+        except (TypeError, ValueError):
+            state[1] += 1
+        return evicted
+
+    def _product(self, product_id: int, event: Event, basket: Basket | None) -> Product:
+        """
+        Returns the product for an ID, built from the event on a cache miss.
+
+        A product already in the session's basket wins over the cache, so a
+        product evicted from the cache and rebuilt at a new price never
+        splits a line from the totals it was added with.
+        """
+        line = None if basket is None else basket._products.get(product_id)
+        if line is not None:
+            return line.product
+        product = self._products.get(product_id)
+        if product is not None:
+            self._products.move_to_end(product_id)
+            return product
+        price = int(event["price"])
+        weight = int(event["weight"])
+        if price < 1 or weight < 1:
+            raise ValueError("product price and weight must be at least 1")
+        product = Product._restore(product_id, str(event["name"]), price, weight)
+        self._products[product_id] = product
+        if len(self._products) > self._product_cache_size:
+            self._products.popitem(last=False)
+        return product
+
+    @staticmethod
+    def _summarize(session: str, state: list, reason: str) -> BasketSummary:
+        """Summarizes a session leaving the builder, untracking its basket."""
+        basket, rejected = state
+        summary = BasketSummary(
+            session,
+            reason,
+            len(basket.line_items),
+            basket.item_count,
+            basket.total_price,
+            basket.total_weight,
+            basket.get_shipping_cost,
+            basket.get_price,
+            rejected,
+        )
+        if basket._aggregates is not None:
+            basket._aggregates.untrack(basket)
+        return summary
+
+
+def ingest(path: str | os.PathLike, **options) -> Iterator[BasketSummary]:
+    """
+    Streams a JSONL or CSV event file into basket summaries.
+
+    :param path: Event file
+    :param options: BasketBuilder options (max_sessions, product_cache_size, ...)
+    """
+    return BasketBuilder(**options).process(read_events(path))
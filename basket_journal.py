@@ -0,0 +1,367 @@
+import os
+import struct
+from typing import BinaryIO
+
+from basket_limits import BasketLimits
+from product_basket import Basket, Product
+from shipping_policy import ShippingPolicy
+
+MAGIC = b"PBJL"
+FORMAT_VERSION = 1
+
+# magic, version
+HEADER = struct.Struct("<4sH")
+# tag, product ID, price, weight, name length; followed by the UTF-8 name
+PRODUCT_RECORD = struct.Struct("<cqqqH")
+# tag, product ID, quantity added
+ADD_RECORD = struct.Struct("<cqq")
+# tag, product ID, new quantity (0 drops the line)
+SET_RECORD = struct.Struct("<cqq")
+# tag, product ID
+DELETE_RECORD = struct.Struct("<cq")
+# tag, line count; followed by that many CHECKPOINT_LINEs
+CHECKPOINT_RECORD = struct.Struct("<cI")
+# product ID, quantity
+CHECKPOINT_LINE = struct.Struct("<qq")
+
+PRODUCT = b"P"
+ADD = b"A"
+SET = b"S"
+DELETE = b"D"
+CHECKPOINT = b"K"
+
+# Journal layout (all integers little-endian):
+#
+#   header
+#   records          any sequence of the records above
+#
+# A product record precedes the first record that refers to the product. A
+# checkpoint replaces the whole basket state, so a compacted journal is one
+# checkpoint (the snapshot) followed by the records appended since (the tail).
+# A record cut short by a crash ends the journal; it is truncated away before
+# new records are appended.
+
+
+def _read_state(
+    data: bytes,
+) -> tuple[dict[int, Product], dict[int, int], int]:
+    """
+    Replays journal records into products by ID and quantities by ID.
+
+    :return: The products, the quantities and the offset just past the last
+        complete record
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Not a basket journal file.")
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a basket journal file.")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported journal version {version}.")
+
+    products: dict[int, Product] = {}
+    quantities: dict[int, int] = {}
+    view = memoryview(data)
+    end = len(data)
+    position = HEADER.size
+    while position < end:
+        tag = data[position : position + 1]
+        if tag == ADD:
+            if position + ADD_RECORD.size > end:
+                break
+            _, product_id, quantity = ADD_RECORD.unpack_from(data, position)
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+            position += ADD_RECORD.size
+        elif tag == SET:
+            if position + SET_RECORD.size > end:
+                break
+            _, product_id, quantity = SET_RECORD.unpack_from(data, position)
+            if quantity:
+                quantities[product_id] = quantity
+            else:
+                quantities.pop(product_id, None)
+            position += SET_RECORD.size
+        elif tag == DELETE:
+            if position + DELETE_RECORD.size > end:
+                break
+            _, product_id = DELETE_RECORD.unpack_from(data, position)
+            quantities.pop(product_id, None)
+            position += DELETE_RECORD.size
+        elif tag == PRODUCT:
+            if position + PRODUCT_RECORD.size > end:
+                break
+            _, product_id, price, weight, name_size = PRODUCT_RECORD.unpack_from(
+                data, position
+            )
+            name_at = position + PRODUCT_RECORD.size
+            if name_at + name_size > end:
+                break
+            name = str(view[name_at : name_at + name_size], "utf-8")
+            products[product_id] = Product._restore(product_id, name, price, weight)
+            position = name_at + name_size
+        elif tag == CHECKPOINT:
+            if position + CHECKPOINT_RECORD.size > end:
+                break
+            _, count = CHECKPOINT_RECORD.unpack_from(data, position)
+            lines_at = position + CHECKPOINT_RECORD.size
+            lines_end = lines_at + CHECKPOINT_LINE.size * count
+            if lines_end > end:
+                break
+            quantities = dict(CHECKPOINT_LINE.iter_unpack(view[lines_at:lines_end]))
+            position = lines_end
+        else:
+            raise ValueError(f"Corrupt journal record at offset {position}.")
+    return products, quantities, position
+
+
+def _build_basket(
+    products: dict[int, Product],
+    quantities: dict[int, int],
+    shipping_policy: ShippingPolicy | None = None,
+    limits: BasketLimits | None = None,
+) -> Basket:
+    return Basket._from_lines(
+        (
+            (products[product_id], quantity)
+            for product_id, quantity in quantities.items()
+        ),
+        shipping_policy,
+        limits,
+    )
+
+
+def replay(
+    path: str | os.PathLike,
+    shipping_policy: ShippingPolicy | None = None,
+    limits: BasketLimits | None = None,
+) -> Basket:
+    """
+    Rebuilds a basket from a journal file.
+
+    Records are folded into final line quantities first and the basket is
+    built once from the result, without validation or limit checks.
+
+    :param path: Journal file written by BasketJournal
+    :param shipping_policy: Shipping tiers of the rebuilt basket
+    :param limits: Limits of the rebuilt basket
+    :raises ValueError: if the file is not a supported journal or is corrupt
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    products, quantities, _ = _read_state(data)
+    return _build_basket(products, quantities, shipping_policy, limits)
+
+
+def _read_complete(file: BinaryIO) -> tuple[dict[int, Product], dict[int, int]]:
+    """Reads the state of an open journal, truncating a torn final record."""
+    file.seek(0)
+    data = file.read()
+    products, quantities, end = _read_state(data)
+    if end < len(data):
+        file.truncate(end)
+        file.flush()
+        os.fsync(file.fileno())
+    return products, quantities
+
+
+class BasketJournal:
+    """
+    An append-only operation log of one basket, for audit and crash recovery.
+
+    Once attached, every change to the basket is appended as a compact binary
+    record. Records are buffered and written with one fsync per `sync_every`
+    records, so a crash loses at most the unsynced records; call `flush()` to
+    make everything so far durable.
+    """
+
+    def __init__(self, path: str | os.PathLike, sync_every: int = 256) -> None:
+        """
+        Open a journal file, creating it if needed.
+
+        :param path: Journal file
+        :param sync_every: Number of records buffered per write and fsync
+        :raises ValueError: if sync_every is less than 1 or the file is not a
+            supported journal
+        """
+        if sync_every < 1:
+            raise ValueError("sync_every must be at least 1.")
+        self._path = os.fspath(path)
+        self._sync_every = sync_every
+        self._buffer = bytearray()
+        self._pending = 0
+        self._logged: set[int] = set()  # Products that already have a record
+        self._basket: Basket | None = None
+        self._file = self._open()
+
+    def _open(self) -> BinaryIO:
+        """
+        Opens the file for appending, writing or checking the header.
+
+        A record cut short by a crash is truncated away, so that new records
+        are not appended after it.
+        """
+        file = open(self._path, "a+b")
+        file.seek(0)
+        header = file.read(HEADER.size)
+        if not header:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+            file.flush()
+            os.fsync(file.fileno())
+        elif len(header) < HEADER.size or header[:4] != MAGIC:
+            file.close()
+            raise ValueError("Not a basket journal file.")
+        else:
+            version = HEADER.unpack(header)[1]
+            if version != FORMAT_VERSION:
+                file.close()
+                raise ValueError(f"Unsupported journal version {version}.")
+            try:
+                _read_complete(file)
+            except ValueError:
+                file.close()
+                raise
+        return file
+
+    def __enter__(self) -> "BasketJournal":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def basket(self) -> Basket | None:
+        """Returns the attached basket, or None."""
+        return self._basket
+
+    def recover(
+        self,
+        shipping_policy: ShippingPolicy | None = None,
+        limits: BasketLimits | None = None,
+    ) -> Basket:
+        """
+        Rebuilds the basket from the journal and attaches it.
+
+        :param shipping_policy: Shipping tiers of the rebuilt basket
+        :param limits: Limits of the rebuilt basket
+        :raises ValueError: if the journal is corrupt
+        """
+        self.flush()
+        products, quantities = _read_complete(self._file)
+        basket = _build_basket(products, quantities, shipping_policy, limits)
+        self._logged = set(products)
+        self._set_basket(basket)
+        return basket
+
+    def attach(self, basket: Basket) -> None:
+        """
+        Starts journaling a basket, recording its current lines as a checkpoint.
+
+        :param basket: The basket to journal
+        :raises TypeError: if basket is not a Basket
+        :raises ValueError: if the basket is already journaled
+        """
+        if not isinstance(basket, Basket):
+            raise TypeError(f"Expected a Basket object, got {type(basket).__name__}")
+        self._set_basket(basket)
+        self._buffer += self._checkpoint(basket)
+        self._append_count()
+
+    def _set_basket(self, basket: Basket) -> None:
+        if basket._journal is not None and basket._journal is not self:
+            raise ValueError("The basket is already journaled.")
+        self.detach()
+        basket._journal = self
+        self._basket = basket
+
+    def detach(self) -> None:
+        """Stops journaling the attached basket."""
+        if self._basket is not None:
+            self._basket._journal = None
+            self._basket = None
+
+    def record_add(self, product: Product, quantity: int) -> None:
+        """Appends units added to a product's line."""
+        if product.id not in self._logged:
+            self._buffer += self._product_record(product)
+        self._buffer += ADD_RECORD.pack(ADD, product.id, quantity)
+        self._append_count()
+
+    def record_set(self, product: Product, quantity: int) -> None:
+        """Appends the new quantity of a product's line."""
+        if product.id not in self._logged:
+            self._buffer += self._product_record(product)
+        self._buffer += SET_RECORD.pack(SET, product.id, quantity)
+        self._append_count()
+
+    def record_delete(self, product_id: int) -> None:
+        """Appends the removal of a product's line."""
+        self._buffer += DELETE_RECORD.pack(DELETE, product_id)
+        self._append_count()
+
+    def _product_record(self, product: Product) -> bytes:
+        """Encodes a product and marks it as logged."""
+        self._logged.add(product.id)
+        name = product.name.encode()
+        return (
+            PRODUCT_RECORD.pack(
+                PRODUCT, product.id, product.price, product.weight, len(name)
+            )
+            + name
+        )
+
+    def _checkpoint(self, basket: Basket) -> bytes:
+        """Encodes the basket's lines, after any products not yet logged."""
+        products = bytearray()
+        lines = bytearray()
+        for product, quantity in basket.iter_lines():
+            if product.id not in self._logged:
+                products += self._product_record(product)
+            lines += CHECKPOINT_LINE.pack(product.id, quantity)
+        count = len(lines) // CHECKPOINT_LINE.size
+        return bytes(products + CHECKPOINT_RECORD.pack(CHECKPOINT, count) + lines)
+
+    def _append_count(self) -> None:
+        """Counts one appended record, flushing once `sync_every` are pending."""
+        self._pending += 1
+        if self._pending >= self._sync_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes buffered records and fsyncs the journal file."""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def compact(self) -> None:
+        """
+        Collapses the history into a checkpoint of the current basket.
+
+        The compacted journal is written to a temporary file and atomically
+        replaces the old one; later records are appended after the checkpoint.
+        """
+        self.flush()
+        basket = self._basket
+        if basket is None:
+            basket = _build_basket(*_read_complete(self._file))
+
+        self._logged = set()
+        data = HEADER.pack(MAGIC, FORMAT_VERSION) + self._checkpoint(basket)
+        temporary = f"{self._path}.compact"
+        with open(temporary, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        self._file.close()
+        os.replace(temporary, self._path)
+        self._file = self._open()
+
+    def close(self) -> None:
+        """Flushes the journal, detaches the basket and closes the file."""
+        if self._file.closed:
+            return
+        self.flush()
+        self.detach()
+        self._file.close()
@@ -0,0 +1,41 @@
+class BasketLimits:
+    """
+    The maximum number of units and total weight a basket may hold.
+
+    Limits are immutable, so one instance can be shared by every basket of a
+    profile (e.g. retail or a wholesale customer).
+    """
+
+    __slots__ = ("_max_items", "_max_weight")
+
+    def __init__(self, max_items: int, max_weight: int) -> None:
+        """
+        Initialize the limits.
+
+        :param max_items: Maximum number of product units (positive integer)
+        :param max_weight: Maximum total weight of products (positive integer)
+        :raises TypeError: if a limit is not an integer
+        :raises ValueError: if a limit is less than 1
+        """
+        for limit in (max_items, max_weight):
+            if not isinstance(limit, int) or isinstance(limit, bool):
+                raise TypeError(
+                    f"Expected a positive integer, got {type(limit).__name__}"
+                )
+            if limit < 1:
+                raise ValueError("Basket limits must be at least 1 unit.")
+        self._max_items = max_items
+        self._max_weight = max_weight
+
+    @property
+    def max_items(self) -> int:
+        """Returns the maximum number of product units."""
+        return self._max_items
+
+    @property
+    def max_weight(self) -> int:
+        """Returns the maximum total weight of products."""
+        return self._max_weight
+
+
+DEFAULT_BASKET_LIMITS = BasketLimits(max_items=30, max_weight=100)
@@ -0,0 +1,226 @@
+from bisect import bisect_left
+from collections.abc import Callable, Sequence
+from functools import wraps
+from time import perf_counter
+
+from product_basket import Basket, Product
+
+# Upper bounds in seconds, from 250 ns to 10 ms.
+LATENCY_BUCKETS = (
+    2.5e-7, 5e-7, 1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 1e-3, 1e-2,
+)  # fmt: skip
+# Upper bounds in product units.
+SIZE_BUCKETS = (1, 2, 5, 10, 20, 30, 50, 100, 1000, 10_000, 100_000)
+# Basket methods timed while metrics are enabled.
+MUTATIONS = (
+    "add_product",
+    "add_products",
+    "delete_product",
+    "remove_quantity",
+    "set_quantity",
+    "merge",
+)
+READS = ("get_price",)
+
+
+class Histogram:
+    """A cumulative histogram with fixed bucket upper bounds."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        """
+        Initialize an empty histogram.
+
+        :param buckets: Increasing upper bounds; larger values go to +Inf
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Records one value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        """Returns the cumulative bucket counts, total count and sum."""
+        cumulative = {}
+        running = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            running += count
+            cumulative[bound] = running
+        return {"buckets": cumulative, "count": self.count, "sum": self.sum}
+
+
+class BasketMetrics:
+    """Operation counters, rejection reasons, latencies and basket sizes."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.operations: dict[str, int] = {}
+        self.rejections: dict[str, int] = {}
+        self.products_created = 0
+        self.latency: dict[str, Histogram] = {}
+        self.basket_size = Histogram(SIZE_BUCKETS)
+
+    def record_operation(self, operation: str, started: float) -> None:
+        """Counts a completed operation and records its latency."""
+        elapsed = perf_counter() - started
+        self.operations[operation] = self.operations.get(operation, 0) + 1
+        histogram = self.latency.get(operation)
+        if histogram is None:
+            histogram = self.latency[operation] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(elapsed)
+
+    def record_mutation(self, operation: str, started: float, basket: Basket) -> None:
+        """Records a completed mutation and the resulting basket size."""
+        self.record_operation(operation, started)
+        self.basket_size.observe(basket.item_count)
+
+    def record_rejection(self, reason: str) -> None:
+        """Counts an operation rejected for `reason`."""
+        self.rejections[reason] = self.rejections.get(reason, 0) + 1
+
+    def record_product_created(self) -> None:
+        """Counts a created product."""
+        self.products_created += 1
+
+    def snapshot(self) -> dict:
+        """Returns all metrics as plain Python data."""
+        return {
+            "operations": dict(self.operations),
+            "rejections": dict(self.rejections),
+            "products_created": self.products_created,
+            "latency_seconds": {
+                operation: histogram.snapshot()
+                for operation, histogram in self.latency.items()
+            },
+            "basket_size": self.basket_size.snapshot(),
+        }
+
+    def to_prometheus(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP basket_operations_total Completed basket operations.",
+            "# TYPE basket_operations_total counter",
+        ]
+        for operation, count in sorted(self.operations.items()):
+            lines.append(f'basket_operations_total{{operation="{operation}"}} {count}')
+        lines += [
+            "# HELP basket_rejections_total Basket operations rejected by reason.",
+            "# TYPE basket_rejections_total counter",
+        ]
+        for reason, count in sorted(self.rejections.items()):
+            lines.append(f'basket_rejections_total{{reason="{reason}"}} {count}')
+        lines += [
+            "# HELP products_created_total Created products.",
+            "# TYPE products_created_total counter",
+            f"products_created_total {self.products_created}",
+            "# HELP basket_operation_seconds Latency of basket operations.",
+            "# TYPE basket_operation_seconds histogram",
+        ]
+        for operation, histogram in sorted(self.latency.items()):
+            lines += _histogram_lines(
+                "basket_operation_seconds", histogram, f'operation="{operation}",'
+            )
+        lines += [
+            "# HELP basket_size_units Basket size in units after each mutation.",
+            "# TYPE basket_size_units histogram",
+            *_histogram_lines("basket_size_units", self.basket_size),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: str = "") -> list[str]:
+    """Formats one histogram as Prometheus bucket, sum and count samples."""
+    data = histogram.snapshot()
+    lines = []
+    for bound, count in data["buckets"].items():
+        le = "+Inf" if bound == float("inf") else repr(bound)
+        lines.append(f'{name}_bucket{{{labels}le="{le}"}} {count}')
+    suffix = f"{{{labels.rstrip(',')}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {data['sum']}")
+    lines.append(f"{name}_count{suffix} {data['count']}")
+    return lines
+
+
+# Original (class, name) attributes replaced by wrappers while enabled.
+_unwrapped: dict[tuple[type, str], object] = {}
+
+
+def _timed_mutation(operation: str, method: Callable) -> Callable:
+    """Wraps a Basket mutation to record its latency and the resulting size."""
+
+    @wraps(method)
+    def timed(self: Basket, *args, **kwargs):
+        started = perf_counter()
+        result = method(self, *args, **kwargs)
+        if Basket._metrics is not None:
+            Basket._metrics.record_mutation(operation, started, self)
+        return result
+
+    return timed
+
+
+def _timed_read(operation: str, getter: Callable) -> property:
+    """Wraps a Basket property getter to record its latency."""
+
+    @wraps(getter)
+    def timed(self: Basket):
+        started = perf_counter()
+        result = getter(self)
+        if Basket._metrics is not None:
+            Basket._metrics.record_operation(operation, started)
+        return result
+
+    return property(timed)
+
+
+def _counted_init(init: Callable) -> Callable:
+    """Wraps Product.__init__ to count created products."""
+
+    @wraps(init)
+    def counted(self: Product, *args, **kwargs) -> None:
+        init(self, *args, **kwargs)
+        if Product._metrics is not None:
+            Product._metrics.record_product_created()
+
+    return counted
+
+
+def enable(metrics: BasketMetrics | None = None) -> BasketMetrics:
+    """
+    Starts recording metrics for every Basket and Product.
+
+    The timed Basket methods and Product.__init__ are swapped for wrappers
+    only while metrics are enabled, so a disabled build runs the plain methods.
+
+    :param metrics: Where to record (a new BasketMetrics if None)
+    :return: The active metrics
+    """
+    if metrics is None:
+        metrics = BasketMetrics()
+    Basket._metrics = metrics
+    Product._metrics = metrics
+    if not _unwrapped:
+        for name in MUTATIONS:
+            method = _unwrapped[Basket, name] = Basket.__dict__[name]
+            setattr(Basket, name, _timed_mutation(name, method))
+        for name in READS:
+            getter = _unwrapped[Basket, name] = Basket.__dict__[name]
+            setattr(Basket, name, _timed_read(name, getter.fget))
+        init = _unwrapped[Product, "__init__"] = Product.__dict__["__init__"]
+        Product.__init__ = _counted_init(init)  # type: ignore[method-assign]
+    return metrics
+
+
+def disable() -> None:
+    """Stops recording metrics and restores the plain methods."""
+    Basket._metrics = None
+    Product._metrics = None
+    for (cls, name), attribute in _unwrapped.items():
+        setattr(cls, name, attribute)
+    _unwrapped.clear()
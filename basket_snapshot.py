@@ -0,0 +1,316 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+
+from basket_limits import BasketLimits
+from product_basket import Basket, Product
+from shipping_policy import ShippingPolicy
+
+MAGIC = b"PBSN"
+FORMAT_VERSION = 2  # Version 2 added the basket limits section
+NO_KEY = 0xFFFFFFFF
+
+# magic, version, reserved, strings, products, baskets, lines, max product ID
+HEADER = struct.Struct("<4sHHIIIIq")
+# product ID, name string index, price, weight
+PRODUCT = struct.Struct("<qIqq")
+# product index, quantity
+LINE = struct.Struct("<Iq")
+OFFSET = struct.Struct("<I")
+# max items, max weight
+LIMITS = struct.Struct("<qq")
+
+# Snapshot layout (all integers little-endian, sections in this order):
+#
+#   header
+#   string offsets   (strings + 1) x uint32, byte offsets into the string data
+#   string data      UTF-8 product names and basket keys
+#   products         products x PRODUCT
+#   basket starts    (baskets + 1) x uint32, index of each basket's first line
+#   basket keys      baskets x uint32, string index of the key or NO_KEY
+#   basket limits    baskets x LIMITS (version 2 and later)
+#   lines            lines x LINE
+
+
+def _pack_uint32(values: Sequence[int]) -> bytes:
+    """Packs unsigned 32-bit integers in little-endian order."""
+    packed = array("I", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def dumps(baskets: Sequence[Basket], keys: Sequence[str] | None = None) -> bytes:
+    """
+    Serializes baskets into the binary snapshot format.
+
+    Products shared between baskets are stored once, and each basket's limits
+    are stored with it. Shipping policies are configuration and are not part
+    of the snapshot.
+
+    :param baskets: Baskets to serialize
+    :param keys: Optional key (e.g. session ID) of each basket
+    :raises TypeError: if an element is not a Basket
+    :raises ValueError: if keys and baskets have different lengths
+    """
+    if keys is not None and len(keys) != len(baskets):
+        raise ValueError("Snapshot keys and baskets must have the same length.")
+
+    strings: dict[str, int] = {}
+    products: dict[int, int] = {}
+    product_rows = bytearray()
+    line_rows = bytearray()
+    basket_starts = [0]
+    basket_keys = []
+    limit_rows = bytearray()
+    max_product_id = 0
+
+    def string_index(value: str) -> int:
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    for position, basket in enumerate(baskets):
+        if not isinstance(basket, Basket):
+            raise TypeError(f"Expected a Basket object, got {type(basket).__name__}")
+        for product, quantity in basket.iter_lines():
+            index = products.get(product.id)
+            if index is None:
+                index = products[product.id] = len(products)
+                product_rows += PRODUCT.pack(
+                    product.id,
+                    string_index(product.name),
+                    product.price,
+                    product.weight,
+                )
+                max_product_id = max(max_product_id, product.id)
+            line_rows += LINE.pack(index, quantity)
+        basket_starts.append(len(line_rows) // LINE.size)
+        basket_keys.append(NO_KEY if keys is None else string_index(keys[position]))
+        limits = basket.limits
+        limit_rows += LIMITS.pack(limits.max_items, limits.max_weight)
+
+    encoded = [value.encode() for value in strings]
+    string_offsets = [0]
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+
+    return b"".join(
+        [
+            HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                0,
+                len(strings),
+                len(products),
+                len(baskets),
+                basket_starts[-1],
+                max_product_id,
+            ),
+            _pack_uint32(string_offsets),
+            *encoded,
+            product_rows,
+            _pack_uint32(basket_starts),
+            _pack_uint32(basket_keys),
+            limit_rows,
+            line_rows,
+        ]
+    )
+
+
+def write_snapshot(
+    path: str | os.PathLike,
+    baskets: Sequence[Basket],
+    keys: Sequence[str] | None = None,
+) -> None:
+    """
+    Writes baskets to a snapshot file.
+
+    :param path: Destination file
+    :param baskets: Baskets to serialize
+    :param keys: Optional key (e.g. session ID) of each basket
+    """
+    data = dumps(baskets, keys)
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+class SnapshotReader:
+    """
+    Memory-maps a snapshot file and materializes baskets on access.
+
+    Opening a snapshot reads only its header; products and names are decoded
+    the first time a basket that uses them is loaded, and each product is
+    decoded once and shared by every basket loaded from the reader.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        shipping_policy: ShippingPolicy | None = None,
+        limits: BasketLimits | None = None,
+    ) -> None:
+        """
+        Open a snapshot file.
+
+        :param path: Snapshot file written by write_snapshot
+        :param shipping_policy: Shipping tiers of the restored baskets
+        :param limits: Limits of the restored baskets (the limits stored with
+            each basket if None; default limits for version 1 snapshots)
+        :raises ValueError: if the file is not a supported snapshot
+        """
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError("Not a basket snapshot file.")
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic,
+            version,
+            _,
+            self._string_count,
+            self._product_count,
+            self._basket_count,
+            self._line_count,
+            self._max_product_id,
+        ) = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("Not a basket snapshot file.")
+        if version not in (1, FORMAT_VERSION):
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {version}.")
+        self._shipping_policy = shipping_policy
+        self._limits = limits
+        self._has_limits = version >= 2
+
+        self._string_offsets_at = HEADER.size
+        self._strings_at = self._string_offsets_at + OFFSET.size * (
+            self._string_count + 1
+        )
+        self._products_at = self._strings_at + self._uint32(
+            self._string_offsets_at, self._string_count
+        )
+        self._basket_starts_at = self._products_at + PRODUCT.size * self._product_count
+        self._basket_keys_at = self._basket_starts_at + OFFSET.size * (
+            self._basket_count + 1
+        )
+        self._basket_limits_at = self._basket_keys_at + OFFSET.size * self._basket_count
+        self._lines_at = self._basket_limits_at
+        if self._has_limits:
+            self._lines_at += LIMITS.size * self._basket_count
+        self._products: dict[int, Product] = {}
+        self._basket_limits: dict[tuple[int, int], BasketLimits | None] = {}
+        self._key_index: dict[str, int] | None = None
+
+    def __enter__(self) -> "SnapshotReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmaps the snapshot file."""
+        self._buffer.close()
+
+    def __len__(self) -> int:
+        return self._basket_count
+
+    def __iter__(self) -> Iterator[Basket]:
+        for index in range(self._basket_count):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> Basket:
+        """
+        Materializes the basket stored at a position.
+
+        :param index: Position of the basket in the snapshot
+        :raises IndexError: if the position is out of range
+        """
+        index = self._position(index)
+        first = self._uint32(self._basket_starts_at, index)
+        last = self._uint32(self._basket_starts_at, index + 1)
+        start = self._lines_at + LINE.size * first
+        end = self._lines_at + LINE.size * last
+        return Basket._from_lines(
+            (
+                (self._product(product_index), quantity)
+                for product_index, quantity in LINE.iter_unpack(self._buffer[start:end])
+            ),
+            self._shipping_policy,
+            self._limits if self._limits is not None else self._stored_limits(index),
+        )
+
+    @property
+    def max_product_id(self) -> int:
+        """
+        Returns the largest product ID in the snapshot.
+
+        New products created after a restore must not reuse restored IDs, e.g.
+        install `CounterIdAllocator(reader.max_product_id + 1)`.
+        """
+        return self._max_product_id
+
+    def _position(self, index: int) -> int:
+        """Returns a basket position with negative indexes counted from the end."""
+        if index < 0:
+            index += self._basket_count
+        if not 0 <= index < self._basket_count:
+            raise IndexError("Snapshot basket index out of range.")
+        return index
+
+    def key(self, index: int) -> str | None:
+        """
+        Returns the key stored for the basket at a position, or None.
+
+        :param index: Position of the basket in the snapshot
+        :raises IndexError: if the position is out of range
+        """
+        index = self._position(index)
+        string_index = self._uint32(self._basket_keys_at, index)
+        return None if string_index == NO_KEY else self._string(string_index)
+
+    def get(self, key: str) -> Basket | None:
+        """Materializes the basket stored under a key, or returns None."""
+        if self._key_index is None:
+            keys = ((self.key(index), index) for index in range(self._basket_count))
+            self._key_index = {key: index for key, index in keys if key is not None}
+        index = self._key_index.get(key)
+        return None if index is None else self[index]
+
+    def _stored_limits(self, index: int) -> BasketLimits | None:
+        """Returns the limits stored for a basket (None for Basket's own)."""
+        if not self._has_limits:
+            return None
+        values = LIMITS.unpack_from(
+            self._buffer, self._basket_limits_at + LIMITS.size * index
+        )
+        if values not in self._basket_limits:
+            default = values == (Basket.MAX_ITEMS, Basket.MAX_WEIGHT)
+            self._basket_limits[values] = None if default else BasketLimits(*values)
+        return self._basket_limits[values]
+
+    def _uint32(self, section_at: int, index: int) -> int:
+        return OFFSET.unpack_from(self._buffer, section_at + OFFSET.size * index)[0]
+
+    def _string(self, index: int) -> str:
+        start = self._strings_at + self._uint32(self._string_offsets_at, index)
+        end = self._strings_at + self._uint32(self._string_offsets_at, index + 1)
+        return self._buffer[start:end].decode()
+
+    def _product(self, index: int) -> Product:
+        product = self._products.get(index)
+        if product is None:
+            product_id, name_index, price, weight = PRODUCT.unpack_from(
+                self._buffer, self._products_at + PRODUCT.size * index
+            )
+            product = Product._restore(
+                product_id, self._string(name_index), price, weight
+            )
+            self._products[index] = product
+        return product
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable, Hashable
+from contextlib import asynccontextmanager
+from typing import NamedTuple
+
+from product_basket import Basket, Product
+
+
+class Quote(NamedTuple):
+    """Prices of a basket read under its session lock."""
+
+    total_price: int
+    total_weight: int
+    shipping_cost: int
+    price: int
+
+
+class _Session:
+    """A stored basket together with its lock and last access time."""
+
+    __slots__ = ("basket", "lock", "last_access")
+
+    def __init__(self, basket: Basket, now: float) -> None:
+        self.basket = basket
+        self.lock = asyncio.Lock()
+        self.last_access = now
+
+
+class AsyncBasketStore:
+    """
+    Maps session IDs to baskets for concurrent asyncio request handlers.
+
+    Every session has its own lock, so coroutines working on different
+    sessions never wait for each other.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float | None = None,
+        basket_factory: Callable[[], Basket] = Basket,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the store.
+
+        :param idle_timeout: Seconds after which an unused basket may be evicted
+        :param basket_factory: Creates the basket of a new session
+        :param clock: Returns the current time in seconds
+        """
+        self._sessions: dict[Hashable, _Session] = {}
+        self._idle_timeout = idle_timeout
+        self._basket_factory = basket_factory
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: Hashable) -> bool:
+        return session_id in self._sessions
+
+    def get(self, session_id: Hashable) -> Basket | None:
+        """Returns the basket of a session without creating it, or None."""
+        session = self._sessions.get(session_id)
+        return None if session is None else session.basket
+
+    def _session(self, session_id: Hashable) -> _Session:
+        """Returns the session, creating an empty basket for a new ID."""
+        now = self._clock()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = _Session(self._basket_factory(), now)
+            self._sessions[session_id] = session
+        else:
+            session.last_access = now
+        return session
+
+    @asynccontextmanager
+    async def session(self, session_id: Hashable) -> AsyncIterator[Basket]:
+        """
+        Holds the session lock for a multi-step operation on its basket.
+
+        :param session_id: The session's ID
+        """
+        session = self._session(session_id)
+        async with session.lock:
+            yield session.basket
+            session.last_access = self._clock()
+
+    async def add_product(
+        self, session_id: Hashable, product: Product, quantity: int = 1
+    ) -> None:
+        """
+        Adds a product to the session's basket.
+
+        :param session_id: The session's ID
+        :param product: An instance of the Product class
+        :param quantity: Quantity of the product (default is 1)
+        :raises TypeError: if input types are incorrect
+        :raises ValueError: if adding the product exceeds basket limits
+        """
+        async with self.session(session_id) as basket:
+            basket.add_product(product, quantity)
+
+    async def delete_product(self, session_id: Hashable, product_id: int) -> None:
+        """
+        Removes a product entirely from the session's basket.
+
+        :param session_id: The session's ID
+        :param product_id: The product's ID
+        """
+        async with self.session(session_id) as basket:
+            basket.delete_product(product_id)
+
+    async def quote(self, session_id: Hashable) -> Quote:
+        """
+        Returns the prices of the session's basket.
+
+        :param session_id: The session's ID
+        """
+        async with self.session(session_id) as basket:
+            return Quote(
+                basket.total_price,
+                basket.total_weight,
+                basket.get_shipping_cost,
+                basket.get_price,
+            )
+
+    def evict_idle(self) -> int:
+        """
+        Drops baskets that have not been used for longer than the idle timeout.
+
+        Baskets whose lock is currently held are kept. Evicted baskets are
+        untracked from their AggregateRegistry, if any.
+
+        :return: The number of evicted sessions
+        """
+        if self._idle_timeout is None:
+            return 0
+        deadline = self._clock() - self._idle_timeout
+        idle = [
+            session_id
+            for session_id, session in self._sessions.items()
+            if session.last_access < deadline and not session.lock.locked()
+        ]
+        for session_id in idle:
+            basket = self._sessions.pop(session_id).basket
+            if basket._aggregates is not None:
+                basket._aggregates.untrack(basket)
+        return len(idle)
+
+    async def run_eviction(self, interval: float) -> None:
+        """
+        Evicts idle baskets every `interval` seconds until cancelled.
+
+        :param interval: Seconds between eviction passes
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
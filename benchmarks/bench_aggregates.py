@@ -0,0 +1,86 @@
+"""Cross-basket figures: AggregateRegistry versus recounting every basket.
+
+Run with `python -m benchmarks.bench_aggregates [baskets]`.
+
+Compares reading the figures (units per product, reserved weight, revenue
+by shipping tier, top products) from the registry with recomputing them from
+each basket's `list_products`, and prices the registry's per-mutation cost.
+"""
+
+import heapq
+import random
+import sys
+import time
+
+from basket_aggregates import AggregateRegistry
+from benchmarks.bench_snapshot import build_baskets
+from product_basket import Basket
+
+
+def recount(baskets: list[Basket]) -> dict:
+    """Recomputes the registry's figures by iterating every basket."""
+    units: dict[int, int] = {}
+    weight = 0
+    tiers = [0, 0, 0]
+    for basket in baskets:
+        for product in basket.list_products:
+            units[product.id] = units.get(product.id, 0) + 1
+            weight += product.weight
+        price = basket.total_price
+        tiers[0 if price < 500 else 1 if price < 1000 else 2] += price
+    top = heapq.nlargest(10, units.items(), key=lambda item: item[1])
+    return {"weight": weight, "tiers": tiers, "top": top}
+
+
+def mutate(baskets: list[Basket], count: int, seed: int = 2) -> None:
+    """Adds and deletes `count` random lines across the baskets."""
+    rng = random.Random(seed)
+    products = [line[0] for basket in baskets[:200] for line in basket.iter_lines()]
+    for _ in range(count // 2):
+        basket = rng.choice(baskets)
+        product = rng.choice(products)
+        if basket.can_add(product):
+            basket.add_product(product)
+        basket.delete_product(product.id)
+
+
+def timed(function) -> float:
+    """Returns the wall time of one call in seconds."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(count: int = 100_000) -> None:
+    baskets = build_baskets(count)
+    registry = AggregateRegistry()
+
+    def track_all() -> None:
+        for basket in baskets:
+            registry.track(basket)
+
+    track_seconds = timed(track_all)
+
+    recount_seconds = timed(lambda: recount(baskets))
+    reads = 1000
+    read_seconds = timed(
+        lambda: [
+            (registry.reserved_weight, registry.tiers(), registry.top_products(10))
+            for _ in range(reads)
+        ]
+    )
+    print(f"{count} baskets, tracked in {track_seconds * 1000:.0f} ms")
+    print(f"{'recount':<16} {recount_seconds * 1e6:12.1f} us/read")
+    print(f"{'registry':<16} {read_seconds / reads * 1e6:12.1f} us/read")
+
+    mutations = 200_000
+    tracked = timed(lambda: mutate(baskets, mutations))
+    for basket in baskets:
+        registry.untrack(basket)
+    untracked = timed(lambda: mutate(baskets, mutations))
+    print(f"{'untracked':<16} {untracked / mutations * 1e9:12.0f} ns/mutation")
+    print(f"{'tracked':<16} {tracked / mutations * 1e9:12.0f} ns/mutation")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
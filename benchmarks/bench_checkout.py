@@ -0,0 +1,94 @@
+"""Batch checkout throughput by number of worker processes.
+
+Run with `python -m benchmarks.bench_checkout [baskets]`.
+
+Compares a serial reprice-and-validate loop over each basket's lines, and
+the cached `get_price` totals, with `basket_checkout.checkout` on the live
+baskets and `checkout_lines` on the same baskets as line columns, at 1, 2,
+4, ... worker processes up to the CPU count.
+
+`checkout` reads every basket in serial Python before any worker starts, so
+its throughput barely changes with the worker count; it is timed with one
+pool size only. `checkout_lines` does no per-line Python work in the calling
+process, so its rows show how the sharded pricing itself scales.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from basket_checkout import checkout, checkout_lines
+from benchmarks.bench_snapshot import build_baskets
+from product_basket import Basket
+
+
+def reprice(basket: Basket) -> tuple[int, str | None]:
+    """Recomputes a basket's price and limit violation from its lines."""
+    total_price = total_weight = item_count = 0
+    for product, quantity in basket.iter_lines():
+        total_price += product.price * quantity
+        total_weight += product.weight * quantity
+        item_count += quantity
+    violation = None
+    if item_count > basket.limits.max_items:
+        violation = "max_items"
+    elif total_weight > basket.limits.max_weight:
+        violation = "max_weight"
+    return total_price + basket.shipping_policy.quote(total_price), violation
+
+
+def main(count: int = 200_000) -> None:
+    baskets = build_baskets(count)
+
+    start = time.perf_counter()
+    expected = [reprice(basket)[0] for basket in baskets]
+    serial = time.perf_counter() - start
+    start = time.perf_counter()
+    assert [basket.get_price for basket in baskets] == expected
+    cached = time.perf_counter() - start
+
+    # Every basket of build_baskets is non-empty and uses the default policy,
+    # so checkout_lines returns them in basket ID order.
+    assert all(basket.item_count for basket in baskets)
+    lines = [
+        (basket_id, product.price, product.weight, quantity)
+        for basket_id, basket in enumerate(baskets)
+        for product, quantity in basket.iter_lines()
+    ]
+    basket_ids, prices, weights, quantities = np.array(lines, dtype=np.int64).T
+
+    cpus = os.cpu_count() or 1
+    print(f"{count} baskets, {cpus} CPUs")
+    print(f"  {'serial reprice':<28} {count / serial:>14,.0f} baskets/sec")
+    print(f"  {'get_price, running totals':<28} {count / cached:>14,.0f} baskets/sec")
+    start = time.perf_counter()
+    result = checkout(baskets, max_workers=1)
+    elapsed = time.perf_counter() - start
+    assert result.get_price.tolist() == expected, "Results must match get_price"
+    print(f"  {'checkout, live baskets':<28} {count / elapsed:>14,.0f} baskets/sec")
+
+    workers = 1
+    while workers <= max(cpus, 2):
+        with ProcessPoolExecutor(workers) as pool:
+            checkout_lines([0], [1], [1], [1], executor=pool)  # Start the workers
+            start = time.perf_counter()
+            result = checkout_lines(
+                basket_ids,
+                prices,
+                weights,
+                quantities,
+                executor=pool,
+                shard_size=count // workers // 4,
+            )
+            elapsed = time.perf_counter() - start
+        assert result.get_price.tolist() == expected, "Results must match get_price"
+        label = f"checkout_lines, {workers} worker{'s' if workers > 1 else ''}"
+        print(f"  {label:<28} {count / elapsed:>14,.0f} baskets/sec")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
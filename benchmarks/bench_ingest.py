@@ -0,0 +1,116 @@
+"""Throughput benchmark: streaming JSONL and CSV event feeds into baskets.
+
+Run with `python -m benchmarks.bench_ingest [events]`.
+"""
+
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from basket_ingest import BasketBuilder, ingest, read_events
+
+FIELDS = ["session", "type", "product_id", "name", "price", "weight", "quantity"]
+
+
+def generate_events(count: int, sessions: int = 5000, seed: int = 0):
+    """Yields `count` random events over a rolling window of open sessions."""
+    rng = random.Random(seed)
+    products = [
+        (product_id, f"Product {product_id}", rng.randint(1, 800), rng.randint(1, 5))
+        for product_id in range(1, 2001)
+    ]
+    next_session = sessions
+    open_sessions = list(range(sessions))
+    for _ in range(count):
+        slot = rng.randrange(sessions)
+        session = open_sessions[slot]
+        roll = rng.random()
+        product_id, name, price, weight = rng.choice(products)
+        if roll < 0.02:
+            yield {"session": session, "type": "close"}
+            open_sessions[slot] = next_session
+            next_session += 1
+        elif roll < 0.12:
+            yield {"session": session, "type": "delete", "product_id": product_id}
+        else:
+            yield {
+                "session": session,
+                "type": "add",
+                "product_id": product_id,
+                "name": name,
+                "price": price,
+                "weight": weight,
+                "quantity": rng.randint(1, 3),
+            }
+
+
+def write_jsonl(path: str, count: int) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        for event in generate_events(count):
+            file.write(json.dumps(event) + "\n")
+
+
+def write_csv(path: str, count: int) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, FIELDS)
+        writer.writeheader()
+        writer.writerows(generate_events(count))
+
+
+def timed(function) -> float:
+    """Returns the wall time of one call in seconds."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def peak_memory(path: str) -> int:
+    """Returns the peak traced allocation in bytes while ingesting a file."""
+    tracemalloc.start()
+    try:
+        for _ in ingest(path, max_sessions=1000, product_cache_size=500):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(count: int = 500_000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        jsonl_path = os.path.join(directory, "events.jsonl")
+        csv_path = os.path.join(directory, "events.csv")
+        write_jsonl(jsonl_path, count)
+        write_csv(csv_path, count)
+
+        events = list(generate_events(count))
+
+        def drain(events) -> None:
+            for _ in events:
+                pass
+
+        results = {
+            "parse jsonl only": timed(lambda: drain(read_events(jsonl_path))),
+            "parse csv only": timed(lambda: drain(read_events(csv_path))),
+            "in-memory events": timed(lambda: drain(BasketBuilder().process(events))),
+            "ingest jsonl": timed(lambda: drain(ingest(jsonl_path))),
+            "ingest csv": timed(lambda: drain(ingest(csv_path))),
+        }
+        print(f"{count} events, {os.path.getsize(jsonl_path) >> 20} MiB as JSONL")
+        for name, seconds in results.items():
+            print(f"{name:<20} {seconds * 1000:9.1f} ms {count / seconds:12,.0f} ev/s")
+
+        small = os.path.join(directory, "small.jsonl")
+        write_jsonl(small, count // 10)
+        print(
+            f"peak traced memory: {peak_memory(small) >> 10} KiB for {count // 10} "
+            f"events, {peak_memory(jsonl_path) >> 10} KiB for {count} events"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,94 @@
+"""Recovery benchmark: journal replay versus re-running the public methods.
+
+Run with `python -m benchmarks.bench_journal [operations]`.
+
+A basket is journaled through a random mix of adds, partial removals and
+deletes. The benchmark reports replay throughput in operations per second,
+compared with applying the same operations through `Basket` methods, and the
+replay time after compaction.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from basket_journal import BasketJournal, replay
+from basket_limits import BasketLimits
+from product_basket import Basket, Product
+
+LIMITS = BasketLimits(max_items=10**12, max_weight=10**12)
+
+
+def build_operations(count: int, seed: int = 0) -> list[tuple[str, Product, int]]:
+    """Returns `count` random (operation, product, quantity) triples."""
+    rng = random.Random(seed)
+    products = [
+        Product(f"Product {i}", rng.randint(1, 800), rng.randint(1, 5))
+        for i in range(1000)
+    ]
+    operations = []
+    for _ in range(count):
+        product = rng.choice(products)
+        roll = rng.random()
+        if roll < 0.6:
+            operations.append(("add", product, rng.randint(1, 3)))
+        elif roll < 0.8:
+            operations.append(("remove", product, 1))
+        else:
+            operations.append(("delete", product, 0))
+    return operations
+
+
+def apply(basket: Basket, operations: list[tuple[str, Product, int]]) -> None:
+    """Applies operations through the public Basket methods."""
+    for operation, product, quantity in operations:
+        if operation == "add":
+            basket.add_product(product, quantity)
+        elif operation == "remove":
+            basket.remove_quantity(product.id, quantity)
+        else:
+            basket.delete_product(product.id)
+
+
+def timed(function) -> float:
+    """Returns the wall time of one call in seconds."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(count: int = 1_000_000) -> None:
+    operations = build_operations(count)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "basket.journal")
+        basket = Basket(limits=LIMITS)
+        with BasketJournal(path) as journal:
+            journal.attach(basket)
+            write_time = timed(lambda: apply(basket, operations))
+        journal_size = os.path.getsize(path)
+
+        replay_time = timed(lambda: replay(path, limits=LIMITS))
+        methods_time = timed(lambda: apply(Basket(limits=LIMITS), operations))
+        restored = replay(path, limits=LIMITS)
+        assert restored.diff(basket) == {}, "Replay should rebuild the basket"
+
+        with BasketJournal(path) as journal:
+            journal.compact()
+        compacted_time = timed(lambda: replay(path, limits=LIMITS))
+
+        print(f"{count} operations, {len(basket.line_items)} lines at the end")
+        print(f"  journal size  {journal_size:>12} bytes")
+        print(f"  compacted     {os.path.getsize(path):>12} bytes")
+        for label, seconds in [
+            ("journaled writes", write_time),
+            ("public methods", methods_time),
+            ("replay", replay_time),
+        ]:
+            print(f"  {label:<20} {count / seconds:>14,.0f} ops/sec")
+        print(f"  {'compacted replay':<20} {compacted_time * 1000:>14.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,128 @@
+"""Overhead of the metrics layer on Basket and Product hot paths.
+
+Run with `python -m benchmarks.bench_metrics [max-overhead]`.
+
+`enable()` swaps counting and timing wrappers onto `Product.__init__` and the
+Basket hot paths, and `disable()` must put the plain methods back; neither
+path has any inline metrics code left. Product creation and the
+mutation/read mix are each timed with the plain methods as imported and
+after an enable/disable cycle, in alternating pairs, and gated on the median
+paired slowdown; the methods are also checked to be the very same objects
+after the cycle.
+
+The benchmark exits with status 1 if a slowdown is over `max-overhead`
+(default 0.05, i.e. 5%) or a method is not restored. It also reports the cost
+of the wrappers while metrics are enabled.
+"""
+
+import statistics
+import sys
+import time
+from collections.abc import Callable
+
+import basket_metrics
+from basket_metrics import MUTATIONS, READS
+from benchmarks.runner import measure
+from benchmarks.scenarios import (
+    instrumented_mutation_read_mix,
+    mutation_read_mix,
+    product_creation,
+)
+from product_basket import Basket, Product
+
+WRAPPED = [(Basket, name) for name in (*MUTATIONS, *READS)] + [(Product, "__init__")]
+
+# The plain methods, as imported before metrics were ever enabled.
+PLAIN = {(cls, name): cls.__dict__[name] for cls, name in WRAPPED}
+
+
+def restored_methods() -> bool:
+    """Returns whether an enable/disable cycle restores the plain methods."""
+    basket_metrics.enable()
+    basket_metrics.disable()
+    return all(cls.__dict__[name] is PLAIN[cls, name] for cls, name in WRAPPED)
+
+
+def _timed_after(switch: Callable[[], None], run: Callable[[], None]) -> float:
+    """Returns the seconds of one `run` after `switch` and an untimed warm-up."""
+    switch()
+    run()  # Swapping class attributes invalidates the attribute caches
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def _install_plain() -> None:
+    for (cls, name), attribute in PLAIN.items():
+        setattr(cls, name, attribute)
+
+
+def _cycle() -> None:
+    basket_metrics.enable()
+    basket_metrics.disable()
+
+
+def cycle_overhead(run: Callable[[], None], repeats: int = 200) -> float:
+    """
+    Times `run` with the plain methods and after an enable/disable cycle.
+
+    Each pair reinstalls the plain methods, so a wrapper that `disable()`
+    leaves behind slows every "after" run, not just the first one.
+
+    :return: The median of the paired (after / plain) ratios minus 1, which
+        cancels drift between pairs
+    """
+    ratios = []
+    try:
+        for _ in range(repeats):
+            plain = _timed_after(_install_plain, run)
+            ratios.append(_timed_after(_cycle, run) / plain)
+    finally:
+        _install_plain()
+    return statistics.median(ratios) - 1
+
+
+def _enabled(run: Callable[[], None]) -> Callable[[], None]:
+    """Returns `run` with metrics enabled for its duration."""
+
+    def run_enabled() -> None:
+        basket_metrics.enable()
+        try:
+            run()
+        finally:
+            basket_metrics.disable()
+
+    return run_enabled
+
+
+def main(max_overhead: float = 0.05) -> int:
+    basket_metrics.disable()
+    run_creation, creations = product_creation(1000)
+    run_mix, _ = mutation_read_mix(100)
+    restored = restored_methods()
+    creation_overhead = cycle_overhead(run_creation)
+    mix_overhead = cycle_overhead(run_mix)
+
+    disabled = measure(mutation_read_mix, 100)
+    enabled = measure(instrumented_mutation_read_mix, 100)
+    plain_creation = measure(product_creation, 1000)
+    counted_creation = measure(lambda size: (_enabled(run_creation), creations), 1000)
+
+    print(f"metrics disabled   {disabled:>14,.0f} ops/sec")
+    print(
+        f"metrics enabled    {enabled:>14,.0f} ops/sec ({enabled / disabled - 1:+.1%})"
+    )
+    print(f"products, plain    {plain_creation:>14,.0f} ops/sec")
+    print(
+        f"products, counted  {counted_creation:>14,.0f} ops/sec"
+        f" ({counted_creation / plain_creation - 1:+.1%})"
+    )
+    print(f"methods restored   {'yes' if restored else 'NO':>14}")
+    print(f"after disable()    {mix_overhead:>14.2%} slower mix")
+    print(f"after disable()    {creation_overhead:>14.2%} slower creation")
+    within = max(creation_overhead, mix_overhead) <= max_overhead
+    return 0 if restored and within else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.05))
@@ -0,0 +1,77 @@
+"""Free-shipping gap recommendations: CatalogIndex versus a linear scan.
+
+Run with `python -m benchmarks.bench_recommend [products]`.
+"""
+
+import random
+import sys
+import time
+from operator import attrgetter
+
+from catalog_index import CatalogIndex
+from product_basket import Basket, Product
+
+
+def linear_free_shipping_gap(products: list[Product], basket: Basket) -> list[Product]:
+    """Reference implementation: scans the whole catalog for the cheapest fit."""
+    total_price = basket.total_price
+    threshold = basket.shipping_policy.next_threshold(total_price)
+    limits = basket.limits
+    if threshold is None or basket.item_count >= limits.max_items:
+        return []
+    gap = threshold - total_price
+    max_weight = limits.max_weight - basket.total_weight
+    best = min(
+        (p for p in products if p.price >= gap and p.weight <= max_weight),
+        key=attrgetter("price", "weight", "id"),
+        default=None,
+    )
+    return [] if best is None else [best]
+
+
+def build_queries(products: list[Product], count: int, seed: int = 1) -> list[Basket]:
+    """Builds `count` baskets below the free-shipping tier."""
+    rng = random.Random(seed)
+    baskets = []
+    for _ in range(count):
+        basket = Basket()
+        for product in rng.sample(products, rng.randint(1, 4)):
+            if basket.total_price + product.price < 1000 and basket.can_add(product):
+                basket.add_product(product, 1)
+        baskets.append(basket)
+    return baskets
+
+
+def main(count: int = 500_000) -> None:
+    rng = random.Random(0)
+    products = [
+        Product(f"Product {i}", rng.randint(1, 2000), rng.randint(1, 80))
+        for i in range(count)
+    ]
+
+    start = time.perf_counter()
+    index = CatalogIndex(products)
+    build = time.perf_counter() - start
+    print(f"{count} products, index built in {build * 1000:.0f} ms")
+
+    queries = build_queries(products, 10_000)
+    start = time.perf_counter()
+    indexed = [index.free_shipping_gap(basket) for basket in queries]
+    indexed_seconds = time.perf_counter() - start
+
+    sample = queries[:20]
+    start = time.perf_counter()
+    scanned = [linear_free_shipping_gap(products, basket) for basket in sample]
+    linear_seconds = time.perf_counter() - start
+
+    if scanned != indexed[: len(sample)]:
+        raise SystemExit("CatalogIndex disagrees with the linear scan")
+    per_index = indexed_seconds / len(queries) * 1e6
+    per_scan = linear_seconds / len(sample) * 1e6
+    print(f"{'index':<12} {per_index:12.1f} us/query")
+    print(f"{'linear scan':<12} {per_scan:12.1f} us/query")
+    print(f"speedup: {per_scan / per_index:,.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
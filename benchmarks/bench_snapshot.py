@@ -0,0 +1,77 @@
+"""Load-time benchmark: binary snapshots versus pickle.
+
+Run with `python -m benchmarks.bench_snapshot [baskets]`.
+"""
+
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+from basket_snapshot import SnapshotReader, write_snapshot
+from product_basket import Basket, Product
+
+
+def build_baskets(count: int, seed: int = 0) -> list[Basket]:
+    """Builds `count` random baskets over a shared product range."""
+    rng = random.Random(seed)
+    products = [
+        Product(f"Product {i}", rng.randint(1, 800), rng.randint(1, 5))
+        for i in range(1000)
+    ]
+    baskets = []
+    for _ in range(count):
+        basket = Basket()
+        for product in rng.sample(products, rng.randint(1, 6)):
+            basket.add_product(product, rng.randint(1, 3))
+        baskets.append(basket)
+    return baskets
+
+
+def timed(function) -> float:
+    """Returns the wall time of one call in seconds."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(count: int = 100_000) -> None:
+    baskets = build_baskets(count)
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "baskets.snap")
+        pickle_path = os.path.join(directory, "baskets.pickle")
+        write_snapshot(snapshot_path, baskets)
+        with open(pickle_path, "wb") as file:
+            pickle.dump(baskets, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        def load_pickle() -> None:
+            with open(pickle_path, "rb") as file:
+                pickle.load(file)
+
+        def open_snapshot() -> None:
+            SnapshotReader(snapshot_path).close()
+
+        def open_snapshot_and_read_one() -> None:
+            with SnapshotReader(snapshot_path) as reader:
+                reader[count // 2]
+
+        def load_snapshot_fully() -> None:
+            with SnapshotReader(snapshot_path) as reader:
+                list(reader)
+
+        print(f"{count} baskets")
+        print(f"  file size   snapshot {os.path.getsize(snapshot_path):>12} bytes")
+        print(f"              pickle   {os.path.getsize(pickle_path):>12} bytes")
+        for label, function in [
+            ("pickle.load, all baskets", load_pickle),
+            ("snapshot open", open_snapshot),
+            ("snapshot open + 1 basket", open_snapshot_and_read_one),
+            ("snapshot open + all baskets", load_snapshot_fully),
+        ]:
+            print(f"  {label:<30} {timed(function) * 1000:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
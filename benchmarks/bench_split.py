@@ -0,0 +1,62 @@
+"""Order splitting: split_order versus adding until ValueError.
+
+Run with `python -m benchmarks.bench_split [lines]`.
+
+Reports the time, the number of baskets (next to the lower bound set by the
+item and weight limits) and the total shipping cost of each approach.
+"""
+
+import random
+import sys
+import time
+
+from order_split import split_order
+from product_basket import Basket, Product
+
+
+def build_order(count: int, seed: int = 0) -> list[tuple[Product, int]]:
+    """Builds an order of `count` lines of random products."""
+    rng = random.Random(seed)
+    return [
+        (Product(f"Product {i}", rng.randint(1, 800), rng.randint(1, 20)), q)
+        for i, q in enumerate(rng.choices(range(1, 6), k=count))
+    ]
+
+
+def brute_force(lines: list[tuple[Product, int]]) -> list[Basket]:
+    """Adds units one at a time, opening a new basket on ValueError."""
+    baskets = [Basket()]
+    for product, quantity in lines:
+        for _ in range(quantity):
+            try:
+                baskets[-1].add_product(product)
+            except ValueError:
+                baskets.append(Basket())
+                baskets[-1].add_product(product)
+    return baskets
+
+
+def main(count: int = 5000) -> None:
+    lines = build_order(count)
+    units = sum(quantity for _, quantity in lines)
+    weight = sum(product.weight * quantity for product, quantity in lines)
+    lower_bound = max(-(-units // Basket.MAX_ITEMS), -(-weight // Basket.MAX_WEIGHT))
+    print(f"{count} lines, {units} units, at least {lower_bound} baskets")
+
+    for name, split in [
+        ("add until ValueError", lambda: brute_force(lines)),
+        ("split_order", lambda: split_order(lines)),
+        ("split_order optimized", lambda: split_order(lines, optimize_shipping=True)),
+    ]:
+        start = time.perf_counter()
+        baskets = split()
+        elapsed = time.perf_counter() - start
+        shipping = sum(basket.get_shipping_cost for basket in baskets)
+        print(
+            f"{name:<22} {elapsed * 1000:9.1f} ms {len(baskets):8} baskets "
+            f"{shipping:10} shipping"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
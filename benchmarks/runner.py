@@ -0,0 +1,127 @@
+"""Runs the benchmark scenarios and gates on regressions against a baseline.
+
+    python -m benchmarks.runner                    # compare with the baseline
+    python -m benchmarks.runner --update           # rewrite the baseline
+    python -m benchmarks.runner -k many_baskets    # only matching scenarios
+
+Results are ops/sec per scenario and size, keyed as "<scenario>[<size>]". The
+run exits with status 1 if any result falls below the baseline by more than
+the tolerance.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.scenarios import SCENARIOS
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def measure(setup, size: int, repeats: int = 5, min_time: float = 0.05) -> float:
+    """
+    Returns the median ops/sec of a scenario over several timed samples.
+
+    Each sample loops the scenario until it takes at least `min_time` seconds,
+    so that short scenarios are not dominated by timer noise.
+    """
+    run, ops = setup(size)
+    loops = 1
+    while True:  # Calibration, which doubles as the warm-up
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        if time.perf_counter() - start >= min_time:
+            break
+        loops *= 2
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        samples.append(time.perf_counter() - start)
+    return ops * loops / statistics.median(samples)
+
+
+def run_all(pattern: str = "", repeats: int = 5) -> dict[str, float]:
+    """Measures every scenario whose name contains `pattern`."""
+    results: dict[str, float] = {}
+    for name, (setup, sizes) in SCENARIOS.items():
+        if pattern not in name:
+            continue
+        for size in sizes:
+            results[f"{name}[{size}]"] = round(measure(setup, size, repeats))
+    return results
+
+
+def find_regressions(
+    results: dict[str, float], baseline: dict[str, float], tolerance: float
+) -> list[str]:
+    """
+    Lists results that are slower than the baseline by more than the tolerance.
+
+    :param results: Measured ops/sec by key
+    :param baseline: Stored ops/sec by key
+    :param tolerance: Allowed relative slowdown, e.g. 0.2 for 20%
+    """
+    regressions = []
+    for key, ops_per_sec in results.items():
+        expected = baseline.get(key)
+        if expected is not None and ops_per_sec < expected * (1 - tolerance):
+            regressions.append(
+                f"{key}: {ops_per_sec:,.0f} ops/sec vs baseline {expected:,.0f} "
+                f"({ops_per_sec / expected - 1:+.1%})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--output", type=Path, help="also write results here")
+    parser.add_argument("--tolerance", type=float, default=0.4)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("-k", dest="pattern", default="")
+    parser.add_argument("--update", action="store_true", help="rewrite the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_all(args.pattern, args.repeats)
+    for key, ops_per_sec in results.items():
+        print(f"{key:<40} {ops_per_sec:>16,.0f} ops/sec")
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.update:
+        if args.baseline.exists():
+            stored = json.loads(args.baseline.read_text())["results"]
+            report["results"] = {**stored, **results}
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update to create one.")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())["results"]
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nRegressions beyond {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions beyond {args.tolerance:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
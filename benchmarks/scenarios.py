@@ -0,0 +1,211 @@
+"""Benchmark scenarios for Product and Basket.
+
+Each scenario is a setup function that receives a size and returns a
+`(run, ops)` pair: `run()` performs `ops` operations and is what gets timed.
+"""
+
+import random
+from collections.abc import Callable
+
+import basket_metrics
+from basket_limits import BasketLimits
+from product_basket import Basket, Product
+
+Scenario = Callable[[int], tuple[Callable[[], None], int]]
+
+SCENARIOS: dict[str, tuple[Scenario, tuple[int, ...]]] = {}
+
+
+def scenario(*sizes: int) -> Callable[[Scenario], Scenario]:
+    """Registers a setup function to be benchmarked at each of `sizes`."""
+
+    def register(setup: Scenario) -> Scenario:
+        SCENARIOS[setup.__name__] = (setup, sizes)
+        return setup
+
+    return register
+
+
+_UNBOUNDED = BasketLimits(max_items=10**12, max_weight=10**12)
+
+
+def _products(count: int, seed: int = 0) -> list[Product]:
+    rng = random.Random(seed)
+    return [
+        Product(f"Product {i}", rng.randint(1, 800), rng.randint(1, 5))
+        for i in range(count)
+    ]
+
+
+def _filled_basket(products: list[Product]) -> Basket:
+    basket = Basket(limits=_UNBOUNDED)
+    for product in products:
+        basket.add_product(product, 2)
+    return basket
+
+
+@scenario(10, 100, 1000)
+def add_delete_cycle(size: int) -> tuple[Callable[[], None], int]:
+    """Adds and deletes one line in a basket already holding `size` lines."""
+    products = _products(size + 1)
+    basket = _filled_basket(products[:size])
+    extra = products[size]
+
+    def run() -> None:
+        for _ in range(1000):
+            basket.add_product(extra, 1)
+            basket.delete_product(extra.id)
+
+    return run, 2000
+
+
+@scenario(10, 100, 1000)
+def list_products(size: int) -> tuple[Callable[[], None], int]:
+    """Reads the expanded product list of a basket holding `size` lines."""
+    basket = _filled_basket(_products(size))
+
+    def run() -> None:
+        for _ in range(100):
+            basket.list_products
+
+    return run, 100
+
+
+@scenario(10, 100, 1000)
+def price_reads(size: int) -> tuple[Callable[[], None], int]:
+    """Reads total_price and get_price of a basket holding `size` lines."""
+    basket = _filled_basket(_products(size))
+
+    def run() -> None:
+        for _ in range(1000):
+            basket.total_price
+            basket.get_price
+
+    return run, 2000
+
+
+@scenario(10, 100, 1000)
+def mutation_read_mix(size: int) -> tuple[Callable[[], None], int]:
+    """Interleaves a mutation with quote reads, as a checkout page would."""
+    products = _products(size + 1)
+    basket = _filled_basket(products[:size])
+    extra = products[size]
+
+    def run() -> None:
+        for _ in range(500):
+            basket.add_product(extra, 1)
+            basket.get_price
+            basket.total_weight
+            basket.delete_product(extra.id)
+            basket.get_price
+
+    return run, 2500
+
+
+@scenario(1000, 100_000)
+def wholesale_mutation_read_mix(size: int) -> tuple[Callable[[], None], int]:
+    """Runs the mutation/read mix on a 100-line basket holding `size` units."""
+    products = _products(101)
+    basket = Basket(limits=_UNBOUNDED)
+    for product in products[:100]:
+        basket.add_product(product, size // 100)
+    extra = products[100]
+
+    def run() -> None:
+        for _ in range(500):
+            basket.add_product(extra, 50)
+            basket.get_price
+            basket.total_weight
+            basket.delete_product(extra.id)
+            basket.get_price
+
+    return run, 2500
+
+
+@scenario(10, 1000)
+def preview_candidates(size: int) -> tuple[Callable[[], None], int]:
+    """Previews adding each of 50 candidates to a basket holding `size` lines."""
+    products = _products(size + 50)
+    basket = _filled_basket(products[:size])
+    candidates = products[size:]
+
+    def run() -> None:
+        for candidate in candidates:
+            basket.preview_add(candidate, 1)
+
+    return run, 50
+
+
+@scenario(10, 1000)
+def snapshot_candidates(size: int) -> tuple[Callable[[], None], int]:
+    """Prices each of 50 candidates on a copy-on-write snapshot of the basket."""
+    products = _products(size + 50)
+    basket = _filled_basket(products[:size])
+    candidates = products[size:]
+
+    def run() -> None:
+        for candidate in candidates:
+            clone = basket.snapshot()
+            clone.add_product(candidate, 1)
+            clone.get_price
+
+    return run, 50
+
+
+@scenario(100, 1000, 10_000)
+def many_baskets_quote(size: int) -> tuple[Callable[[], None], int]:
+    """Quotes `size` small baskets, one get_price call each."""
+    rng = random.Random(1)
+    products = _products(200)
+    baskets = []
+    for _ in range(size):
+        basket = Basket()
+        for product in rng.sample(products, 3):
+            basket.add_product(product, 1)
+        baskets.append(basket)
+
+    def run() -> None:
+        for basket in baskets:
+            basket.get_price
+
+    return run, size
+
+
+@scenario(100, 1000, 10_000)
+def many_baskets_fill(size: int) -> tuple[Callable[[], None], int]:
+    """Creates `size` baskets and adds three products to each."""
+    products = _products(3)
+
+    def run() -> None:
+        for _ in range(size):
+            basket = Basket()
+            for product in products:
+                basket.add_product(product, 1)
+
+    return run, 3 * size
+
+
+@scenario(10_000)
+def product_creation(size: int) -> tuple[Callable[[], None], int]:
+    """Creates `size` products."""
+
+    def run() -> None:
+        for i in range(size):
+            Product("Product", i + 1, 1)
+
+    return run, size
+
+
+@scenario(10, 1000)
+def instrumented_mutation_read_mix(size: int) -> tuple[Callable[[], None], int]:
+    """Runs mutation_read_mix with metrics enabled, to price the instrumentation."""
+    run_mix, ops = mutation_read_mix(size)
+
+    def run() -> None:
+        basket_metrics.enable()
+        try:
+            run_mix()
+        finally:
+            basket_metrics.disable()
+
+    return run, ops
@@ -0,0 +1,124 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from operator import attrgetter
+
+from product_basket import Basket, Product
+
+
+def _check_count(count: int) -> None:
+    if not isinstance(count, int) or count < 1:
+        raise TypeError(f"Expected a positive integer, got {type(count).__name__}")
+
+
+class CatalogIndex:
+    """
+    A price-sorted, weight-aware index over a fixed set of products.
+
+    Products are kept in price order next to a min-weight segment tree, so
+    "the cheapest products costing at least X and weighing at most W" is
+    answered in O(log n) per product returned instead of a catalog scan.
+    """
+
+    def __init__(self, products: Iterable[Product]) -> None:
+        """
+        Build the index.
+
+        :param products: Products to index, e.g. a whole catalog
+        :raises TypeError: if an element is not a Product
+        """
+        products = list(products)
+        for product in products:
+            if not isinstance(product, Product):
+                raise TypeError(
+                    f"Expected a Product object, got {type(product).__name__}"
+                )
+        products.sort(key=attrgetter("price", "weight", "id"))
+        self._products = products
+        self._prices = [product.price for product in products]
+
+        # tree[size + i] is the weight of products[i]; each inner node holds
+        # the minimum weight of its two children. Padding never fits.
+        size = 1
+        while size < len(products):
+            size *= 2
+        tree = [float("inf")] * (2 * size)
+        tree[size : size + len(products)] = [product.weight for product in products]
+        for node in range(size - 1, 0, -1):
+            tree[node] = min(tree[2 * node], tree[2 * node + 1])
+        self._size = size
+        self._tree = tree
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def price_range(self, low: int, high: int) -> list[Product]:
+        """Returns the products priced from low to high inclusive, cheapest first."""
+        start = bisect_left(self._prices, low)
+        return self._products[start : bisect_right(self._prices, high, start)]
+
+    def _first_fitting(self, start: int, max_weight: int) -> int:
+        """Returns the first position from start within max_weight, or -1."""
+        tree = self._tree
+        if start >= self._size:
+            return -1
+        node = start + self._size
+        # Walk right across the subtrees covering [start, end) until one fits.
+        while tree[node] > max_weight:
+            while node & 1:
+                node >>= 1
+            if node == 0:
+                return -1
+            node += 1
+        while node < self._size:
+            node *= 2
+            if tree[node] > max_weight:
+                node += 1
+        return node - self._size
+
+    def cheapest(
+        self, min_price: int, max_weight: int, count: int = 1
+    ) -> list[Product]:
+        """
+        Returns the cheapest products costing at least min_price and weighing at
+        most max_weight, cheapest first, in O(count * log n).
+
+        :param min_price: Lowest acceptable price
+        :param max_weight: Highest acceptable weight
+        :param count: Maximum number of products returned
+        :raises TypeError: if count is not a positive integer
+        """
+        _check_count(count)
+        return self._cheapest(min_price, max_weight, count)
+
+    def _cheapest(self, min_price: int, max_weight: int, count: int) -> list[Product]:
+        found: list[Product] = []
+        position = bisect_left(self._prices, min_price)
+        while len(found) < count:
+            position = self._first_fitting(position, max_weight)
+            if position < 0:
+                break
+            found.append(self._products[position])
+            position += 1
+        return found
+
+    def free_shipping_gap(self, basket: Basket, count: int = 1) -> list[Product]:
+        """
+        Returns the cheapest products that move the basket to its next shipping
+        tier when added once, within the basket's remaining item and weight
+        capacity. Empty if the basket is already on the last tier or full.
+
+        :param basket: The basket to complete
+        :param count: Maximum number of products returned
+        :raises TypeError: if basket is not a Basket or count is invalid
+        """
+        if not isinstance(basket, Basket):
+            raise TypeError(f"Expected a Basket object, got {type(basket).__name__}")
+        _check_count(count)
+        total_price = basket.total_price
+        threshold = basket.shipping_policy.next_threshold(total_price)
+        limits = basket.limits
+        if threshold is None or basket.item_count >= limits.max_items:
+            return []
+        return self._cheapest(
+            threshold - total_price, limits.max_weight - basket.total_weight, count
+        )
@@ -0,0 +1,325 @@
+from collections.abc import Callable, Iterable
+
+from basket_limits import BasketLimits
+from catalog_index import CatalogIndex
+from product_basket import Basket, Product
+from shipping_policy import ShippingPolicy
+
+# An order line: a product and its quantity.
+Line = tuple[Product, int]
+# A packing under construction: per basket, quantities by product ID.
+Packing = list[dict[int, int]]
+
+
+def _heaviest_first(lines: list[Line]) -> list[Line]:
+    """Orders lines for the tightest packing when the weight limit binds."""
+    return sorted(lines, key=lambda line: (-line[0].weight, -line[0].price))
+
+
+def _balanced(lines: list[Line]) -> list[Line]:
+    """Alternates heavy and light lines, for when the item limit binds."""
+    ordered = _heaviest_first(lines)
+    half = (len(ordered) + 1) // 2
+    balanced = ordered[:]
+    balanced[0::2] = ordered[:half]
+    balanced[1::2] = ordered[half:][::-1]
+    return balanced
+
+
+def _priciest_first(lines: list[Line]) -> list[Line]:
+    """Concentrates value so more baskets reach a cheaper shipping tier."""
+    return sorted(lines, key=lambda line: (-line[0].price, -line[0].weight))
+
+
+def _densest_first(lines: list[Line]) -> list[Line]:
+    """Orders lines by price per unit of weight."""
+    return sorted(lines, key=lambda line: -line[0].price / line[0].weight)
+
+
+# Line orders packed by every split; the shipping orders are packed too when
+# optimizing shipping. The packing with the fewest baskets wins.
+_PACKING_ORDERS = (_heaviest_first, _balanced)
+_SHIPPING_ORDERS = (_priciest_first, _densest_first)
+
+# Products tried per unit when moving or swapping units to cut shipping.
+_CANDIDATES = 8
+
+
+class _FirstFit:
+    """
+    Open baskets in opening order, with a max segment tree over their free
+    weight, so the first basket a unit fits in is found in O(log baskets).
+    """
+
+    def __init__(self, limits: BasketLimits) -> None:
+        self._limits = limits
+        self.baskets: Packing = []
+        self.items_left: list[int] = []
+        self._size = 1
+        self._tree = [-1, -1]  # Free weight; -1 once a basket has no free items
+
+    def _set(self, index: int, free_weight: int) -> None:
+        """Updates a basket's free weight and its ancestors, stopping early."""
+        tree = self._tree
+        node = index + self._size
+        tree[node] = free_weight
+        while node > 1:
+            sibling = tree[node ^ 1]
+            if sibling > free_weight:
+                free_weight = sibling
+            node >>= 1
+            if tree[node] == free_weight:
+                break
+            tree[node] = free_weight
+
+    def _open(self) -> int:
+        """Opens an empty basket and returns its index."""
+        index = len(self.baskets)
+        if index == self._size:
+            leaves = self._tree[self._size :]
+            self._size *= 2
+            self._tree = [-1] * (2 * self._size)
+            self._tree[self._size : self._size + index] = leaves
+            for node in range(self._size - 1, 0, -1):
+                self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+        self.baskets.append({})
+        self.items_left.append(self._limits.max_items)
+        self._set(index, self._limits.max_weight)
+        return index
+
+    def _first(self, weight: int) -> int:
+        """Returns the first open basket with at least `weight` free, or -1."""
+        tree = self._tree
+        if tree[1] < weight:
+            return -1
+        node = 1
+        while node < self._size:
+            node *= 2
+            if tree[node] < weight:
+                node += 1
+        return node - self._size
+
+    def place(self, product: Product, quantity: int) -> None:
+        """Places units of a product in the first baskets they fit in."""
+        weight = product.weight
+        while quantity:
+            index = self._first(weight)
+            if index < 0:
+                index = self._open()
+            free_weight = self._tree[index + self._size]
+            fit = min(quantity, self.items_left[index], free_weight // weight)
+            basket = self.baskets[index]
+            basket[product.id] = basket.get(product.id, 0) + fit
+            self.items_left[index] -= fit
+            quantity -= fit
+            self._set(
+                index, free_weight - fit * weight if self.items_left[index] else -1
+            )
+
+
+def _pack(
+    lines: list[Line], limits: BasketLimits, order: Callable[[list[Line]], list[Line]]
+) -> Packing:
+    """Packs the lines first-fit in the given order."""
+    packer = _FirstFit(limits)
+    for product, quantity in order(lines):
+        packer.place(product, quantity)
+    return packer.baskets
+
+
+def _totals(
+    packing: Packing, products: dict[int, Product]
+) -> tuple[list[int], list[int], list[int]]:
+    """Returns the total price, weight and item count of every basket."""
+    prices, weights, items = [], [], []
+    for basket in packing:
+        price = weight = count = 0
+        for product_id, quantity in basket.items():
+            product = products[product_id]
+            price += product.price * quantity
+            weight += product.weight * quantity
+            count += quantity
+        prices.append(price)
+        weights.append(weight)
+        items.append(count)
+    return prices, weights, items
+
+
+def _shipping(
+    packing: Packing, products: dict[int, Product], policy: ShippingPolicy
+) -> int:
+    """Returns the total shipping cost of a packing."""
+    return sum(map(policy.quote, _totals(packing, products)[0]))
+
+
+class _ShippingOptimizer:
+    """
+    Lowers the total shipping cost of a packing one unit at a time.
+
+    A basket below its last tier takes a unit from another basket (if it has
+    a free item) or swaps one of its units for a pricier one, whenever that
+    lifts it to its next tier and lowers the total cost. Candidate products
+    are the cheapest that close the gap and fit the weight, found with a
+    CatalogIndex. Every change strictly lowers the cost, so this terminates.
+    """
+
+    def __init__(
+        self,
+        packing: Packing,
+        products: dict[int, Product],
+        limits: BasketLimits,
+        policy: ShippingPolicy,
+    ) -> None:
+        self._packing = packing
+        self._products = products
+        self._limits = limits
+        self._policy = policy
+        self._index = CatalogIndex(products.values())
+        self._holders: dict[int, set[int]] = {}  # Baskets holding each product
+        for basket, basket_lines in enumerate(packing):
+            for product_id in basket_lines:
+                self._holders.setdefault(product_id, set()).add(basket)
+        self._prices, self._weights, self._items = _totals(packing, products)
+
+    def run(self) -> None:
+        improved = True
+        while improved:
+            improved = False
+            for basket in range(len(self._packing)):
+                while self._improve(basket):
+                    improved = True
+        self._packing[:] = [lines for lines in self._packing if lines]
+
+    def _improve(self, receiver: int) -> bool:
+        """Applies the first move or swap that helps the basket; returns if any."""
+        price = self._prices[receiver]
+        threshold = self._policy.next_threshold(price)
+        if threshold is None:
+            return False
+        quote = self._policy.quote
+        gap = threshold - price
+        free_weight = self._limits.max_weight - self._weights[receiver]
+
+        if self._items[receiver] < self._limits.max_items:
+            for product in self._index.cheapest(gap, free_weight, _CANDIDATES):
+                gain = quote(price) - quote(price + product.price)
+                donor = self._donor(product, receiver, None, gain)
+                if donor is not None:
+                    self._transfer(product, donor, receiver)
+                    return True
+
+        for product_id in list(self._packing[receiver]):
+            out = self._products[product_id]
+            for product in self._index.cheapest(
+                out.price + gap, out.weight + free_weight, _CANDIDATES
+            ):
+                gain = quote(price) - quote(price - out.price + product.price)
+                donor = self._donor(product, receiver, out, gain)
+                if donor is not None:
+                    self._transfer(product, donor, receiver)
+                    self._transfer(out, receiver, donor)
+                    return True
+        return False
+
+    def _donor(
+        self, product: Product, receiver: int, back: Product | None, gain: int
+    ) -> int | None:
+        """
+        Returns a basket that can give a unit of the product (taking `back`
+        in exchange) for less shipping cost than the receiver gains, or None.
+        """
+        quote = self._policy.quote
+        for basket in self._holders[product.id]:
+            if basket == receiver:
+                continue
+            price = self._prices[basket] - product.price
+            if back is not None:
+                price += back.price
+                weight = self._weights[basket] - product.weight + back.weight
+                if weight > self._limits.max_weight:
+                    continue
+            if quote(price) - quote(self._prices[basket]) < gain:
+                return basket
+        return None
+
+    def _transfer(self, product: Product, source: int, target: int) -> None:
+        """Moves one unit of a product between baskets."""
+        source_lines = self._packing[source]
+        source_lines[product.id] -= 1
+        if not source_lines[product.id]:
+            del source_lines[product.id]
+            self._holders[product.id].discard(source)
+        target_lines = self._packing[target]
+        target_lines[product.id] = target_lines.get(product.id, 0) + 1
+        self._holders[product.id].add(target)
+        for column, value in [
+            (self._prices, product.price),
+            (self._weights, product.weight),
+            (self._items, 1),
+        ]:
+            column[target] += value
+            column[source] -= value
+
+
+def split_order(
+    lines: Iterable[Line],
+    limits: BasketLimits | None = None,
+    shipping_policy: ShippingPolicy | None = None,
+    optimize_shipping: bool = False,
+) -> list[Basket]:
+    """
+    Packs an order into as few limit-compliant baskets as the heuristic finds.
+
+    Units are packed first-fit with a segment tree over the baskets' free
+    weight, once heaviest first and once alternating heavy and light lines,
+    and the packing with fewer baskets is kept; an order of thousands of
+    lines splits in milliseconds. A line may be spread over several baskets.
+
+    With optimize_shipping, price-led orders are packed too and the packing
+    with the fewest baskets, then the lowest total shipping cost, is kept;
+    units are then moved or swapped between baskets while that lowers the
+    total shipping cost. It never uses more baskets than the plain split.
+
+    :param lines: (product, quantity) pairs; repeated products are combined
+    :param limits: Limits of every basket (default limits if None)
+    :param shipping_policy: Shipping tiers of every basket (default if None)
+    :param optimize_shipping: Also minimize the total shipping cost
+    :raises TypeError: if an element is not a (Product, positive int) pair or
+        limits or shipping_policy has the wrong type
+    :raises ValueError: if a product alone exceeds the weight limit
+    """
+    template = Basket(shipping_policy, limits)  # Validates the settings
+    limits = template.limits
+    policy = template.shipping_policy
+
+    products: dict[int, Product] = {}
+    quantities: dict[int, int] = {}
+    for product, quantity in lines:
+        Basket._validate_item(product, quantity)
+        template._check_limits(1, product.weight)
+        products[product.id] = product
+        quantities[product.id] = quantities.get(product.id, 0) + quantity
+    merged = [(products[product_id], q) for product_id, q in quantities.items()]
+
+    if optimize_shipping:
+        packing = min(
+            (
+                _pack(merged, limits, order)
+                for order in _PACKING_ORDERS + _SHIPPING_ORDERS
+            ),
+            key=lambda packing: (len(packing), _shipping(packing, products, policy)),
+        )
+        _ShippingOptimizer(packing, products, limits, policy).run()
+    else:
+        packing = min(
+            (_pack(merged, limits, order) for order in _PACKING_ORDERS), key=len
+        )
+
+    return [
+        Basket._from_lines(
+            ((products[product_id], q) for product_id, q in basket.items()),
+            policy,
+            limits,
+        )
+        for basket in packing
+    ]
@@ -1,10 +1,23 @@
-import itertools
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, NamedTuple
+
+from basket_limits import DEFAULT_BASKET_LIMITS, BasketLimits
+from product_ids import CounterIdAllocator, IdAllocator
+from shipping_policy import DEFAULT_SHIPPING_POLICY, ShippingPolicy
+
+if TYPE_CHECKING:
+    from basket_aggregates import AggregateRegistry
+    from basket_journal import BasketJournal
+    from basket_metrics import BasketMetrics
 
 
 class Product:
     """A class representing a product on a marketplace."""
 
-    _id_counter = itertools.count(1)  # Unique ID generator
+    __slots__ = ("_id", "_name", "_price", "_weight")
+
+    _id_allocator: IdAllocator = CounterIdAllocator(1)  # Unique ID generator
+    _metrics: "BasketMetrics | None" = None  # Set by basket_metrics.enable()
 
     def __init__(self, name: str, price: int, weight: int) -> None:
         """
@@ -20,11 +33,38 @@ class Product:
         if weight < 1:
             raise ValueError("Product weight must be at least 1 unit.")
 
-        self._id = next(self._id_counter)
+        self._id = Product._id_allocator.next_id()
         self._name = name
         self._price = price
         self._weight = weight
 
+    @classmethod
+    def set_id_allocator(cls, allocator: IdAllocator) -> IdAllocator:
+        """
+        Replaces the ID allocator used for new products.
+
+        :param allocator: An instance of an IdAllocator subclass
+        :return: The previously installed allocator
+        :raises TypeError: if allocator is not an IdAllocator
+        """
+        if not isinstance(allocator, IdAllocator):
+            raise TypeError(
+                f"Expected an IdAllocator object, got {type(allocator).__name__}"
+            )
+        previous = Product._id_allocator
+        Product._id_allocator = allocator
+        return previous
+
+    @classmethod
+    def _restore(cls, product_id: int, name: str, price: int, weight: int) -> "Product":
+        """Recreates a persisted product with its original ID, skipping validation."""
+        product = cls.__new__(cls)
+        product._id = product_id
+        product._name = name
+        product._price = price
+        product._weight = weight
+        return product
+
     @property
     def id(self) -> int:
         """Returns the unique ID of the product."""
@@ -46,15 +86,170 @@ class Product:
         return self._weight
 
 
+class ProductCatalog:
+    """A registry that hands out one shared Product instance per catalog entry."""
+
+    def __init__(self) -> None:
+        """Initialize an empty catalog."""
+        self._by_id: dict[int, Product] = {}
+        self._by_key: dict[tuple[str, int, int], Product] = {}
+
+    def intern(self, product: Product) -> Product:
+        """
+        Returns the catalog instance for the product's ID, registering it if new.
+
+        :param product: An instance of the Product class
+        :raises TypeError: if product is not a Product
+        """
+        if not isinstance(product, Product):
+            raise TypeError(f"Expected a Product object, got {type(product).__name__}")
+        interned = self._by_id.setdefault(product.id, product)
+        self._by_key.setdefault(
+            (interned.name, interned.price, interned.weight), interned
+        )
+        return interned
+
+    def get_or_create(self, name: str, price: int, weight: int) -> Product:
+        """
+        Returns the shared product with these attributes, creating it once.
+
+        :param name: Name of the product
+        :param price: Price of the product (positive integer)
+        :param weight: Weight of the product (positive integer)
+        :raises ValueError: if price or weight is less than 1
+        """
+        key = (name, price, weight)
+        product = self._by_key.get(key)
+        if product is None:
+            product = Product(name, price, weight)
+            self._by_key[key] = product
+            self._by_id[product.id] = product
+        return product
+
+    def get(self, product_id: int) -> Product | None:
+        """Returns the product registered under the ID, or None."""
+        return self._by_id.get(product_id)
+
+    def __contains__(self, product_id: object) -> bool:
+        return product_id in self._by_id
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+class _LineItem:
+    """A single basket line: one distinct product and its quantity."""
+
+    __slots__ = ("product", "quantity")
+
+    def __init__(self, product: Product, quantity: int) -> None:
+        self.product = product
+        self.quantity = quantity
+
+
+class PricePreview(NamedTuple):
+    """The totals a basket would have after a hypothetical change."""
+
+    total_price: int
+    total_weight: int
+    get_shipping_cost: int
+    get_price: int
+    violation: str | None  # "max_items" or "max_weight" if the change is rejected
+
+
+class ProductsView:
+    """
+    A read-only, lazily iterated view of the products in a basket.
+
+    Iteration yields the same sequence as `Basket.list_products` without
+    building it, and raises RuntimeError if the basket is mutated meanwhile.
+    """
+
+    __slots__ = ("_basket",)
+
+    def __init__(self, basket: "Basket") -> None:
+        self._basket = basket
+
+    def __len__(self) -> int:
+        return self._basket._item_count
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, Product):
+            return False
+        line = self._basket._products.get(item.id)
+        return line is not None and line.product is item
+
+    def __iter__(self) -> Iterator[Product]:
+        basket = self._basket
+        version = basket._version
+        lines = iter(basket._products.values())
+        while True:
+            if basket._version != version:
+                raise RuntimeError("Basket changed during iteration")
+            line = next(lines, None)
+            if line is None:
+                return
+            product = line.product
+            for _ in range(line.quantity):
+                yield product
+                if basket._version != version:
+                    raise RuntimeError("Basket changed during iteration")
+
+
 class Basket:
     """A class representing a shopping basket."""
 
-    MAX_WEIGHT = 100  # Maximum total weight of products in the basket
-    MAX_ITEMS = 30  # Maximum number of products in the basket
+    MAX_WEIGHT = DEFAULT_BASKET_LIMITS.max_weight  # Default maximum total weight
+    MAX_ITEMS = DEFAULT_BASKET_LIMITS.max_items  # Default maximum number of products
 
-    def __init__(self) -> None:
-        """Initialize the basket."""
-        self._products: dict[int, list[Product]] = {}
+    _metrics: "BasketMetrics | None" = None  # Set by basket_metrics.enable()
+
+    def __init__(
+        self,
+        shipping_policy: ShippingPolicy | None = None,
+        limits: BasketLimits | None = None,
+    ) -> None:
+        """
+        Initialize the basket.
+
+        :param shipping_policy: Shipping tiers to quote with (default tiers if None)
+        :param limits: Item and weight limits (the MAX_ITEMS and MAX_WEIGHT
+            attributes if None, so subclass and instance overrides apply)
+        :raises TypeError: if shipping_policy or limits has the wrong type
+        """
+        if limits is not None and not isinstance(limits, BasketLimits):
+            raise TypeError(
+                f"Expected a BasketLimits object, got {type(limits).__name__}"
+            )
+        if shipping_policy is None:
+            shipping_policy = DEFAULT_SHIPPING_POLICY
+        elif not isinstance(shipping_policy, ShippingPolicy):
+            raise TypeError(
+                f"Expected a ShippingPolicy object, got {type(shipping_policy).__name__}"
+            )
+        self._shipping_policy = shipping_policy
+        self._limits = limits
+        self._journal: "BasketJournal | None" = None  # Set by BasketJournal.attach()
+        self._aggregates: "AggregateRegistry | None" = None  # Set by track()
+        self._products: dict[int, _LineItem] = {}
+        self._owns_lines = True  # False while line storage is shared with a snapshot
+        self._total_price = 0  # Running aggregates kept in sync by mutations
+        self._total_weight = 0
+        self._item_count = 0
+        self._version = 0  # Bumped on every mutation
+
+    @classmethod
+    def _from_lines(
+        cls,
+        lines: Iterable[tuple[Product, int]],
+        shipping_policy: ShippingPolicy | None = None,
+        limits: BasketLimits | None = None,
+    ) -> "Basket":
+        """Rebuilds a persisted basket from trusted lines, skipping validation."""
+        basket = cls(shipping_policy, limits)
+        for product, quantity in lines:
+            basket._add_line(product, quantity)
+        return basket
 
     def add_product(self, product: Product, quantity: int = 1) -> None:
         """
@@ -65,28 +260,209 @@ class Basket:
         :raises TypeError: if input types are incorrect
         :raises ValueError: if adding the product exceeds basket limits
         """
+        self._validate_item(product, quantity)
+        self._check_limits(
+            self._item_count + quantity,
+            self._total_weight + product.weight * quantity,
+        )
+        self._add_line(product, quantity)
+        self._version += 1
+
+    def add_products(self, items: Iterable[tuple[Product, int]]) -> None:
+        """
+        Adds several products to the basket atomically.
+
+        All items are validated and the basket limits are checked once for the
+        whole batch; if any check fails, nothing is added.
+
+        :param items: (product, quantity) pairs
+        :raises TypeError: if input types are incorrect
+        :raises ValueError: if adding the products exceeds basket limits
+        """
+        items = list(items)
+        added_count = 0
+        added_weight = 0
+        for product, quantity in items:
+            self._validate_item(product, quantity)
+            added_count += quantity
+            added_weight += product.weight * quantity
+
+        self._check_limits(
+            self._item_count + added_count, self._total_weight + added_weight
+        )
+        for product, quantity in items:
+            self._add_line(product, quantity)
+        if items:
+            self._version += 1
+
+    @staticmethod
+    def _validate_item(product: Product, quantity: int) -> None:
+        """Raises TypeError unless given a Product and a positive integer quantity."""
         if not isinstance(product, Product):
+            if Basket._metrics is not None:
+                Basket._metrics.record_rejection("invalid_product")
             raise TypeError(f"Expected a Product object, got {type(product).__name__}")
 
         if not isinstance(quantity, int) or quantity < 1:
+            if Basket._metrics is not None:
+                Basket._metrics.record_rejection("invalid_quantity")
             raise TypeError(
                 f"Expected a positive integer, got {type(quantity).__name__}"
             )
 
-        if len(self.list_products) + quantity > self.MAX_ITEMS:
+    def _limit_violation(self, item_count: int, weight: int) -> str | None:
+        """Returns the limit the resulting item count or weight exceeds, or None."""
+        limits = self._limits
+        if limits is None:
+            max_items, max_weight = self.MAX_ITEMS, self.MAX_WEIGHT
+        else:
+            max_items, max_weight = limits.max_items, limits.max_weight
+        if item_count > max_items:
+            return "max_items"
+        if weight > max_weight:
+            return "max_weight"
+        return None
+
+    def _check_limits(self, item_count: int, weight: int) -> None:
+        """Raises ValueError if the resulting item count or weight exceeds the limits."""
+        violation = self._limit_violation(item_count, weight)
+        if violation is None:
+            return
+        if Basket._metrics is not None:
+            Basket._metrics.record_rejection(violation)
+        if violation == "max_items":
             raise ValueError(
-                "Exceeded maximum number of items in the basket (30 units)."
+                "Exceeded maximum number of items in the basket "
+                f"({self.limits.max_items} units)."
             )
+        raise ValueError(
+            "Exceeded maximum weight of products in the basket "
+            f"({self.limits.max_weight} units)."
+        )
 
-        if self.total_weight + product.weight * quantity > self.MAX_WEIGHT:
-            raise ValueError(
-                "Exceeded maximum weight of products in the basket (100 units)."
+    def max_addable(self, product: Product) -> int:
+        """
+        Returns how many more units of a product fit within the basket limits.
+
+        :param product: An instance of the Product class
+        :raises TypeError: if product is not a Product
+        """
+        if not isinstance(product, Product):
+            raise TypeError(f"Expected a Product object, got {type(product).__name__}")
+        limits = self.limits
+        return max(
+            min(
+                limits.max_items - self._item_count,
+                (limits.max_weight - self._total_weight) // product.weight,
+            ),
+            0,
+        )
+
+    def max_addable_many(self, products: Iterable[Product]) -> list[int]:
+        """
+        Returns `max_addable` for each product, e.g. for a product listing page.
+
+        The remaining capacity is read once for the whole listing.
+
+        :param products: Instances of the Product class
+        :raises TypeError: if an element is not a Product
+        """
+        limits = self.limits
+        items_left = limits.max_items - self._item_count
+        weight_left = limits.max_weight - self._total_weight
+        fits = []
+        for product in products:
+            if not isinstance(product, Product):
+                raise TypeError(
+                    f"Expected a Product object, got {type(product).__name__}"
+                )
+            fits.append(max(min(items_left, weight_left // product.weight), 0))
+        return fits
+
+    def can_add(self, product: Product, quantity: int = 1) -> bool:
+        """
+        Returns whether `add_product(product, quantity)` would stay within the limits.
+
+        :param product: An instance of the Product class
+        :param quantity: Quantity of the product (default is 1)
+        :raises TypeError: if input types are incorrect
+        """
+        if not isinstance(quantity, int) or quantity < 1:
+            raise TypeError(
+                f"Expected a positive integer, got {type(quantity).__name__}"
+            )
+        return quantity <= self.max_addable(product)
+
+    def preview_add(self, product: Product, quantity: int = 1) -> PricePreview:
+        """
+        Returns the totals the basket would have after `add_product(product, quantity)`.
+
+        Nothing is copied or changed. If the addition would exceed the limits,
+        `violation` names the limit and the totals are those the basket would
+        have had without them.
+
+        :param product: An instance of the Product class
+        :param quantity: Quantity of the product (default is 1)
+        :raises TypeError: if input types are incorrect
+        """
+        if not isinstance(product, Product):
+            raise TypeError(f"Expected a Product object, got {type(product).__name__}")
+        if not isinstance(quantity, int) or quantity < 1:
+            raise TypeError(
+                f"Expected a positive integer, got {type(quantity).__name__}"
             )
 
-        if product.id not in self._products:
-            self._products[product.id] = []
+        total_price = self._total_price + product.price * quantity
+        total_weight = self._total_weight + product.weight * quantity
+        shipping_cost = self._shipping_policy.quote(total_price)
+        return PricePreview(
+            total_price,
+            total_weight,
+            shipping_cost,
+            total_price + shipping_cost,
+            self._limit_violation(self._item_count + quantity, total_weight),
+        )
+
+    def snapshot(self) -> "Basket":
+        """
+        Returns a copy-on-write clone of the basket.
+
+        The clone shares line storage with the basket until either of them is
+        changed; the first change copies the lines of the basket that made
+        it. The clone keeps the shipping policy and limits, but is neither
+        journaled nor tracked by an aggregate registry.
+        """
+        clone = Basket.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone._journal = None
+        clone._aggregates = None
+        self._owns_lines = clone._owns_lines = False
+        return clone
 
-        self._products[product.id].extend([product] * quantity)
+    def _own_lines(self) -> None:
+        """Gives the basket its own copy of line storage shared with a snapshot."""
+        self._products = {
+            product_id: _LineItem(line.product, line.quantity)
+            for product_id, line in self._products.items()
+        }
+        self._owns_lines = True
+
+    def _add_line(self, product: Product, quantity: int) -> None:
+        """Adds units to the product's line and updates the running totals."""
+        if not self._owns_lines:
+            self._own_lines()
+        line = self._products.get(product.id)
+        if line is None:
+            self._products[product.id] = _LineItem(product, quantity)
+        else:
+            line.quantity += quantity
+        self._total_price += product.price * quantity
+        self._total_weight += product.weight * quantity
+        self._item_count += quantity
+        if self._journal is not None:
+            self._journal.record_add(product, quantity)
+        if self._aggregates is not None:
+            self._aggregates.record_change(self, product, quantity)
 
     def delete_product(self, product_id: int) -> None:
         """
@@ -94,35 +470,229 @@ class Basket:
 
         :param product_id: The product's ID
         """
-        self._products.pop(product_id, None)
+        products = self._products
+        if not self._owns_lines and products and product_id in products:
+            self._own_lines()
+        line = self._products.pop(product_id, None)
+        if line is not None:
+            product, quantity = line.product, line.quantity
+            self._total_price -= product.price * quantity
+            self._total_weight -= product.weight * quantity
+            self._item_count -= quantity
+            self._version += 1
+            if self._journal is not None:
+                self._journal.record_delete(product_id)
+            if self._aggregates is not None:
+                self._aggregates.record_change(self, product, -quantity)
+
+    def remove_quantity(self, product_id: int, quantity: int = 1) -> None:
+        """
+        Removes units of a product; the line is dropped when none remain.
+
+        Unknown IDs are ignored, as in `delete_product`.
+
+        :param product_id: The product's ID
+        :param quantity: Number of units to remove (default is 1)
+        :raises TypeError: if quantity is not a positive integer
+        """
+        if not isinstance(quantity, int) or quantity < 1:
+            if Basket._metrics is not None:
+                Basket._metrics.record_rejection("invalid_quantity")
+            raise TypeError(
+                f"Expected a positive integer, got {type(quantity).__name__}"
+            )
+
+        line = self._products.get(product_id)
+        if line is not None:
+            self._set_line(product_id, line, max(line.quantity - quantity, 0))
+
+    def set_quantity(self, product_id: int, quantity: int) -> None:
+        """
+        Sets the number of units of a product already in the basket.
+
+        A quantity of 0 drops the line. Unknown IDs are ignored, as in
+        `delete_product`; increases are checked against the basket limits.
+
+        :param product_id: The product's ID
+        :param quantity: New number of units (non-negative integer)
+        :raises TypeError: if quantity is not a non-negative integer
+        :raises ValueError: if the new quantity exceeds basket limits
+        """
+        if not isinstance(quantity, int) or quantity < 0:
+            if Basket._metrics is not None:
+                Basket._metrics.record_rejection("invalid_quantity")
+            raise TypeError(
+                f"Expected a non-negative integer, got {type(quantity).__name__}"
+            )
+
+        line = self._products.get(product_id)
+        if line is not None and quantity != line.quantity:
+            added = quantity - line.quantity
+            if added > 0:
+                self._check_limits(
+                    self._item_count + added,
+                    self._total_weight + line.product.weight * added,
+                )
+            self._set_line(product_id, line, quantity)
+
+    def _set_line(self, product_id: int, line: _LineItem, quantity: int) -> None:
+        """Changes a line's quantity in place (0 drops it) and bumps the version."""
+        if not self._owns_lines:
+            self._own_lines()
+            line = self._products[product_id]
+        change = quantity - line.quantity
+        if quantity == 0:
+            del self._products[product_id]
+        else:
+            line.quantity = quantity
+        product = line.product
+        self._total_price += product.price * change
+        self._total_weight += product.weight * change
+        self._item_count += change
+        self._version += 1
+        if self._journal is not None:
+            self._journal.record_set(product, quantity)
+        if self._aggregates is not None:
+            self._aggregates.record_change(self, product, change)
+
+    def merge(self, other: "Basket", strategy: str = "sum") -> None:
+        """
+        Merges the lines of another basket into this one atomically.
+
+        For products in both baskets the strategy picks the new quantity:
+        "sum" adds the quantities, "max" keeps the larger one and "replace"
+        takes the other basket's. Lines only in this basket are kept. The
+        limits are checked once for the merged result; if they would be
+        exceeded, nothing changes.
+
+        :param other: The basket to merge from (e.g. a guest basket)
+        :param strategy: "sum", "max" or "replace" (default is "sum")
+        :raises TypeError: if other is not a Basket
+        :raises ValueError: if the strategy is unknown or the merge exceeds limits
+        """
+        if not isinstance(other, Basket):
+            raise TypeError(f"Expected a Basket object, got {type(other).__name__}")
+        if strategy not in ("sum", "max", "replace"):
+            raise ValueError(f"Unknown merge strategy {strategy!r}.")
+
+        changes = []
+        added_count = 0
+        added_weight = 0
+        for product_id, theirs in other._products.items():
+            line = self._products.get(product_id)
+            ours = 0 if line is None else line.quantity
+            if strategy == "sum":
+                quantity = ours + theirs.quantity
+            elif strategy == "max":
+                quantity = max(ours, theirs.quantity)
+            else:
+                quantity = theirs.quantity
+            if quantity != ours:
+                changes.append((theirs.product, quantity - ours))
+                added_count += quantity - ours
+                added_weight += theirs.product.weight * (quantity - ours)
+
+        self._check_limits(
+            self._item_count + added_count, self._total_weight + added_weight
+        )
+        for product, change in changes:
+            line = self._products.get(product.id)  # Re-read: lines may be copied
+            if line is None:
+                self._add_line(product, change)
+            else:
+                self._set_line(product.id, line, line.quantity + change)
+        if changes:
+            self._version += 1
+
+    def diff(self, other: "Basket") -> dict[int, int]:
+        """
+        Returns the quantity changes that turn this basket into another one.
+
+        :param other: The basket to compare with
+        :return: Product ID -> quantity in other minus quantity in this basket,
+            for every product whose quantities differ
+        :raises TypeError: if other is not a Basket
+        """
+        if not isinstance(other, Basket):
+            raise TypeError(f"Expected a Basket object, got {type(other).__name__}")
+        deltas = {}
+        for product_id, line in self._products.items():
+            theirs = other._products.get(product_id)
+            change = (0 if theirs is None else theirs.quantity) - line.quantity
+            if change:
+                deltas[product_id] = change
+        for product_id, line in other._products.items():
+            if product_id not in self._products:
+                deltas[product_id] = line.quantity
+        return deltas
+
+    @property
+    def products_view(self) -> "ProductsView":
+        """Returns a read-only view of the products that copies nothing."""
+        return ProductsView(self)
+
+    def iter_lines(self) -> Iterator[tuple[Product, int]]:
+        """Yields (product, quantity) pairs without expanding quantities."""
+        for line in self._products.values():
+            yield line.product, line.quantity
+
+    @property
+    def line_items(self) -> list[tuple[Product, int]]:
+        """Returns a list of (product, quantity) pairs, one per distinct product."""
+        return [(line.product, line.quantity) for line in self._products.values()]
 
     @property
     def list_products(self) -> list[Product]:
-        """Returns a list of all products in the basket."""
-        return [item for sublist in self._products.values() for item in sublist]
+        """
+        Returns a list of all products in the basket.
+
+        The list has one entry per unit; for large baskets prefer `line_items`
+        or `products_view`, which do not expand quantities.
+        """
+        products: list[Product] = []
+        for line in self._products.values():
+            products.extend([line.product] * line.quantity)
+        return products
+
+    @property
+    def limits(self) -> BasketLimits:
+        """Returns the item and weight limits of the basket."""
+        limits = self._limits
+        if limits is not None:
+            return limits
+        if (self.MAX_ITEMS, self.MAX_WEIGHT) == (
+            DEFAULT_BASKET_LIMITS.max_items,
+            DEFAULT_BASKET_LIMITS.max_weight,
+        ):
+            return DEFAULT_BASKET_LIMITS
+        return BasketLimits(self.MAX_ITEMS, self.MAX_WEIGHT)
+
+    @property
+    def shipping_policy(self) -> ShippingPolicy:
+        """Returns the shipping policy the basket is quoted with."""
+        return self._shipping_policy
+
+    @property
+    def item_count(self) -> int:
+        """Returns the number of product units in the basket."""
+        return self._item_count
 
     @property
     def total_price(self) -> int:
         """Returns the total price of all products in the basket."""
-        return sum(product.price for product in self.list_products)
+        return self._total_price
 
     @property
     def total_weight(self) -> int:
         """Returns the total weight of all products in the basket."""
-        return sum(product.weight for product in self.list_products)
+        return self._total_weight
 
     @property
     def get_shipping_cost(self) -> int:
         """Returns the shipping cost based on the total price of products."""
-        if self.total_price == 0:
-            return 0
-        if self.total_price < 500:
-            return 250
-        elif 500 <= self.total_price < 1000:
-            return 100
-        return 0
+        return self._shipping_policy.quote(self._total_price)
 
     @property
     def get_price(self) -> int:
         """Returns the final basket price including shipping."""
-        return self.total_price + self.get_shipping_cost
+        return self._total_price + self._shipping_policy.quote(self._total_price)
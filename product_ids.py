@@ -0,0 +1,186 @@
+import itertools
+import multiprocessing
+import os
+import threading
+import weakref
+from abc import ABC, abstractmethod
+
+
+class IdAllocator(ABC):
+    """Base class for strategies that hand out unique product IDs."""
+
+    @abstractmethod
+    def next_id(self) -> int:
+        """Returns a new unique ID."""
+
+
+class CounterIdAllocator(IdAllocator):
+    """A process-local sequential allocator (the default for Product)."""
+
+    def __init__(self, start: int = 1) -> None:
+        """
+        Initialize the allocator.
+
+        :param start: The first ID to hand out
+        """
+        self._counter = itertools.count(start)
+
+    def next_id(self) -> int:
+        """Returns the next sequential ID."""
+        return next(self._counter)
+
+
+class LocalBlockSource:
+    """
+    Leases ranges of IDs to the threads of a single process.
+
+    A forked child inherits a copy of the next ID and would lease the same
+    blocks as its parent, so leasing from a child raises instead; processes
+    should share a SharedBlockSource.
+    """
+
+    def __init__(self, start: int = 1) -> None:
+        """
+        Initialize the source.
+
+        :param start: The first ID of the first leased block
+        """
+        self._next = start
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def lease(self, size: int) -> int:
+        """
+        Reserves `size` consecutive IDs and returns the first one.
+
+        :raises RuntimeError: if called in a process forked after the source
+            was created
+        """
+        if os.getpid() != self._pid:
+            raise RuntimeError(
+                "A LocalBlockSource cannot lease IDs in a forked process; "
+                "use a SharedBlockSource."
+            )
+        with self._lock:
+            start = self._next
+            self._next += size
+        return start
+
+
+class SharedBlockSource:
+    """
+    Leases ranges of IDs to several processes through shared memory.
+
+    The source must reach worker processes by inheritance, e.g. as an argument
+    of a pool initializer.
+    """
+
+    def __init__(self, start: int = 1) -> None:
+        """
+        Initialize the source.
+
+        :param start: The first ID of the first leased block
+        """
+        self._next = multiprocessing.Value("q", start)
+
+    def lease(self, size: int) -> int:
+        """Reserves `size` consecutive IDs and returns the first one."""
+        with self._next.get_lock():
+            start = self._next.value
+            self._next.value += size
+        return start
+
+
+class BlockIdAllocator(IdAllocator):
+    """
+    Hands out IDs from blocks leased from a shared source.
+
+    Each thread draws from its own leased block, so the source is touched
+    once per `block_size` IDs rather than once per product. A forked child
+    process drops the blocks it inherited and leases its own; with a
+    SharedBlockSource, parent and child therefore never hand out the same IDs,
+    while a LocalBlockSource refuses to lease in the child.
+    """
+
+    def __init__(
+        self, source: LocalBlockSource | SharedBlockSource, block_size: int = 1024
+    ) -> None:
+        """
+        Initialize the allocator.
+
+        :param source: Where blocks of IDs are leased from
+        :param block_size: Number of IDs reserved per lease
+        :raises ValueError: if block_size is less than 1
+        """
+        if block_size < 1:
+            raise ValueError("Block size must be at least 1.")
+        self._source = source
+        self._block_size = block_size
+        self._local = threading.local()
+        _block_allocators.add(self)
+
+    def _reset_after_fork(self) -> None:
+        """Forgets the blocks copied from the parent process."""
+        self._local = threading.local()
+
+    def next_id(self) -> int:
+        """Returns the next ID from the current thread's block."""
+        local = self._local
+        next_id = getattr(local, "next", 0)
+        if next_id == getattr(local, "end", 0):
+            next_id = self._source.lease(self._block_size)
+            local.end = next_id + self._block_size
+        local.next = next_id + 1
+        return next_id
+
+
+_block_allocators: "weakref.WeakSet[BlockIdAllocator]" = weakref.WeakSet()
+
+
+def _reset_block_allocators() -> None:
+    """Drops the inherited blocks of every block allocator in a forked child."""
+    for allocator in _block_allocators:
+        allocator._reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_block_allocators)
+
+
+class PrefixedIdAllocator(IdAllocator):
+    """
+    Builds 63-bit IDs from a node prefix, a worker prefix and a local sequence.
+
+    Layout (high to low bits): node | worker | sequence. IDs from allocators
+    with different (node, worker) pairs never collide, with no coordination.
+    """
+
+    NODE_BITS = 16
+    WORKER_BITS = 12
+    SEQUENCE_BITS = 35
+
+    def __init__(self, node_id: int, worker_id: int) -> None:
+        """
+        Initialize the allocator.
+
+        :param node_id: Identifier of the node (0 to 65535)
+        :param worker_id: Identifier of the worker on the node (0 to 4095)
+        :raises ValueError: if a prefix is out of range
+        """
+        if not 0 <= node_id < 1 << self.NODE_BITS:
+            raise ValueError(f"Node ID must be in [0, {1 << self.NODE_BITS}).")
+        if not 0 <= worker_id < 1 << self.WORKER_BITS:
+            raise ValueError(f"Worker ID must be in [0, {1 << self.WORKER_BITS}).")
+        self._prefix = ((node_id << self.WORKER_BITS) | worker_id) << self.SEQUENCE_BITS
+        # Sequence 0 is skipped so that node 0 / worker 0 never yields ID 0.
+        self._sequence = itertools.count(1)
+
+    def next_id(self) -> int:
+        """
+        Returns the next prefixed ID.
+
+        :raises OverflowError: if the worker's sequence space is exhausted
+        """
+        sequence = next(self._sequence)
+        if sequence >> self.SEQUENCE_BITS:
+            raise OverflowError("Product ID sequence exhausted for this worker.")
+        return self._prefix | sequence
@@ -0,0 +1,89 @@
+from bisect import bisect_right
+from collections.abc import Sequence
+
+
+class ShippingPolicy:
+    """
+    A table of shipping cost tiers keyed by the total price of a basket.
+
+    `costs[i]` applies to totals in `[thresholds[i - 1], thresholds[i])`, so
+    there is one more cost than there are thresholds. An empty basket (total
+    price 0) never pays shipping.
+    """
+
+    def __init__(
+        self, thresholds: Sequence[int], costs: Sequence[int], cache_size: int = 4096
+    ) -> None:
+        """
+        Initialize the policy.
+
+        :param thresholds: Strictly increasing price breakpoints
+        :param costs: Shipping cost of each tier (one more than thresholds)
+        :param cache_size: Maximum number of memoized quotes
+        :raises ValueError: if the tier table is malformed
+        """
+        self._cache: dict[tuple[int, int], int] = {}
+        self._cache_size = cache_size
+        self._version = 0
+        self.set_tiers(thresholds, costs)
+
+    @property
+    def thresholds(self) -> tuple[int, ...]:
+        """Returns the price breakpoints of the tiers."""
+        return self._thresholds
+
+    @property
+    def costs(self) -> tuple[int, ...]:
+        """Returns the shipping cost of each tier."""
+        return self._costs
+
+    @property
+    def version(self) -> int:
+        """Returns a counter that changes whenever the tiers are replaced."""
+        return self._version
+
+    def set_tiers(self, thresholds: Sequence[int], costs: Sequence[int]) -> None:
+        """
+        Replaces the tier table; quotes memoized for earlier tables are dropped.
+
+        :param thresholds: Strictly increasing price breakpoints
+        :param costs: Shipping cost of each tier (one more than thresholds)
+        :raises ValueError: if the tier table is malformed
+        """
+        thresholds = tuple(thresholds)
+        costs = tuple(costs)
+        if len(costs) != len(thresholds) + 1:
+            raise ValueError(
+                "Shipping policy needs exactly one more cost than thresholds."
+            )
+        if any(low >= high for low, high in zip(thresholds, thresholds[1:])):
+            raise ValueError("Shipping thresholds must be strictly increasing.")
+        if any(cost < 0 for cost in costs):
+            raise ValueError("Shipping costs must not be negative.")
+
+        self._thresholds = thresholds
+        self._costs = costs
+        self._version += 1
+        self._cache.clear()
+
+    def quote(self, total_price: int) -> int:
+        """Returns the shipping cost for a basket with the given total price."""
+        if total_price == 0:
+            return 0
+        key = (self._version, total_price)
+        cost = self._cache.get(key)
+        if cost is None:
+            cost = self._costs[bisect_right(self._thresholds, total_price)]
+            if len(self._cache) >= self._cache_size:
+                self._cache.clear()
+            self._cache[key] = cost
+        return cost
+
+    def next_threshold(self, total_price: int) -> int | None:
+        """Returns the lowest threshold above total_price, or None on the last tier."""
+        index = bisect_right(self._thresholds, total_price)
+        return self._thresholds[index] if index < len(self._thresholds) else None
+
+
+# 250 below 500, 100 from 500 to 999, free from 1000.
+DEFAULT_SHIPPING_POLICY = ShippingPolicy(thresholds=(500, 1000), costs=(250, 100, 0))
@@ -0,0 +1,408 @@
+"""Differential stress harness: random operation sequences on Basket and a model.
+
+Every step runs on a `Basket` and on `ReferenceBasket`, a deliberately naive
+model that stores one list entry per unit and recomputes everything from
+that list. After each step the outcome (result, or error type and message)
+and the observable state must agree, for the basket and for the snapshots
+taken of it, which later steps may switch to and change. A sequence is
+reproducible from its seed and operations; failing sequences are shrunk to
+a minimal reproducer.
+
+    python -m tests.stress_harness --operations 1000000 --workers 4 --seed 1
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+from basket_limits import BasketLimits
+from product_basket import Basket, Product
+
+Operation = tuple[Any, ...]
+
+INVALID_PRODUCTS = (None, "TV", 42, 1.5, ("Kettle", 300, 3))
+INVALID_QUANTITIES = (0, -1, -30, 1.5, "2", None)
+INVALID_KEYS = (-1, 10**9, "invalid_id", 1.5, (1,))
+UNHASHABLE_KEYS = ([1], {1: "a"})
+
+
+class ReferenceBasket:
+    """The basket rules written as plainly as possible, one list entry per unit."""
+
+    def __init__(self, max_items: int, max_weight: int) -> None:
+        self.max_items = max_items
+        self.max_weight = max_weight
+        self.units: list[Product] = []
+
+    def snapshot(self) -> "ReferenceBasket":
+        copy = ReferenceBasket(self.max_items, self.max_weight)
+        copy.units = list(self.units)
+        return copy
+
+    def add_products(self, items: list[tuple[Any, Any]]) -> None:
+        for product, quantity in items:
+            if not isinstance(product, Product):
+                raise TypeError(
+                    f"Expected a Product object, got {type(product).__name__}"
+                )
+            if not isinstance(quantity, int) or quantity < 1:
+                raise TypeError(
+                    f"Expected a positive integer, got {type(quantity).__name__}"
+                )
+        added = [product for product, quantity in items for _ in range(quantity)]
+        if len(self.units) + len(added) > self.max_items:
+            raise ValueError(
+                "Exceeded maximum number of items in the basket "
+                f"({self.max_items} units)."
+            )
+        if self.total_weight + sum(product.weight for product in added) > (
+            self.max_weight
+        ):
+            raise ValueError(
+                "Exceeded maximum weight of products in the basket "
+                f"({self.max_weight} units)."
+            )
+        self.units += added
+
+    def add_product(self, product: Any, quantity: Any = 1) -> None:
+        self.add_products([(product, quantity)])
+
+    def delete_product(self, product_id: Any) -> None:
+        if self.units:
+            # Like dict.pop, an empty basket accepts any key, even an unhashable one
+            {}.get(product_id)
+        self.units = [unit for unit in self.units if unit.id != product_id]
+
+    def remove_quantity(self, product_id: Any, quantity: Any = 1) -> None:
+        if not isinstance(quantity, int) or quantity < 1:
+            raise TypeError(
+                f"Expected a positive integer, got {type(quantity).__name__}"
+            )
+        {}.get(product_id)
+        for _ in range(quantity):
+            for index in range(len(self.units) - 1, -1, -1):
+                if self.units[index].id == product_id:
+                    del self.units[index]
+                    break
+
+    def set_quantity(self, product_id: Any, quantity: Any) -> None:
+        if not isinstance(quantity, int) or quantity < 0:
+            raise TypeError(
+                f"Expected a non-negative integer, got {type(quantity).__name__}"
+            )
+        {}.get(product_id)
+        current = [unit for unit in self.units if unit.id == product_id]
+        if current and quantity > len(current):
+            self.add_product(current[0], quantity - len(current))
+        elif current and quantity < len(current):
+            self.remove_quantity(product_id, len(current) - quantity)
+
+    @property
+    def total_price(self) -> int:
+        return sum(unit.price for unit in self.units)
+
+    @property
+    def total_weight(self) -> int:
+        return sum(unit.weight for unit in self.units)
+
+    @property
+    def shipping_cost(self) -> int:
+        total = self.total_price
+        if total == 0 or total >= 1000:
+            return 0
+        return 100 if total >= 500 else 250
+
+
+class Failure(NamedTuple):
+    """A sequence on which Basket and the model disagree."""
+
+    seed: int
+    operations: list[Operation]
+    step: int
+    message: str
+
+
+def _catalog(seed: int) -> tuple[list[Product], int, int]:
+    """Returns the products and limits of a sequence, derived from its seed."""
+    rng = random.Random(seed)
+    products = [
+        Product(f"Product {i}", rng.randint(1, 1200), rng.randint(1, 40))
+        for i in range(rng.randint(1, 6))
+    ]
+    if rng.random() < 0.7:
+        return products, 30, 100
+    return products, rng.randint(1, 60), rng.randint(1, 200)
+
+
+def generate(seed: int, length: int) -> list[Operation]:
+    """Returns a reproducible random operation sequence for a seed."""
+    rng = random.Random(seed)
+    product_count = len(_catalog(seed)[0])
+
+    def product() -> int:
+        return rng.randrange(product_count)
+
+    def quantity() -> Any:
+        roll = rng.random()
+        if roll < 0.8:
+            return rng.randint(1, 5)
+        if roll < 0.9:
+            return rng.randint(6, 40)
+        return rng.choice(INVALID_QUANTITIES)
+
+    def key() -> tuple[str, Any]:
+        roll = rng.random()
+        if roll < 0.8:
+            return ("product", product())
+        if roll < 0.95:
+            return ("key", rng.choice(INVALID_KEYS))
+        return ("key", rng.choice(UNHASHABLE_KEYS))
+
+    operations: list[Operation] = []
+    for _ in range(length):
+        roll = rng.random()
+        if roll < 0.35:
+            operations.append(("add_product", product(), quantity()))
+        elif roll < 0.40:
+            operations.append(("add_invalid_product", rng.choice(INVALID_PRODUCTS)))
+        elif roll < 0.50:
+            items = [(product(), quantity()) for _ in range(rng.randint(0, 3))]
+            operations.append(("add_products", items))
+        elif roll < 0.65:
+            operations.append(("delete_product", key()))
+        elif roll < 0.75:
+            operations.append(("remove_quantity", key(), quantity()))
+        elif roll < 0.85:
+            operations.append(("set_quantity", key(), rng.choice([0, quantity()])))
+        elif roll < 0.88:
+            operations.append(("snapshot",))
+        elif roll < 0.91:
+            operations.append(("switch",))
+        else:
+            operations.append(("read",))
+    return operations
+
+
+def _apply(target: Any, operation: Operation, products: Sequence[Product]) -> None:
+    """Runs one operation on a Basket or a ReferenceBasket."""
+
+    def resolve(key: tuple[str, Any]) -> Any:
+        kind, value = key
+        return products[value].id if kind == "product" else value
+
+    name = operation[0]
+    if name == "add_product":
+        target.add_product(products[operation[1]], operation[2])
+    elif name == "add_invalid_product":
+        target.add_product(operation[1])
+    elif name == "add_products":
+        target.add_products([(products[index], qty) for index, qty in operation[1]])
+    elif name == "delete_product":
+        target.delete_product(resolve(operation[1]))
+    elif name == "remove_quantity":
+        target.remove_quantity(resolve(operation[1]), operation[2])
+    elif name == "set_quantity":
+        target.set_quantity(resolve(operation[1]), operation[2])
+
+
+def _outcome(function: Callable[[], None]) -> tuple[str, str] | None:
+    """Returns the error type and message raised by a call, or None."""
+    try:
+        function()
+    except (TypeError, ValueError) as error:
+        return type(error).__name__, str(error)
+    return None
+
+
+def _state_of_basket(basket: Basket) -> tuple:
+    return (
+        basket.total_price,
+        basket.total_weight,
+        basket.item_count,
+        basket.get_shipping_cost,
+        basket.get_price,
+        len(basket.products_view),
+        Counter(product.id for product in basket.list_products),
+    )
+
+
+def _state_of_model(model: ReferenceBasket) -> tuple:
+    return (
+        model.total_price,
+        model.total_weight,
+        len(model.units),
+        model.shipping_cost,
+        model.total_price + model.shipping_cost,
+        len(model.units),
+        Counter(unit.id for unit in model.units),
+    )
+
+
+def check(
+    seed: int,
+    operations: Sequence[Operation],
+    basket_factory: Callable[[BasketLimits], Basket] | None = None,
+) -> tuple[int, str] | None:
+    """
+    Runs a sequence on Basket and on the model.
+
+    :param seed: Seed the sequence's products and limits are derived from
+    :param operations: Operations as returned by `generate`
+    :param basket_factory: Builds the basket under test (Basket by default)
+    :return: The step and description of the first disagreement, or None
+    """
+    products, max_items, max_weight = _catalog(seed)
+    limits = BasketLimits(max_items, max_weight)
+    basket = Basket(limits=limits) if basket_factory is None else basket_factory(limits)
+    model = ReferenceBasket(max_items, max_weight)
+    snapshots: list[tuple[Basket, ReferenceBasket]] = []  # The two latest
+    for step, operation in enumerate(operations):
+        if operation[0] == "snapshot":
+            snapshots = [*snapshots[-1:], (basket.snapshot(), model.snapshot())]
+        elif operation[0] == "switch" and snapshots:
+            snapshots[-1], (basket, model) = (basket, model), snapshots[-1]
+        else:
+            expected = _outcome(lambda: _apply(model, operation, products))
+            actual = _outcome(lambda: _apply(basket, operation, products))
+            if actual != expected:
+                return step, f"{operation!r}: raised {actual}, model raised {expected}"
+
+        for which, (actual_basket, expected_model) in enumerate(
+            [(basket, model), *snapshots]
+        ):
+            actual_state = _state_of_basket(actual_basket)
+            expected_state = _state_of_model(expected_model)
+            if actual_state != expected_state:
+                label = "basket" if which == 0 else f"snapshot {which}"
+                return step, (
+                    f"{operation!r}: {label} state {actual_state}, "
+                    f"model {expected_state}"
+                )
+    return None
+
+
+def shrink(
+    seed: int,
+    operations: Sequence[Operation],
+    basket_factory: Callable[[BasketLimits], Basket] | None = None,
+) -> list[Operation]:
+    """
+    Returns a minimal sub-sequence that still fails.
+
+    Removes chunks of halving size, then single operations, until no single
+    operation can be removed without the failure disappearing.
+    """
+    operations = list(operations)
+    failed = check(seed, operations, basket_factory)
+    if failed is None:
+        return operations
+    operations = operations[: failed[0] + 1]  # Nothing after the failure matters
+
+    chunk = max(len(operations) // 2, 1)
+    while True:
+        start = 0
+        removed = False
+        while start < len(operations):
+            candidate = operations[:start] + operations[start + chunk :]
+            if candidate and check(seed, candidate, basket_factory) is not None:
+                operations = candidate
+                removed = True
+            else:
+                start += chunk
+        if chunk == 1 and not removed:
+            return operations
+        chunk = max(chunk // 2, 1)
+
+
+def sequence_seed(seed: int, index: int) -> int:
+    """Returns the seed of the `index`-th sequence of a run."""
+    return seed << 32 | index
+
+
+def _run_sequences(
+    seed: int, first: int, last: int, length: int
+) -> tuple[int, Failure | None]:
+    """Runs sequences `first` to `last`; returns the operation count and a failure."""
+    operations_run = 0
+    for index in range(first, last):
+        current = sequence_seed(seed, index)
+        operations = generate(current, length)
+        failed = check(current, operations)
+        if failed is not None:
+            step, message = failed
+            return operations_run + step + 1, Failure(
+                current, operations, step, message
+            )
+        operations_run += len(operations)
+    return operations_run, None
+
+
+def run(
+    operations: int,
+    seed: int = 0,
+    workers: int = 1,
+    length: int = 200,
+) -> tuple[int, Failure | None]:
+    """
+    Runs about `operations` random operations in sequences of `length`.
+
+    :param operations: Total number of operations to run
+    :param seed: Seed of the run; the same seed runs the same sequences
+    :param workers: Number of worker processes (1 runs in this process)
+    :param length: Operations per sequence
+    :return: The number of operations run and the first failure, shrunk, or None
+    """
+    sequences = max(operations // length, 1)
+    if workers == 1:
+        results = [_run_sequences(seed, 0, sequences, length)]
+    else:
+        step = -(-sequences // workers)
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [
+                pool.submit(
+                    _run_sequences, seed, low, min(low + step, sequences), length
+                )
+                for low in range(0, sequences, step)
+            ]
+            results = [future.result() for future in futures]
+
+    total = sum(count for count, _ in results)
+    for _, failure in results:
+        if failure is not None:
+            minimal = shrink(failure.seed, failure.operations)
+            failed = check(failure.seed, minimal)
+            assert failed is not None, "shrink() keeps the sequence failing"
+            step, message = failed
+            return total, Failure(failure.seed, minimal, step, message)
+    return total, None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--length", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    total, failure = run(args.operations, args.seed, args.workers, args.length)
+    elapsed = time.perf_counter() - start
+    print(f"{total:,} operations in {elapsed:.1f}s ({total / elapsed:,.0f} ops/sec)")
+    if failure is None:
+        print("Basket agrees with the reference model.")
+        return 0
+    print(f"Mismatch at step {failure.step} of sequence seed {failure.seed}:")
+    print(f"  {failure.message}")
+    print("Minimal reproducer:")
+    print(f"  check({failure.seed}, {failure.operations!r})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
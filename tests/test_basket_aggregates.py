@@ -0,0 +1,318 @@
+import asyncio
+import random
+
+import pytest
+
+from basket_aggregates import AggregateRegistry, TierStats
+from basket_ingest import BasketBuilder
+from basket_limits import BasketLimits
+from basket_store import AsyncBasketStore
+from product_basket import Basket, Product
+from shipping_policy import ShippingPolicy
+
+
+@pytest.fixture
+def products():
+    """Fixture with a few products."""
+    return [
+        Product("Kettle", 300, 3),
+        Product("Toaster", 400, 4),
+        Product("Mug", 50, 1),
+    ]
+
+
+def _recount(baskets: list[Basket]) -> dict:
+    """Reference implementation: recomputes every figure from list_products."""
+    units: dict[int, int] = {}
+    weight = 0
+    tiers = [[0, 0], [0, 0], [0, 0]]
+    for basket in baskets:
+        for product in basket.list_products:
+            units[product.id] = units.get(product.id, 0) + 1
+            weight += product.weight
+        price = basket.total_price
+        if not price:
+            continue  # Empty baskets pay no shipping and are in no tier
+        tier = tiers[0 if price < 500 else 1 if price < 1000 else 2]
+        tier[0] += 1
+        tier[1] += price
+    return {"units": units, "weight": weight, "tiers": tiers}
+
+
+def _figures(registry: AggregateRegistry, products: list[Product]) -> dict:
+    """Returns the registry's figures in the shape of _recount."""
+    return {
+        "units": {p.id: registry.units(p.id) for p in products if registry.units(p.id)},
+        "weight": registry.reserved_weight,
+        "tiers": [[tier.baskets, tier.revenue] for tier in registry.tiers()],
+    }
+
+
+# Positive tests
+def test_figures_follow_mutations(products):
+    """Test that every kind of mutation updates the figures."""
+    kettle, toaster, mug = products
+    registry = AggregateRegistry()
+    basket = Basket()
+    other = Basket()
+    registry.track(basket)
+    registry.track(other)
+
+    basket.add_product(kettle, 2)
+    basket.add_products([(toaster, 1), (mug, 3)])
+    other.add_product(kettle, 1)
+    basket.remove_quantity(mug.id, 1)
+    basket.set_quantity(toaster.id, 2)
+    basket.delete_product(kettle.id)
+    guest = Basket()
+    guest.add_product(kettle, 4)
+    other.merge(guest, strategy="max")
+
+    expected = _recount([basket, other])
+    figures = _figures(registry, products)
+    assert figures == expected, f"Figures should be {expected}, but got {figures}"
+    assert registry.total_units == basket.item_count + other.item_count
+
+
+def test_figures_match_recount_on_random_mutations():
+    """Test the figures against a full recount after random mutations."""
+    rng = random.Random(5)
+    catalog = [Product(f"Product {i}", rng.randint(1, 400), 1) for i in range(20)]
+    registry = AggregateRegistry()
+    baskets = [Basket(limits=BasketLimits(1000, 1000)) for _ in range(10)]
+    for basket in baskets:
+        registry.track(basket)
+    for _ in range(2000):
+        basket = rng.choice(baskets)
+        product = rng.choice(catalog)
+        action = rng.random()
+        if action < 0.5:
+            basket.add_product(product, rng.randint(1, 3))
+        elif action < 0.7:
+            basket.remove_quantity(product.id, rng.randint(1, 3))
+        elif action < 0.85:
+            basket.set_quantity(product.id, rng.randint(0, 5))
+        else:
+            basket.delete_product(product.id)
+
+    expected = _recount(baskets)
+    figures = _figures(registry, catalog)
+    assert figures == expected, f"Figures should be {expected}, but got {figures}"
+
+
+def test_top_products(products):
+    """Test that top_products ranks products by units held."""
+    kettle, _, mug = products
+    registry = AggregateRegistry()
+    for quantities in [(1, 2, 5), (1, 0, 4)]:
+        basket = Basket()
+        for product, quantity in zip(products, quantities):
+            if quantity:
+                basket.add_product(product, quantity)
+        registry.track(basket)
+
+    top = registry.top_products(2)
+
+    # Kettle and Toaster tie at 2 units; the lower ID (Kettle) comes first.
+    expected = [(mug, 9), (kettle, 2)]
+    assert top == expected, f"Top products should be {expected}, but got {top}"
+    assert len(registry.top_products(10)) == 3, "All 3 products should be listed"
+
+
+def test_tier_histogram(products):
+    """Test that baskets move between tiers as their totals change."""
+    kettle, toaster, _ = products
+    registry = AggregateRegistry()
+    basket = Basket()
+    registry.track(basket)
+    registry.track(Basket())
+    assert (
+        registry.tiers()[0].baskets == 0
+    ), f"Empty baskets should be in no tier, but got {registry.tiers()}"
+
+    basket.add_product(kettle, 1)
+    assert registry.tiers()[0] == TierStats(0, 500, 1, 300)
+    basket.add_product(toaster, 1)
+    assert registry.tiers()[1] == TierStats(500, 1000, 1, 700)
+    basket.add_product(kettle, 1)
+    tiers = registry.tiers()
+    assert tiers[2] == TierStats(1000, None, 1, 1000)
+    assert (
+        tiers[0].baskets == tiers[1].baskets == 0
+    ), f"The lower tiers should be empty, but got {tiers}"
+
+    basket.delete_product(kettle.id)
+    basket.delete_product(toaster.id)
+    assert [tier.baskets for tier in registry.tiers()] == [
+        0,
+        0,
+        0,
+    ], "An emptied basket should leave the tiers"
+    assert len(registry) == 2, "Empty baskets should still be tracked"
+
+
+def test_registry_with_custom_policy(products):
+    """Test that the histogram uses the registry's shipping tiers."""
+    registry = AggregateRegistry(ShippingPolicy((100, 200, 400), (9, 6, 3, 0)))
+    basket = Basket()
+    basket.add_product(products[0], 1)
+    registry.track(basket)
+
+    counts = [tier.baskets for tier in registry.tiers()]
+    assert counts == [0, 0, 1, 0], f"Counts should be [0, 0, 1, 0], but got {counts}"
+
+
+def test_untrack_subtracts_basket(products):
+    """Test that untracking a basket removes it from every figure."""
+    registry = AggregateRegistry()
+    kept = Basket()
+    kept.add_product(products[0], 1)
+    gone = Basket()
+    gone.add_product(products[0], 2)
+    registry.track(kept)
+    registry.track(gone)
+
+    registry.untrack(gone)
+    gone.add_product(products[1], 1)
+
+    assert len(registry) == 1, f"1 basket should be tracked, but got {len(registry)}"
+    assert registry.units(products[0].id) == 1
+    assert registry.units(products[1].id) == 0
+    assert registry.reserved_weight == 3
+    assert [tier.baskets for tier in registry.tiers()] == [1, 0, 0]
+
+
+def test_dropped_sessions_are_untracked(products):
+    """Test that baskets evicted from a store or a builder stop being counted."""
+    registry = AggregateRegistry()
+
+    def tracked_basket() -> Basket:
+        basket = Basket()
+        registry.track(basket)
+        return basket
+
+    now = [0.0]
+    store = AsyncBasketStore(
+        idle_timeout=60, basket_factory=tracked_basket, clock=lambda: now[0]
+    )
+    asyncio.run(store.add_product("idle", products[0], 2))
+    now[0] = 120.0
+    evicted = store.evict_idle()
+
+    builder = BasketBuilder(basket_factory=tracked_basket)
+    event = {"type": "add", "product_id": 7, "name": "Pen", "price": 5, "weight": 1}
+    summaries = list(
+        builder.process([{**event, "session": "a"}, {"session": "a", "type": "close"}])
+    )
+
+    assert evicted == 1 and len(summaries) == 1
+    assert len(registry) == 0, f"No basket should be tracked, but got {len(registry)}"
+    assert (
+        registry.total_units == 0
+    ), f"No units should be counted, but got {registry.total_units}"
+
+
+def test_snapshot(products):
+    """Test that snapshot returns the figures as plain data."""
+    registry = AggregateRegistry()
+    basket = Basket()
+    basket.add_product(products[1], 2)
+    registry.track(basket)
+
+    data = registry.snapshot(top=1)
+
+    assert data["baskets"] == 1
+    assert data["total_units"] == 2
+    assert data["reserved_weight"] == 8
+    assert data["tiers"][1] == {"low": 500, "high": 1000, "baskets": 1, "revenue": 800}
+    assert data["top_products"] == [
+        {"id": products[1].id, "name": "Toaster", "units": 2}
+    ]
+
+
+# Boundary tests
+def test_empty_registry():
+    """Test the figures of a registry that tracks no baskets."""
+    registry = AggregateRegistry()
+
+    assert registry.total_units == 0
+    assert registry.reserved_weight == 0
+    assert registry.top_products() == []
+    assert [tier.baskets for tier in registry.tiers()] == [0, 0, 0]
+
+
+def test_snapshot_clone_is_not_tracked(products):
+    """Test that changes to a copy-on-write clone are not counted."""
+    registry = AggregateRegistry()
+    basket = Basket()
+    basket.add_product(products[0], 1)
+    registry.track(basket)
+
+    clone = basket.snapshot()
+    clone.add_product(products[0], 5)
+
+    assert registry.units(products[0].id) == 1, "The clone should not be counted"
+
+
+def test_emptied_product_leaves_ranking(products):
+    """Test that a product with no units left drops out of top_products."""
+    registry = AggregateRegistry()
+    basket = Basket()
+    registry.track(basket)
+    basket.add_product(products[0], 1)
+    basket.delete_product(products[0].id)
+
+    assert registry.top_products() == [], "No product should be ranked"
+
+
+def test_top_products_cut_inside_tie():
+    """Test that a cut inside a large tie keeps the lowest product IDs."""
+    registry = AggregateRegistry()
+    basket = Basket(limits=BasketLimits(max_items=1000, max_weight=1000))
+    pens = [Product(f"Pen {i}", 5, 1) for i in range(100)]
+    random.Random(3).shuffle(pens)
+    basket.add_products((pen, 1) for pen in pens)
+    registry.track(basket)
+
+    top = [product.id for product, _ in registry.top_products(5)]
+
+    expected = sorted(pen.id for pen in pens)[:5]
+    assert top == expected, f"Top products should be {expected}, but got {top}"
+
+
+# Negative tests
+@pytest.mark.parametrize("value", [None, "basket", []])
+def test_track_invalid_basket(value):
+    """Test that tracking or untracking a non-Basket raises TypeError."""
+    registry = AggregateRegistry()
+    with pytest.raises(TypeError, match="Expected a Basket object"):
+        registry.track(value)
+    with pytest.raises(TypeError, match="Expected a Basket object"):
+        registry.untrack(value)
+
+
+def test_basket_tracked_twice(basket):
+    """Test that a basket can be tracked by one registry at a time."""
+    AggregateRegistry().track(basket)
+
+    with pytest.raises(ValueError, match="The basket is already tracked."):
+        AggregateRegistry().track(basket)
+
+
+def test_untrack_unknown_basket(basket):
+    """Test that untracking a basket the registry does not track fails."""
+    with pytest.raises(ValueError, match="not tracked by this registry"):
+        AggregateRegistry().untrack(basket)
+
+
+@pytest.mark.parametrize("count", [0, -1, 2.5])
+def test_top_products_invalid_count(count):
+    """Test that counts that are not positive integers raise TypeError."""
+    with pytest.raises(TypeError, match="Expected a positive integer"):
+        AggregateRegistry().top_products(count)
+
+
+def test_registry_invalid_policy():
+    """Test that a non-ShippingPolicy raises TypeError."""
+    with pytest.raises(TypeError, match="Expected a ShippingPolicy object, got dict"):
+        AggregateRegistry({})
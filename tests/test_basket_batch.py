@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from basket_batch import BasketBatch
+from product_basket import Basket, Product
+
+
+# Positive tests
+@pytest.mark.parametrize(
+    "total_price, expected_shipping",
+    [(0, 0), (1, 250), (499, 250), (500, 100), (999, 100), (1000, 0), (10**9, 0)],
+)
+def test_batch_shipping_tiers(total_price: int, expected_shipping: int):
+    """Test that vectorized shipping matches the Basket tiers at boundary values."""
+    batch = BasketBatch([1], [total_price], [1], [1])
+
+    assert (
+        batch.get_shipping_cost[0] == expected_shipping
+    ), f"The shipping cost should be {expected_shipping} units, but got {batch.get_shipping_cost[0]}"
+    assert (
+        batch.get_price[0] == total_price + expected_shipping
+    ), f"The final price should be {total_price + expected_shipping} units, but got {batch.get_price[0]}"
+
+
+def test_batch_from_baskets_matches_get_price():
+    """Test that a batch built from baskets matches each basket's own results."""
+    tv = Product("TV", 800, 20)
+    kettle = Product("Kettle", 300, 3)
+    flash_drive = Product("Flash Drive", 100, 1)
+
+    baskets = [Basket() for _ in range(4)]
+    baskets[1].add_product(flash_drive, 2)
+    baskets[2].add_product(kettle, 2)
+    baskets[3].add_product(tv, 1)
+    baskets[3].add_product(kettle, 1)
+
+    batch = BasketBatch.from_baskets(baskets)
+
+    assert batch.total_price.tolist() == [b.total_price for b in baskets]
+    assert batch.total_weight.tolist() == [b.total_weight for b in baskets]
+    assert batch.item_count.tolist() == [b.item_count for b in baskets]
+    assert batch.get_shipping_cost.tolist() == [b.get_shipping_cost for b in baskets]
+    assert batch.get_price.tolist() == [b.get_price for b in baskets]
+    assert batch.basket_ids.tolist() == [0, 1, 2, 3]
+
+
+def test_batch_from_lines_groups_by_basket_id():
+    """Test that raw line columns are aggregated per basket ID."""
+    batch = BasketBatch.from_lines(
+        basket_ids=[7, 3, 7, 3, 9],
+        prices=[300, 100, 800, 50, 1000],
+        weights=[3, 1, 20, 2, 5],
+        quantities=[2, 3, 1, 1, 1],
+    )
+
+    assert batch.basket_ids.tolist() == [3, 7, 9]
+    assert batch.total_price.tolist() == [350, 1400, 1000]
+    assert batch.total_weight.tolist() == [5, 26, 5]
+    assert batch.item_count.tolist() == [4, 3, 1]
+    assert batch.get_shipping_cost.tolist() == [250, 0, 0]
+    assert batch.get_price.tolist() == [600, 1400, 1000]
+
+
+def test_batch_from_lines_matches_baskets():
+    """Test that line-level and basket-level construction agree on random data."""
+    rng = np.random.default_rng(42)
+    products = [
+        Product(f"Product {i}", int(price), int(weight))
+        for i, (price, weight) in enumerate(
+            zip(rng.integers(1, 400, 50), rng.integers(1, 5, 50))
+        )
+    ]
+    baskets = []
+    ids, prices, weights, quantities = [], [], [], []
+    for basket_id in range(200):
+        basket = Basket()
+        for index in rng.choice(
+            len(products), size=int(rng.integers(1, 5)), replace=False
+        ):
+            product = products[index]
+            basket.add_product(product, int(rng.integers(1, 4)))
+        for product, quantity in basket.iter_lines():
+            ids.append(basket_id)
+            prices.append(product.price)
+            weights.append(product.weight)
+            quantities.append(quantity)
+        baskets.append(basket)
+
+    from_lines = BasketBatch.from_lines(ids, prices, weights, quantities)
+    from_baskets = BasketBatch.from_baskets(baskets)
+
+    assert from_lines.get_price.tolist() == from_baskets.get_price.tolist()
+    assert from_lines.total_weight.tolist() == from_baskets.total_weight.tolist()
+
+
+def test_empty_batch():
+    """Test that an empty batch produces empty result columns."""
+    batch = BasketBatch.from_baskets([])
+
+    assert len(batch) == 0
+    assert batch.get_price.tolist() == []
+
+
+# Negative tests
+def test_batch_columns_length_mismatch():
+    """Test that columns of different lengths are rejected."""
+    with pytest.raises(ValueError, match="must have the same length"):
+        BasketBatch.from_lines([1, 2], [100], [1, 1], [1, 1])
+
+
+@pytest.mark.parametrize("invalid_basket", ["basket", None, [Product("TV", 800, 20)]])
+def test_batch_from_baskets_invalid_type(invalid_basket):
+    """Test that non-Basket elements are rejected."""
+    with pytest.raises(TypeError, match="Expected a Basket object"):
+        BasketBatch.from_baskets([Basket(), invalid_basket])
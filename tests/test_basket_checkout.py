@@ -0,0 +1,171 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from basket_checkout import checkout, checkout_lines
+from basket_limits import BasketLimits
+from product_basket import Basket, Product
+from shipping_policy import DEFAULT_SHIPPING_POLICY, ShippingPolicy
+
+
+@pytest.fixture
+def baskets():
+    """Fixture with random baskets, including empty ones and two shipping policies."""
+    rng = random.Random(7)
+    products = [
+        Product(f"Product {i}", rng.randint(1, 800), rng.randint(1, 5))
+        for i in range(50)
+    ]
+    express = ShippingPolicy((300, 2000), (500, 200, 50))
+    baskets = []
+    for index in range(300):
+        basket = Basket(shipping_policy=express if index % 3 == 0 else None)
+        for product in rng.sample(products, rng.randint(0, 5)):
+            basket.add_product(product, rng.randint(1, 3))
+        baskets.append(basket)
+    return baskets
+
+
+# Positive tests
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_checkout_matches_get_price(baskets, max_workers: int):
+    """Test that batch checkout matches each basket's own results, in order."""
+    result = checkout(baskets, max_workers=max_workers, shard_size=64)
+
+    assert len(result) == len(baskets)
+    assert result.get_price.tolist() == [
+        basket.get_price for basket in baskets
+    ], "Batch prices should match get_price exactly"
+    assert result.get_shipping_cost.tolist() == [b.get_shipping_cost for b in baskets]
+    assert result.total_price.tolist() == [b.total_price for b in baskets]
+    assert result.total_weight.tolist() == [b.total_weight for b in baskets]
+    assert result.item_count.tolist() == [b.item_count for b in baskets]
+    assert result.violations == [None] * len(baskets)
+
+
+def test_checkout_reports_limit_violations():
+    """Test that baskets over the checkout limits are reported by reason."""
+    flash_drive = Product("Flash Drive", 10, 1)
+    heater = Product("Heater", 100, 40)
+    baskets = [Basket() for _ in range(4)]
+    baskets[1].add_product(flash_drive, 20)
+    baskets[2].add_product(heater, 2)
+    baskets[3].add_products([(flash_drive, 20), (heater, 2)])
+
+    result = checkout(baskets, limits=BasketLimits(max_items=10, max_weight=50))
+
+    assert result.violations == [
+        None,
+        "max_items",
+        "max_weight",
+        "max_items",
+    ], f"Unexpected violations {result.violations}"
+
+
+def test_checkout_uses_each_basket_limits():
+    """Test that without explicit limits each basket is checked against its own."""
+    crate = Product("Crate", 1, 1)
+    wholesale = Basket(limits=BasketLimits(max_items=1000, max_weight=1000))
+    wholesale.add_product(crate, 500)
+
+    result = checkout([wholesale, Basket()], max_workers=1)
+
+    assert result.violations == [None, None]
+    assert checkout([wholesale], limits=Basket().limits).violations == ["max_items"]
+
+
+def test_checkout_reuses_executor(baskets):
+    """Test that a caller-provided process pool is used and left running."""
+    with ProcessPoolExecutor(2) as pool:
+        first = checkout(baskets, executor=pool, shard_size=100)
+        second = checkout(baskets[:10], executor=pool, shard_size=3)
+
+    assert first.get_price.tolist() == [b.get_price for b in baskets]
+    assert second.get_price.tolist() == [b.get_price for b in baskets[:10]]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_checkout_lines_matches_get_price(baskets, max_workers: int):
+    """Test that line-column checkout matches get_price, in basket ID order."""
+    plain = [b for b in baskets if b.shipping_policy is DEFAULT_SHIPPING_POLICY]
+    columns = [
+        (basket_id, product.price, product.weight, quantity)
+        for basket_id, basket in enumerate(plain)
+        for product, quantity in basket.iter_lines()
+    ]
+    random.Random(3).shuffle(columns)
+    basket_ids, prices, weights, quantities = zip(*columns)
+
+    result = checkout_lines(
+        basket_ids, prices, weights, quantities, max_workers=max_workers, shard_size=50
+    )
+
+    expected = [basket.get_price for basket in plain if basket.item_count]
+    assert (
+        result.get_price.tolist() == expected
+    ), "Line-column prices should match get_price in basket ID order"
+    assert result.violations == [None] * len(expected)
+
+
+def test_checkout_lines_reports_limit_violations():
+    """Test that line-column checkout validates every basket against the limits."""
+    result = checkout_lines(
+        [5, 5, 9, 2],
+        [10, 100, 10, 10],
+        [1, 40, 1, 1],
+        [20, 0, 3, 1],
+        limits=BasketLimits(max_items=10, max_weight=50),
+        max_workers=1,
+    )
+
+    assert result.violations == [None, "max_items", None]
+    assert result.item_count.tolist() == [1, 20, 3]
+
+
+# Boundary tests
+def test_checkout_empty_batch():
+    """Test checking out no baskets."""
+    result = checkout([], max_workers=2)
+
+    assert len(result) == 0 and result.violations == []
+
+
+def test_checkout_extreme_values():
+    """Test that large prices and quantities are summed exactly in int64."""
+    gold = Product("Gold Bar", 10**12, 1)
+    basket = Basket(limits=BasketLimits(max_items=10**6, max_weight=10**6))
+    basket.add_product(gold, 10**6)
+
+    result = checkout([basket], max_workers=1)
+
+    assert result.get_price.tolist() == [basket.get_price] == [10**18]
+
+
+# Negative tests
+@pytest.mark.parametrize("value", [None, "basket", [1, 2]])
+def test_checkout_invalid_basket(value):
+    """Test that only baskets can be checked out."""
+    with pytest.raises(TypeError, match="Expected a Basket object"):
+        checkout([Basket(), value])
+
+
+def test_checkout_invalid_settings():
+    """Test that invalid limits and shard sizes are rejected."""
+    with pytest.raises(TypeError, match="Expected a BasketLimits object"):
+        checkout([Basket()], limits=(30, 100))
+    with pytest.raises(ValueError, match="Shard size must be at least 1"):
+        checkout([Basket()], shard_size=0)
+
+
+def test_checkout_lines_invalid_columns():
+    """Test that line columns of different lengths and invalid settings are rejected."""
+    with pytest.raises(ValueError, match="same length"):
+        checkout_lines([1, 2], [10], [1], [1])
+    with pytest.raises(TypeError, match="Expected a BasketLimits object"):
+        checkout_lines([1], [10], [1], [1], limits=(30, 100))
+    with pytest.raises(TypeError, match="Expected a ShippingPolicy object"):
+        checkout_lines([1], [10], [1], [1], shipping_policy=None)
+    with pytest.raises(ValueError, match="Shard size must be at least 1"):
+        checkout_lines([1], [10], [1], [1], shard_size=0)
@@ -0,0 +1,230 @@
+import csv
+import json
+
+import pytest
+
+from basket_ingest import BasketBuilder, BasketSummary, ingest, read_events
+from basket_limits import BasketLimits
+from product_basket import Basket
+
+PRODUCTS = {1: ("Kettle", 300, 3), 2: ("Toaster", 400, 4)}
+
+
+def _add(session: str, product_id: int, quantity: int = 1) -> dict:
+    """Returns an add event for one of PRODUCTS, or a generated product."""
+    name, price, weight = PRODUCTS.get(product_id, (f"Product {product_id}", 10, 1))
+    return {
+        "session": session,
+        "type": "add",
+        "product_id": product_id,
+        "name": name,
+        "price": price,
+        "weight": weight,
+        "quantity": quantity,
+    }
+
+
+EVENTS = [
+    _add("a", 1, 2),
+    _add("b", 2),
+    _add("a", 2),
+    {"session": "a", "type": "remove", "product_id": 1},
+    {"session": "b", "type": "delete", "product_id": 2},
+    {"session": "a", "type": "close"},
+    _add("c", 1, 4),
+]
+
+FIELDS = ["session", "type", "product_id", "name", "price", "weight", "quantity"]
+
+EXPECTED = [
+    BasketSummary("a", "closed", 2, 2, 700, 7, 100, 800, 0),
+    BasketSummary("b", "end_of_feed", 0, 0, 0, 0, 0, 0, 0),
+    BasketSummary("c", "end_of_feed", 1, 4, 1200, 12, 0, 1200, 0),
+]
+
+
+def _write_jsonl(path, events) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        for event in events:
+            file.write(json.dumps(event) + "\n")
+
+
+def _write_csv(path, events) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, FIELDS)
+        writer.writeheader()
+        writer.writerows(events)
+
+
+# Positive tests
+def test_ingest_jsonl(tmp_path):
+    """Test that a JSONL feed is turned into one summary per session."""
+    path = tmp_path / "events.jsonl"
+    _write_jsonl(path, EVENTS)
+
+    summaries = list(ingest(path))
+
+    assert summaries == EXPECTED, f"Summaries should be {EXPECTED}, but got {summaries}"
+
+
+def test_ingest_csv(tmp_path):
+    """Test that a CSV feed gives the same summaries as the JSONL feed."""
+    path = tmp_path / "events.csv"
+    _write_csv(path, EVENTS)
+
+    summaries = list(ingest(path))
+
+    assert summaries == EXPECTED, f"Summaries should be {EXPECTED}, but got {summaries}"
+
+
+def test_summary_emitted_when_session_closes():
+    """Test that a closed session is summarized before later events are read."""
+    consumed = []
+
+    def events():
+        for event in EVENTS:
+            consumed.append(event)
+            yield event
+
+    summaries = BasketBuilder().process(events())
+    first = next(summaries)
+
+    assert first.session == "a", f"First summary should be 'a', but got {first}"
+    assert len(consumed) == 6, f"6 events should be read, but got {len(consumed)}"
+
+
+def test_rejected_events_are_counted():
+    """Test that events refused by the basket are counted, not raised."""
+    builder = BasketBuilder(basket_factory=lambda: Basket(limits=BasketLimits(3, 100)))
+    (summary,) = builder.process([_add("a", 1, 2), _add("a", 1, 2)])
+
+    assert summary.item_count == 2, f"2 units should remain, but got {summary}"
+    assert summary.rejected == 1, f"1 event should be rejected, but got {summary}"
+
+
+def test_products_are_shared_between_sessions():
+    """Test that cached products are reused by every session."""
+    builder = BasketBuilder()
+    list(builder.process(EVENTS))
+
+    assert (
+        builder.cached_products == 2
+    ), f"2 products should be cached, but got {builder.cached_products}"
+
+
+# Boundary tests
+def test_least_recently_active_session_is_evicted():
+    """Test that opening a session over max_sessions summarizes the oldest one."""
+    builder = BasketBuilder(max_sessions=2)
+    summaries = builder.process([_add(session, 1) for session in "abac"])
+    evicted = next(summaries)
+
+    assert (evicted.session, evicted.reason) == (
+        "b",
+        "evicted",
+    ), f"Session 'b' should be evicted, but got {evicted}"
+    assert len(builder) == 2, f"2 sessions should be open, but got {len(builder)}"
+    assert [s.session for s in summaries] == ["a", "c"]
+
+
+def test_product_cache_is_bounded():
+    """Test that the product cache never holds more than product_cache_size."""
+    builder = BasketBuilder(product_cache_size=2)
+    (summary,) = builder.process([_add("a", product_id) for product_id in range(5)])
+
+    assert (
+        builder.cached_products == 2
+    ), f"2 products should be cached, but got {builder.cached_products}"
+    assert summary.lines == 5, f"5 lines should be added, but got {summary}"
+
+
+def test_evicted_product_readded_at_new_price():
+    """Test that re-adding an evicted product keeps the basket's own line."""
+    repriced = {**_add("a", 1), "price": 900}
+    events = [
+        _add("a", 1),
+        _add("a", 2),
+        repriced,
+        {"session": "a", "type": "delete", "product_id": 1},
+        {"session": "a", "type": "delete", "product_id": 2},
+    ]
+    builder = BasketBuilder(product_cache_size=1)
+
+    (summary,) = builder.process(events[:3])
+    assert (
+        summary.item_count == 3 and summary.total_price == 1000
+    ), f"Both kettles should cost 300, but got {summary}"
+
+    (summary,) = BasketBuilder(product_cache_size=1).process(events)
+    assert summary == BasketSummary(
+        "a", "end_of_feed", 0, 0, 0, 0, 0, 0, 0
+    ), f"The emptied basket should total 0, but got {summary}"
+
+
+def test_close_of_unknown_session():
+    """Test that closing a session that is not open emits nothing."""
+    summaries = list(BasketBuilder().process([{"session": "x", "type": "close"}]))
+
+    assert summaries == [], f"Nothing should be emitted, but got {summaries}"
+
+
+def test_late_events_do_not_open_sessions():
+    """Test that remove/delete events for sessions not open are ignored."""
+    events = [
+        _add("s1", 1),
+        {"session": "s1", "type": "close"},
+        {"session": "s1", "type": "delete", "product_id": 1},
+        {"session": "s2", "type": "remove", "product_id": 2},
+        _add("s3", 2),
+    ]
+    builder = BasketBuilder(max_sessions=1)
+
+    summaries = list(builder.process(events))
+
+    assert [(s.session, s.reason) for s in summaries] == [
+        ("s1", "closed"),
+        ("s3", "end_of_feed"),
+    ], f"Late events should emit no summaries, but got {summaries}"
+    assert (
+        builder.ignored_events == 2
+    ), f"2 events should be ignored, but got {builder.ignored_events}"
+
+
+def test_blank_jsonl_lines_are_skipped(tmp_path):
+    """Test that blank lines in a JSONL feed are ignored."""
+    path = tmp_path / "events.jsonl"
+    path.write_text('\n{"session": "a", "type": "close"}\n\n', encoding="utf-8")
+
+    assert list(read_events(path)) == [{"session": "a", "type": "close"}]
+
+
+# Negative tests
+@pytest.mark.parametrize(
+    "event",
+    [
+        {"type": "add"},
+        {"session": "a", "type": "checkout"},
+        {"session": "a", "type": "add", "product_id": "x"},
+        {"session": "a", "type": "add", "product_id": 1, "name": "Kettle"},
+        {**_add("a", 1), "price": 0},
+    ],
+)
+def test_malformed_event(event):
+    """Test that a malformed event raises ValueError with its position."""
+    summaries = BasketBuilder().process([{"session": "a", "type": "close"}, event])
+
+    with pytest.raises(ValueError, match="Malformed event 2"):
+        list(summaries)
+
+
+def test_unsupported_file_type(tmp_path):
+    """Test that an unknown file extension raises ValueError."""
+    with pytest.raises(ValueError, match="Unsupported event file type '.xml'"):
+        read_events(tmp_path / "events.xml")
+
+
+@pytest.mark.parametrize("bounds", [(0, 10), (10, 0)])
+def test_invalid_bounds(bounds):
+    """Test that bounds below 1 raise ValueError."""
+    with pytest.raises(ValueError, match="Builder bounds must be at least 1."):
+        BasketBuilder(*bounds)
@@ -0,0 +1,261 @@
+import pytest
+
+from basket_journal import HEADER, BasketJournal, replay
+from basket_limits import BasketLimits
+from product_basket import Basket, Product
+
+
+@pytest.fixture
+def products():
+    """Fixture with a few products, including one with a non-ASCII name."""
+    return [
+        Product("Kettle", 300, 3),
+        Product("Toaster", 400, 4),
+        Product("Утюг ✓", 1500, 2),
+    ]
+
+
+def _state(basket: Basket) -> list[tuple[int, str, int, int, int]]:
+    """Returns a comparable description of a basket's lines."""
+    return [
+        (product.id, product.name, product.price, product.weight, quantity)
+        for product, quantity in basket.iter_lines()
+    ]
+
+
+def _mutate(basket: Basket, products: list[Product]) -> None:
+    """Runs every kind of basket mutation once."""
+    kettle, toaster, iron = products
+    basket.add_product(kettle, 2)
+    basket.add_products([(toaster, 1), (iron, 1)])
+    basket.add_product(kettle, 1)
+    basket.delete_product(toaster.id)
+    basket.remove_quantity(kettle.id, 1)
+    basket.set_quantity(iron.id, 3)
+    basket.add_product(toaster, 2)
+    other = Basket()
+    other.add_product(kettle, 4)
+    basket.merge(other, strategy="max")
+
+
+# Positive tests
+def test_replay_rebuilds_basket(tmp_path, products):
+    """Test that replaying a journal rebuilds the journaled basket."""
+    path = tmp_path / "basket.journal"
+    basket = Basket()
+    with BasketJournal(path) as journal:
+        journal.attach(basket)
+        _mutate(basket, products)
+
+    restored = replay(path)
+
+    assert _state(restored) == _state(basket), "Replayed lines should match"
+    assert restored.total_price == basket.total_price
+    assert restored.total_weight == basket.total_weight
+    assert restored.get_price == basket.get_price
+
+
+def test_recover_continues_journal(tmp_path, products):
+    """Test that a recovered basket keeps appending to the same journal."""
+    path = tmp_path / "basket.journal"
+    kettle, toaster, _ = products
+    with BasketJournal(path) as journal:
+        journal.attach(Basket())
+        journal.basket.add_product(kettle, 2)
+
+    with BasketJournal(path) as journal:
+        basket = journal.recover()
+        assert journal.basket is basket
+        basket.add_product(toaster, 1)
+        basket.remove_quantity(kettle.id, 1)
+
+    assert _state(replay(path)) == [
+        (kettle.id, "Kettle", 300, 3, 1),
+        (toaster.id, "Toaster", 400, 4, 1),
+    ]
+
+
+def test_attach_records_existing_lines(tmp_path, products):
+    """Test that attaching a non-empty basket records its lines first."""
+    path = tmp_path / "basket.journal"
+    basket = Basket()
+    basket.add_products([(products[0], 2), (products[2], 1)])
+
+    with BasketJournal(path) as journal:
+        journal.attach(basket)
+
+    assert _state(replay(path)) == _state(basket)
+
+
+def test_compaction_keeps_state(tmp_path, products):
+    """Test that compaction shrinks the journal and keeps the basket state."""
+    path = tmp_path / "basket.journal"
+    kettle, toaster, _ = products
+    basket = Basket(limits=BasketLimits(max_items=10_000, max_weight=100_000))
+    with BasketJournal(path) as journal:
+        journal.attach(basket)
+        for _ in range(500):
+            basket.add_product(kettle, 1)
+            basket.add_product(toaster, 1)
+            basket.delete_product(toaster.id)
+        size_before = path.stat().st_size
+
+        journal.compact()
+        size_after = path.stat().st_size
+        basket.add_product(toaster, 3)  # The tail after the checkpoint
+
+    assert size_after < size_before / 100, (
+        f"The compacted journal should be much smaller, "
+        f"but went from {size_before} to {size_after} bytes"
+    )
+    assert _state(replay(path)) == _state(basket)
+
+
+def test_records_are_synced_in_batches(tmp_path, products):
+    """Test that records are buffered until `sync_every` of them are pending."""
+    path = tmp_path / "basket.journal"
+    basket = Basket()
+    with BasketJournal(path, sync_every=3) as journal:
+        journal.attach(basket)  # First record
+        basket.add_product(products[0], 1)
+        assert path.stat().st_size == HEADER.size, "Nothing is written before a batch"
+
+        basket.add_product(products[0], 1)  # Third record
+        assert replay(path).item_count == 2, "A full batch is written and synced"
+
+        basket.add_product(products[0], 1)
+        journal.flush()
+        assert replay(path).item_count == 3, "flush() writes pending records"
+
+
+# Boundary tests
+def test_replay_ignores_torn_tail(tmp_path, products):
+    """Test that a record cut short by a crash ends the journal."""
+    path = tmp_path / "basket.journal"
+    basket = Basket()
+    with BasketJournal(path) as journal:
+        journal.attach(basket)
+        basket.add_product(products[0], 1)
+        journal.flush()
+        synced = _state(basket)
+        basket.add_product(products[1], 1)
+    data = path.read_bytes()
+    path.write_bytes(data[:-5])
+
+    assert _state(replay(path)) == synced
+
+
+def test_recover_after_torn_tail_keeps_writing(tmp_path, products):
+    """Test that recovery truncates a torn record before appending new ones."""
+    path = tmp_path / "basket.journal"
+    kettle, toaster, _ = products
+    with BasketJournal(path) as journal:
+        journal.attach(Basket())
+        journal.basket.add_product(kettle, 1)
+    with open(path, "ab") as file:
+        file.write(b"A" + bytes(8))  # A partial 17-byte add record
+
+    with BasketJournal(path) as journal:
+        basket = journal.recover()
+        basket.add_product(toaster, 1)
+        basket.add_product(kettle, 1)
+
+    assert _state(replay(path)) == [
+        (kettle.id, "Kettle", 300, 3, 2),
+        (toaster.id, "Toaster", 400, 4, 1),
+    ], "Records written after recovery should replay"
+
+
+def test_torn_tail_written_while_open_is_truncated(tmp_path, products):
+    """Test that recover() also truncates a torn tail that appeared after open."""
+    path = tmp_path / "basket.journal"
+    with BasketJournal(path) as journal:
+        journal.attach(Basket())
+        journal.basket.add_product(products[0], 1)
+        journal.flush()
+        with open(path, "ab") as file:
+            file.write(b"A" + bytes(8))
+        journal.recover().add_product(products[1], 1)
+
+    assert replay(path).item_count == 2, "Both units should replay"
+
+
+def test_empty_journal_replays_empty_basket(tmp_path):
+    """Test that a new journal replays to an empty basket."""
+    path = tmp_path / "basket.journal"
+    BasketJournal(path).close()
+
+    assert replay(path).line_items == []
+
+
+def test_replay_skips_limit_checks(tmp_path, products):
+    """Test that replay rebuilds trusted state without checking basket limits."""
+    path = tmp_path / "basket.journal"
+    basket = Basket(limits=BasketLimits(max_items=1000, max_weight=10_000))
+    with BasketJournal(path) as journal:
+        journal.attach(basket)
+        basket.add_product(products[0], 100)
+
+    assert replay(path).item_count == 100
+    assert replay(path, limits=basket.limits).limits is basket.limits
+
+
+# Negative tests
+def test_detached_basket_is_not_journaled(tmp_path, products):
+    """Test that changes after detaching or closing are not recorded."""
+    path = tmp_path / "basket.journal"
+    basket = Basket()
+    journal = BasketJournal(path)
+    journal.attach(basket)
+    basket.add_product(products[0], 1)
+    journal.close()
+    basket.add_product(products[1], 1)
+
+    assert [name for _, name, *_ in _state(replay(path))] == ["Kettle"]
+    assert basket._journal is None
+
+
+def test_basket_journaled_twice(tmp_path):
+    """Test that a basket can be attached to one journal at a time."""
+    basket = Basket()
+    with BasketJournal(tmp_path / "a.journal") as first:
+        first.attach(basket)
+        with BasketJournal(tmp_path / "b.journal") as second:
+            with pytest.raises(ValueError, match="already journaled"):
+                second.attach(basket)
+
+
+def test_not_a_journal(tmp_path):
+    """Test that files that are not journals are rejected."""
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"X" * 32)
+
+    with pytest.raises(ValueError, match="Not a basket journal file"):
+        BasketJournal(path)
+    with pytest.raises(ValueError, match="Not a basket journal file"):
+        replay(path)
+
+
+def test_corrupt_record(tmp_path):
+    """Test that an unknown record tag is reported with its offset."""
+    path = tmp_path / "basket.journal"
+    with BasketJournal(path) as journal:
+        journal.attach(Basket())
+    path.write_bytes(path.read_bytes() + b"Z" * 20)
+
+    with pytest.raises(ValueError, match="Corrupt journal record at offset"):
+        replay(path)
+
+
+@pytest.mark.parametrize("value", [None, "basket", []])
+def test_attach_invalid_basket(tmp_path, value):
+    """Test that only baskets can be attached."""
+    with BasketJournal(tmp_path / "basket.journal") as journal:
+        with pytest.raises(TypeError, match="Expected a Basket object"):
+            journal.attach(value)
+
+
+def test_invalid_sync_every(tmp_path):
+    """Test that the fsync batch size must be at least 1."""
+    with pytest.raises(ValueError, match="sync_every must be at least 1"):
+        BasketJournal(tmp_path / "basket.journal", sync_every=0)
@@ -0,0 +1,143 @@
+import time
+
+import pytest
+
+from basket_limits import DEFAULT_BASKET_LIMITS, BasketLimits
+from product_basket import Basket, Product
+
+WHOLESALE = BasketLimits(max_items=100_000, max_weight=1_000_000)
+
+
+@pytest.fixture
+def wholesale_basket():
+    """Fixture that returns an empty basket with wholesale limits."""
+    return Basket(limits=WHOLESALE)
+
+
+# Positive tests
+def test_default_limits(basket):
+    """Test that a basket without explicit limits uses the retail defaults."""
+    assert basket.limits is DEFAULT_BASKET_LIMITS
+    assert (basket.limits.max_items, basket.limits.max_weight) == (30, 100)
+    assert (Basket.MAX_ITEMS, Basket.MAX_WEIGHT) == (30, 100)
+
+
+def test_limits_are_per_basket(basket):
+    """Test that baskets with different limits enforce their own limits."""
+    pallet = Product("Pallet", 10, 1)
+    custom = Basket(limits=BasketLimits(max_items=50, max_weight=500))
+
+    custom.add_product(pallet, 50)
+
+    assert custom.item_count == 50, f"Expected 50 units, but got {custom.item_count}"
+    with pytest.raises(ValueError):
+        basket.add_product(pallet, 50)
+
+
+def test_limit_attribute_overrides(basket):
+    """Test that subclass and instance overrides of MAX_ITEMS/MAX_WEIGHT apply."""
+
+    class BigBasket(Basket):
+        MAX_ITEMS = 1000
+
+    pen = Product("Pen", 10, 1)
+    big = BigBasket()
+    big.add_product(pen, 50)
+    basket.MAX_WEIGHT = 200
+    basket.add_product(Product("Brick", 10, 150), 1)
+
+    assert big.item_count == 50, f"Expected 50 units, but got {big.item_count}"
+    assert (big.limits.max_items, big.limits.max_weight) == (1000, 100)
+    assert basket.limits.max_weight == 200
+    with pytest.raises(
+        ValueError, match=r"Exceeded maximum weight of products in the basket \(200"
+    ):
+        basket.add_product(Product("Sandbag", 10, 60), 1)
+
+
+def test_wholesale_basket_at_scale(wholesale_basket):
+    """Test adding, bulk adding and deleting around 100k units."""
+    products = [Product(f"Bolt {i}", 2, 3) for i in range(1000)]
+
+    wholesale_basket.add_products((product, 50) for product in products)
+    wholesale_basket.add_product(products[0], 50_000)
+
+    assert (
+        wholesale_basket.item_count == 100_000
+    ), f"Expected 100000 units, but got {wholesale_basket.item_count}"
+    assert wholesale_basket.total_weight == 300_000
+    assert wholesale_basket.get_price == 200_000
+    assert len(wholesale_basket.line_items) == 1000
+    assert len(wholesale_basket.products_view) == 100_000
+
+    wholesale_basket.delete_product(products[0].id)
+    assert wholesale_basket.item_count == 100_000 - 50_050
+
+
+def test_wholesale_mutations_do_not_scale_with_units(wholesale_basket):
+    """Test that mutations of a 100k-unit basket never expand its quantities."""
+    crate = Product("Crate", 5, 1)
+    extra = Product("Tape", 1, 1)
+    wholesale_basket.add_product(crate, 99_999)
+
+    start = time.perf_counter()
+    for _ in range(10_000):
+        wholesale_basket.add_product(extra, 1)
+        wholesale_basket.get_price
+        wholesale_basket.delete_product(extra.id)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2, f"10,000 mutations should be fast, but took {elapsed:.2f}s"
+
+
+# Boundary tests
+def test_wholesale_limits_boundary(wholesale_basket):
+    """Test that a wholesale basket fills up exactly to its limits."""
+    crate = Product("Crate", 1, 10)
+
+    wholesale_basket.add_product(crate, 100_000)
+    assert wholesale_basket.total_weight == 1_000_000
+
+    with pytest.raises(ValueError):
+        wholesale_basket.add_product(crate, 1)
+    assert wholesale_basket.item_count == 100_000, "A rejected add must change nothing"
+
+
+def test_error_messages_follow_limits(wholesale_basket):
+    """Test that limit errors report the basket's own limits."""
+    light = Product("Washer", 1, 1)
+    heavy = Product("Anvil", 1, 1_000_000)
+
+    with pytest.raises(
+        ValueError,
+        match=r"Exceeded maximum number of items in the basket \(100000 units\)\.",
+    ):
+        wholesale_basket.add_product(light, 100_001)
+    with pytest.raises(
+        ValueError,
+        match=r"Exceeded maximum weight of products in the basket \(1000000 units\)\.",
+    ):
+        wholesale_basket.add_products([(light, 1), (heavy, 1)])
+
+
+# Negative tests
+@pytest.mark.parametrize(
+    "max_items, max_weight, error",
+    [
+        (0, 100, ValueError),
+        (30, -1, ValueError),
+        (30.5, 100, TypeError),
+        ("30", 100, TypeError),
+        (True, 100, TypeError),
+    ],
+)
+def test_invalid_limits(max_items, max_weight, error):
+    """Test that limits must be positive integers."""
+    with pytest.raises(error):
+        BasketLimits(max_items, max_weight)
+
+
+def test_basket_invalid_limits():
+    """Test that a basket rejects limits of the wrong type."""
+    with pytest.raises(TypeError, match="Expected a BasketLimits object"):
+        Basket(limits=(30, 100))
@@ -0,0 +1,166 @@
+import pytest
+
+import basket_metrics
+from product_basket import Basket, Product
+
+
+@pytest.fixture
+def metrics():
+    """Fixture that enables metrics for one test and disables them afterwards."""
+    active = basket_metrics.enable()
+    yield active
+    basket_metrics.disable()
+
+
+# Positive tests
+def test_operation_counters_and_latency(metrics, basket):
+    """Test that mutations and price reads are counted and timed."""
+    kettle = Product("Kettle", 300, 3)
+
+    basket.add_product(kettle, 2)
+    basket.add_products([(kettle, 1)])
+    basket.get_price
+    basket.get_price
+    basket.delete_product(kettle.id)
+
+    assert metrics.operations == {
+        "add_product": 1,
+        "add_products": 1,
+        "get_price": 2,
+        "delete_product": 1,
+    }
+    assert metrics.latency["get_price"].count == 2
+    assert metrics.latency["add_product"].sum > 0
+
+
+def test_quantity_changes_and_merges_are_counted(metrics, basket):
+    """Test that quantity changes and merges are counted, but failed calls are not."""
+    kettle = Product("Kettle", 300, 3)
+    guest = Basket()
+    guest.add_product(kettle, 1)
+    basket.add_product(kettle, 2)
+
+    basket.remove_quantity(kettle.id, 1)
+    basket.set_quantity(kettle.id, 3)
+    basket.merge(guest)
+    with pytest.raises(ValueError):
+        basket.set_quantity(kettle.id, 31)
+
+    operations = metrics.operations
+    assert operations == {
+        "add_product": 2,
+        "remove_quantity": 1,
+        "set_quantity": 1,
+        "merge": 1,
+    }, f"Only completed calls should be counted, but got {operations}"
+    assert metrics.rejections == {"max_items": 1}
+
+
+def test_rejection_reasons(metrics, basket):
+    """Test that rejected operations are counted by reason."""
+    heavy = Product("Heater", 200, 60)
+    light = Product("Flash Drive", 10, 1)
+
+    for invalid_call in [
+        lambda: basket.add_product("TV"),
+        lambda: basket.add_product(light, 0),
+        lambda: basket.add_product(light, 31),
+        lambda: basket.add_product(heavy, 2),
+        lambda: basket.add_products([(heavy, 1), (heavy, 1)]),
+    ]:
+        with pytest.raises((TypeError, ValueError)):
+            invalid_call()
+
+    assert metrics.rejections == {
+        "invalid_product": 1,
+        "invalid_quantity": 1,
+        "max_items": 1,
+        "max_weight": 2,
+    }
+    assert metrics.operations == {}, "Rejected operations are not completed operations"
+
+
+def test_basket_size_distribution(metrics, basket):
+    """Test that the basket size after each mutation is recorded."""
+    kettle = Product("Kettle", 10, 1)
+
+    basket.add_product(kettle, 1)
+    basket.add_product(kettle, 4)
+    basket.add_product(kettle, 20)
+
+    size = metrics.snapshot()["basket_size"]
+    assert size["count"] == 3 and size["sum"] == 1 + 5 + 25
+    assert size["buckets"][1] == 1
+    assert size["buckets"][5] == 2
+    assert size["buckets"][30] == 3
+
+
+def test_products_created(metrics):
+    """Test that product creation is counted."""
+    for i in range(3):
+        Product(f"Product {i}", 1, 1)
+
+    assert metrics.products_created == 3
+
+
+def test_prometheus_export(metrics, basket):
+    """Test that metrics are exported in the Prometheus text format."""
+    kettle = Product("Kettle", 300, 3)
+    basket.add_product(kettle, 1)
+    with pytest.raises(ValueError):
+        basket.add_product(kettle, 30)
+
+    text = metrics.to_prometheus()
+
+    assert 'basket_operations_total{operation="add_product"} 1' in text
+    assert 'basket_rejections_total{reason="max_items"} 1' in text
+    assert "products_created_total 1" in text
+    assert "# TYPE basket_operation_seconds histogram" in text
+    assert (
+        'basket_operation_seconds_bucket{operation="add_product",le="+Inf"} 1' in text
+    )
+    assert 'basket_operation_seconds_count{operation="add_product"} 1' in text
+    assert 'basket_size_units_bucket{le="1"} 1' in text
+    assert text.endswith("\n")
+
+
+# Negative tests
+def test_disabled_metrics_record_nothing(basket):
+    """Test that nothing is recorded once metrics are disabled."""
+    metrics = basket_metrics.enable()
+    basket_metrics.disable()
+
+    kettle = Product("Kettle", 300, 3)
+    basket.add_product(kettle, 1)
+    basket.get_price
+    with pytest.raises(ValueError):
+        basket.add_product(kettle, 30)
+
+    assert metrics.snapshot()["operations"] == {}
+    assert metrics.rejections == {} and metrics.products_created == 0
+    assert Basket._metrics is None and Product._metrics is None
+
+
+def test_disable_restores_plain_methods():
+    """Test that disabling removes every timing wrapper, even after two enables."""
+    plain = {
+        (cls, name): cls.__dict__[name]
+        for cls, name in [
+            (Basket, "add_product"),
+            (Basket, "get_price"),
+            (Product, "__init__"),
+        ]
+    }
+
+    basket_metrics.enable()
+    basket_metrics.enable()
+    wrapped = {key: key[0].__dict__[key[1]] for key in plain}
+    basket_metrics.disable()
+
+    for (cls, name), attribute in plain.items():
+        assert (
+            wrapped[cls, name] is not attribute
+        ), f"{name} should be wrapped while enabled"
+        assert (
+            cls.__dict__[name] is attribute
+        ), f"{name} should be the plain method again, but got {cls.__dict__[name]}"
@@ -0,0 +1,227 @@
+import pytest
+
+from basket_limits import BasketLimits
+from basket_snapshot import (
+    FORMAT_VERSION,
+    HEADER,
+    LIMITS,
+    LINE,
+    SnapshotReader,
+    write_snapshot,
+)
+from product_basket import Basket, Product
+from shipping_policy import ShippingPolicy
+
+
+@pytest.fixture
+def baskets():
+    """Fixture with a few baskets sharing products, including an empty one."""
+    kettle = Product("Kettle", 300, 3)
+    toaster = Product("Toaster", 400, 4)
+    iron = Product("Утюг ✓", 1500, 2)
+
+    first = Basket()
+    first.add_product(kettle, 2)
+    first.add_product(toaster, 1)
+    second = Basket()
+    third = Basket()
+    third.add_product(iron, 1)
+    third.add_product(kettle, 5)
+    return [first, second, third]
+
+
+def _state(basket: Basket) -> list[tuple[int, str, int, int, int]]:
+    """Returns a comparable description of a basket's lines."""
+    return [
+        (product.id, product.name, product.price, product.weight, quantity)
+        for product, quantity in basket.iter_lines()
+    ]
+
+
+# Positive tests
+def test_snapshot_round_trip(tmp_path, baskets):
+    """Test that baskets read back from a snapshot match the originals."""
+    path = tmp_path / "baskets.snap"
+    write_snapshot(path, baskets)
+
+    with SnapshotReader(path) as reader:
+        restored = list(reader)
+
+    assert len(restored) == len(baskets)
+    for original, copy in zip(baskets, restored):
+        assert _state(copy) == _state(original), "Restored lines should match"
+        assert copy.total_price == original.total_price
+        assert copy.total_weight == original.total_weight
+        assert copy.get_price == original.get_price
+
+
+def test_snapshot_shares_products(tmp_path, baskets):
+    """Test that a product used by several baskets is materialized once."""
+    path = tmp_path / "baskets.snap"
+    write_snapshot(path, baskets)
+
+    with SnapshotReader(path) as reader:
+        first_kettle = reader[0].line_items[0][0]
+        last_kettle = reader[-1].line_items[1][0]
+
+    assert first_kettle is last_kettle, "Baskets should share restored products"
+
+
+def test_snapshot_keys(tmp_path, baskets):
+    """Test that baskets can be looked up by the keys stored with them."""
+    path = tmp_path / "baskets.snap"
+    write_snapshot(path, baskets, keys=["alice", "bob", "carol"])
+
+    with SnapshotReader(path) as reader:
+        assert [reader.key(i) for i in range(len(reader))] == ["alice", "bob", "carol"]
+        assert _state(reader.get("carol")) == _state(baskets[2])
+        assert reader.get("dave") is None
+
+
+def test_snapshot_is_lazy(tmp_path, baskets):
+    """Test that opening a snapshot decodes no products until a basket is read."""
+    path = tmp_path / "baskets.snap"
+    write_snapshot(path, baskets)
+
+    with SnapshotReader(path) as reader:
+        assert reader._products == {}, "No product should be decoded on open"
+        reader[1]
+        assert reader._products == {}, "An empty basket should decode no products"
+        reader[0]
+        assert len(reader._products) == 2, "Only the products of basket 0 are decoded"
+
+
+def test_snapshot_max_product_id(tmp_path, baskets):
+    """Test that the snapshot records the largest product ID it contains."""
+    path = tmp_path / "baskets.snap"
+    write_snapshot(path, baskets)
+
+    expected = max(
+        product.id for basket in baskets for product, _ in basket.iter_lines()
+    )
+    with SnapshotReader(path) as reader:
+        assert reader.max_product_id == expected
+
+
+def test_restored_basket_is_usable(tmp_path, baskets):
+    """Test that a restored basket keeps enforcing limits and can be modified."""
+    path = tmp_path / "baskets.snap"
+    write_snapshot(path, baskets)
+
+    with SnapshotReader(path) as reader:
+        basket = reader[0]
+
+    kettle = basket.line_items[0][0]
+    basket.add_product(kettle, 1)
+    basket.delete_product(basket.line_items[1][0].id)
+    assert basket.line_items == [(kettle, 3)]
+    with pytest.raises(ValueError, match="Exceeded maximum number of items"):
+        basket.add_product(kettle, 28)
+
+
+def test_snapshot_keeps_basket_limits(tmp_path, baskets):
+    """Test that each basket is restored with the limits it was saved with."""
+    wholesale = Basket(limits=BasketLimits(max_items=1000, max_weight=5000))
+    wholesale.add_product(Product("Crate", 5, 2), 500)
+    path = tmp_path / "baskets.snap"
+    write_snapshot(path, [*baskets, wholesale])
+
+    with SnapshotReader(path) as reader:
+        restored = reader[-1]
+        retail = reader[0]
+
+    restored.add_product(restored.line_items[0][0], 10)
+    assert restored.item_count == 510, f"Expected 510 units, got {restored.item_count}"
+    assert (restored.limits.max_items, restored.limits.max_weight) == (1000, 5000)
+    assert (retail.limits.max_items, retail.limits.max_weight) == (30, 100)
+
+
+def test_snapshot_reader_configuration(tmp_path, baskets):
+    """Test that the reader applies the given shipping policy and limits."""
+    policy = ShippingPolicy((2000,), (999, 0))
+    limits = BasketLimits(max_items=2, max_weight=100)
+    path = tmp_path / "baskets.snap"
+    write_snapshot(path, baskets)
+
+    with SnapshotReader(path, shipping_policy=policy, limits=limits) as reader:
+        basket = reader[0]
+
+    assert basket.shipping_policy is policy and basket.limits is limits
+    assert basket.get_shipping_cost == 999
+
+
+def test_snapshot_version_1_is_readable(tmp_path, baskets):
+    """Test that a version 1 snapshot, without limits, restores default limits."""
+    path = tmp_path / "baskets.snap"
+    write_snapshot(path, baskets)
+    data = bytearray(path.read_bytes())
+    data[4:6] = (1).to_bytes(2, "little")
+    lines_at = len(data) - LINE.size * sum(len(b.line_items) for b in baskets)
+    del data[lines_at - LIMITS.size * len(baskets) : lines_at]
+    path.write_bytes(bytes(data))
+
+    with SnapshotReader(path) as reader:
+        restored = list(reader)
+
+    for original, copy in zip(baskets, restored):
+        assert _state(copy) == _state(original), "Restored lines should match"
+        assert copy.limits.max_items == 30
+
+
+# Negative tests
+def test_snapshot_bad_magic(tmp_path):
+    """Test that a file that is not a snapshot is rejected."""
+    path = tmp_path / "not-a-snapshot.bin"
+    path.write_bytes(b"X" * HEADER.size)
+
+    with pytest.raises(ValueError, match="Not a basket snapshot file"):
+        SnapshotReader(path)
+
+
+def test_snapshot_truncated(tmp_path):
+    """Test that a file shorter than the header is rejected."""
+    path = tmp_path / "empty.snap"
+    path.write_bytes(b"")
+
+    with pytest.raises(ValueError, match="Not a basket snapshot file"):
+        SnapshotReader(path)
+
+
+def test_snapshot_unsupported_version(tmp_path, baskets):
+    """Test that a snapshot from an unknown format version is rejected."""
+    path = tmp_path / "baskets.snap"
+    write_snapshot(path, baskets)
+    data = bytearray(path.read_bytes())
+    data[4:6] = (FORMAT_VERSION + 1).to_bytes(2, "little")
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="Unsupported snapshot version"):
+        SnapshotReader(path)
+
+
+def test_snapshot_index_out_of_range(tmp_path, baskets):
+    """Test that reading past the last basket raises IndexError."""
+    path = tmp_path / "baskets.snap"
+    write_snapshot(path, baskets)
+
+    with SnapshotReader(path) as reader:
+        with pytest.raises(IndexError):
+            reader[len(baskets)]
+
+
+@pytest.mark.parametrize("index", [3, 5, -4])
+def test_snapshot_key_out_of_range(tmp_path, baskets, index: int):
+    """Test that key() checks the position like indexing does."""
+    path = tmp_path / "baskets.snap"
+    write_snapshot(path, baskets, keys=["alice", "bob", "carol"])
+
+    with SnapshotReader(path) as reader:
+        assert reader.key(-1) == "carol", f"Expected 'carol', but got {reader.key(-1)}"
+        with pytest.raises(IndexError, match="out of range"):
+            reader.key(index)
+
+
+def test_snapshot_keys_length_mismatch(tmp_path, baskets):
+    """Test that keys must be given for every basket."""
+    with pytest.raises(ValueError, match="must have the same length"):
+        write_snapshot(tmp_path / "baskets.snap", baskets, keys=["alice"])
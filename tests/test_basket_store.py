@@ -0,0 +1,187 @@
+import asyncio
+import time
+
+import pytest
+
+from basket_store import AsyncBasketStore, Quote
+from product_basket import Product
+
+REQUEST_LATENCY = 0.002  # Simulated I/O per request in the load driver
+
+
+class FakeClock:
+    """A manually advanced clock for eviction tests."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _drive(
+    store: AsyncBasketStore, workers: int, sessions: int, requests: int
+) -> float:
+    """
+    Runs a mixed request load against the store and returns requests per second.
+
+    Each of `workers` coroutines works on session `worker % sessions`. A request
+    holds the session lock across a short simulated I/O delay, as a handler
+    that reads stock or a price between basket steps would, and then changes
+    or quotes the basket.
+    """
+    products = [Product(f"Product {i}", 100 + i, 1) for i in range(5)]
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for request in range(requests):
+        queue.put_nowait(request)
+
+    async def worker(session_id: int) -> None:
+        while not queue.empty():
+            request = queue.get_nowait()
+            product = products[request % len(products)]
+            async with store.session(session_id) as basket:
+                await asyncio.sleep(REQUEST_LATENCY)
+                if request % 3 == 0:
+                    basket.add_product(product)
+                elif request % 3 == 1:
+                    basket.get_price
+                else:
+                    basket.delete_product(product.id)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i % sessions) for i in range(workers)))
+    return requests / (time.perf_counter() - start)
+
+
+# Positive tests
+def test_store_add_delete_and_quote():
+    """Test that store operations are applied to the session's basket."""
+    store = AsyncBasketStore()
+    kettle = Product("Kettle", 300, 3)
+    toaster = Product("Toaster", 400, 4)
+
+    async def scenario() -> Quote:
+        await store.add_product("alice", kettle, 2)
+        await store.add_product("alice", toaster, 1)
+        await store.delete_product("alice", toaster.id)
+        return await store.quote("alice")
+
+    quote = asyncio.run(scenario())
+
+    assert quote == Quote(
+        total_price=600, total_weight=6, shipping_cost=100, price=700
+    ), f"Unexpected quote {quote}"
+    assert store.get("alice").line_items == [(kettle, 2)]
+
+
+def test_store_sessions_are_isolated():
+    """Test that each session gets its own basket."""
+    store = AsyncBasketStore()
+    kettle = Product("Kettle", 300, 3)
+
+    async def scenario() -> None:
+        await asyncio.gather(
+            *(store.add_product(f"session-{i}", kettle, i + 1) for i in range(10))
+        )
+
+    asyncio.run(scenario())
+
+    assert len(store) == 10, f"There should be 10 sessions, but got {len(store)}"
+    assert [store.get(f"session-{i}").item_count for i in range(10)] == list(
+        range(1, 11)
+    )
+
+
+def test_store_concurrent_updates_of_one_session():
+    """Test that concurrent read-modify-write steps on one session are serialized."""
+    store = AsyncBasketStore()
+    kettle = Product("Kettle", 10, 1)
+
+    async def add_after_check(session_id: str) -> None:
+        async with store.session(session_id) as basket:
+            count = basket.item_count
+            await asyncio.sleep(0)
+            if count < 20:
+                basket.add_product(kettle, 1)
+
+    async def scenario() -> None:
+        await asyncio.gather(*(add_after_check("alice") for _ in range(50)))
+
+    asyncio.run(scenario())
+
+    assert (
+        store.get("alice").item_count == 20
+    ), f"The locked check-then-add should stop at 20 units, but got {store.get('alice').item_count}"
+
+
+def test_store_evicts_idle_sessions():
+    """Test that only sessions idle longer than the timeout are evicted."""
+    clock = FakeClock()
+    store = AsyncBasketStore(idle_timeout=60, clock=clock)
+    kettle = Product("Kettle", 300, 3)
+
+    async def scenario() -> None:
+        await store.add_product("idle", kettle)
+        clock.now = 30
+        await store.add_product("active", kettle)
+        clock.now = 75
+        await store.quote("active")
+
+    asyncio.run(scenario())
+
+    assert store.evict_idle() == 1, "Exactly one idle session should be evicted"
+    assert "idle" not in store and "active" in store
+
+
+def test_store_throughput_scales_with_concurrency():
+    """
+    Load test: throughput grows with the number of sessions in use.
+
+    Requests hold their session lock across simulated I/O, so one session
+    serves one request at a time, while per-session locks let different
+    sessions overlap. A single store-wide lock would fail both assertions.
+    """
+    serial = asyncio.run(
+        _drive(AsyncBasketStore(), workers=1, sessions=1, requests=100)
+    )
+    separate = asyncio.run(
+        _drive(AsyncBasketStore(), workers=16, sessions=16, requests=400)
+    )
+    shared = asyncio.run(
+        _drive(AsyncBasketStore(), workers=16, sessions=4, requests=400)
+    )
+
+    assert separate > 8 * serial, (
+        f"16 workers on 16 sessions should be well above 1 worker, "
+        f"but got {separate:.0f} vs {serial:.0f} requests/sec"
+    )
+    assert 2.5 * serial < shared < 6 * serial, (
+        f"16 workers sharing 4 sessions should overlap only across sessions, "
+        f"about 4x one worker, but got {shared:.0f} vs {serial:.0f} requests/sec"
+    )
+
+
+# Negative tests
+def test_store_propagates_basket_errors():
+    """Test that basket validation errors reach the caller and leave the basket unchanged."""
+    store = AsyncBasketStore()
+    heater = Product("Heater", 200, 60)
+
+    async def scenario() -> None:
+        await store.add_product("alice", heater, 1)
+        await store.add_product("alice", heater, 1)
+
+    with pytest.raises(
+        ValueError, match="Exceeded maximum weight of products in the basket"
+    ):
+        asyncio.run(scenario())
+
+    assert store.get("alice").item_count == 1
+
+
+def test_store_without_timeout_never_evicts():
+    """Test that eviction is a no-op when no idle timeout is configured."""
+    store = AsyncBasketStore()
+    asyncio.run(store.quote("alice"))
+
+    assert store.evict_idle() == 0 and "alice" in store
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from benchmarks.runner import find_regressions, main
+from benchmarks.scenarios import SCENARIOS
+
+
+# Positive tests
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+def test_scenario_runs(name: str):
+    """Smoke test: every scenario runs at its smallest size and reports its ops."""
+    setup, sizes = SCENARIOS[name]
+    run, ops = setup(min(sizes))
+
+    run()
+
+    assert ops > 0, f"Scenario {name} should report a positive operation count"
+
+
+def test_find_regressions_within_tolerance():
+    """Test that slowdowns within the tolerance and unknown keys are accepted."""
+    results = {"a[1]": 80.0, "b[1]": 200.0, "new[1]": 1.0}
+    baseline = {"a[1]": 100.0, "b[1]": 100.0}
+
+    assert find_regressions(results, baseline, tolerance=0.25) == []
+
+
+def test_main_writes_json_baseline(tmp_path):
+    """Test that --update writes a machine-readable baseline."""
+    baseline = tmp_path / "baseline.json"
+
+    status = main(
+        [
+            "--baseline",
+            str(baseline),
+            "--update",
+            "-k",
+            "product_creation",
+            "--repeats",
+            "1",
+        ]
+    )
+
+    assert status == 0
+    results = json.loads(baseline.read_text())["results"]
+    assert list(results) == ["product_creation[10000]"]
+    assert results["product_creation[10000]"] > 0
+
+
+# Negative tests
+def test_find_regressions_beyond_tolerance():
+    """Test that a slowdown beyond the tolerance is reported."""
+    regressions = find_regressions({"a[1]": 70.0}, {"a[1]": 100.0}, tolerance=0.25)
+
+    assert len(regressions) == 1 and regressions[0].startswith("a[1]:")
+
+
+def test_main_fails_on_regression(tmp_path):
+    """Test that the runner exits with status 1 when a scenario regresses."""
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {"product_creation[10000]": 1e15}}))
+
+    status = main(
+        ["--baseline", str(baseline), "-k", "product_creation", "--repeats", "1"]
+    )
+
+    assert status == 1, "A run far below the baseline should fail"
@@ -0,0 +1,152 @@
+import random
+
+import pytest
+
+from basket_limits import BasketLimits
+from catalog_index import CatalogIndex
+from product_basket import Basket, Product
+from shipping_policy import ShippingPolicy
+
+
+@pytest.fixture
+def catalog():
+    """Fixture with products spread over prices and weights."""
+    return [
+        Product("Socks", 50, 1),
+        Product("Mug", 120, 3),
+        Product("Lamp", 300, 8),
+        Product("Book", 310, 2),
+        Product("Kettle", 300, 3),
+        Product("Sofa", 900, 60),
+        Product("Chair", 950, 12),
+    ]
+
+
+def _linear_cheapest(products, min_price, max_weight, count):
+    """Reference implementation: sort every qualifying product."""
+    fitting = [p for p in products if p.price >= min_price and p.weight <= max_weight]
+    fitting.sort(key=lambda p: (p.price, p.weight, p.id))
+    return fitting[:count]
+
+
+# Positive tests
+def test_cheapest_respects_price_and_weight(catalog):
+    """Test that cheapest skips products that are too cheap or too heavy."""
+    names = [p.name for p in CatalogIndex(catalog).cheapest(200, 5, count=3)]
+
+    assert names == ["Kettle", "Book"], f"Should be Kettle, Book, but got {names}"
+
+
+def test_cheapest_matches_linear_scan():
+    """Test that the index agrees with a linear scan on random queries."""
+    rng = random.Random(3)
+    products = [
+        Product(f"Product {i}", rng.randint(1, 1000), rng.randint(1, 50))
+        for i in range(500)
+    ]
+    index = CatalogIndex(products)
+    for _ in range(500):
+        min_price = rng.randint(0, 1100)
+        max_weight = rng.randint(0, 55)
+        count = rng.randint(1, 5)
+        expected = _linear_cheapest(products, min_price, max_weight, count)
+        found = index.cheapest(min_price, max_weight, count)
+        assert (
+            found == expected
+        ), f"Query ({min_price}, {max_weight}, {count}) should give {expected}"
+
+
+def test_price_range(catalog):
+    """Test that price_range returns the products within inclusive bounds."""
+    names = [p.name for p in CatalogIndex(catalog).price_range(120, 310)]
+
+    expected = ["Mug", "Kettle", "Lamp", "Book"]
+    assert names == expected, f"Should be {expected}, but got {names}"
+
+
+def test_free_shipping_gap(catalog):
+    """Test that the suggestions push the basket over the next tier."""
+    basket = Basket()
+    basket.add_product(Product("Shoes", 400, 2), 1)
+
+    suggestions = CatalogIndex(catalog).free_shipping_gap(basket, count=2)
+
+    names = [p.name for p in suggestions]
+    assert names == ["Mug", "Kettle"], f"Should be Mug, Kettle, but got {names}"
+    for product in suggestions:
+        cost = basket.preview_add(product).get_shipping_cost
+        assert cost == 100, f"Shipping should drop to 100, but got {cost}"
+
+
+def test_free_shipping_gap_uses_basket_policy(catalog):
+    """Test that the next tier comes from the basket's own shipping policy."""
+    basket = Basket(shipping_policy=ShippingPolicy((200,), (50, 0)))
+    basket.add_product(Product("Shoes", 100, 2), 1)
+
+    (suggestion,) = CatalogIndex(catalog).free_shipping_gap(basket)
+
+    assert suggestion.name == "Mug", f"Should suggest Mug, but got {suggestion}"
+
+
+# Boundary tests
+def test_free_shipping_gap_respects_remaining_weight(catalog):
+    """Test that products over the remaining weight capacity are skipped."""
+    basket = Basket(limits=BasketLimits(max_items=30, max_weight=10))
+    basket.add_product(Product("Shoes", 400, 8), 1)
+
+    (suggestion,) = CatalogIndex(catalog).free_shipping_gap(basket)
+
+    assert suggestion.name == "Book", f"Should suggest Book, but got {suggestion}"
+
+
+def test_free_shipping_gap_full_basket(catalog):
+    """Test that a basket at its item limit gets no suggestions."""
+    basket = Basket(limits=BasketLimits(max_items=1, max_weight=100))
+    basket.add_product(Product("Shoes", 400, 2), 1)
+
+    suggestions = CatalogIndex(catalog).free_shipping_gap(basket)
+
+    assert suggestions == [], f"Should suggest nothing, but got {suggestions}"
+
+
+def test_free_shipping_gap_last_tier(catalog):
+    """Test that a basket already shipping for free gets no suggestions."""
+    basket = Basket()
+    basket.add_product(Product("Bike", 1000, 20), 1)
+
+    suggestions = CatalogIndex(catalog).free_shipping_gap(basket)
+
+    assert suggestions == [], f"Should suggest nothing, but got {suggestions}"
+
+
+def test_no_product_fits(catalog):
+    """Test that queries nothing satisfies return an empty list."""
+    index = CatalogIndex(catalog)
+
+    assert index.cheapest(2000, 100) == []
+    assert index.cheapest(0, 0) == []
+    assert CatalogIndex([]).cheapest(0, 100) == []
+
+
+# Negative tests
+@pytest.mark.parametrize("value", [None, "product", 42])
+def test_index_invalid_product(value):
+    """Test that indexing a non-Product raises TypeError."""
+    with pytest.raises(TypeError, match="Expected a Product object"):
+        CatalogIndex([value])
+
+
+@pytest.mark.parametrize("count", [0, -1, 1.5, "2"])
+def test_invalid_count(catalog, basket, count):
+    """Test that counts that are not positive integers raise TypeError."""
+    index = CatalogIndex(catalog)
+    with pytest.raises(TypeError, match="Expected a positive integer"):
+        index.cheapest(0, 10, count)
+    with pytest.raises(TypeError, match="Expected a positive integer"):
+        index.free_shipping_gap(basket, count)
+
+
+def test_free_shipping_gap_invalid_basket(catalog):
+    """Test that a non-Basket raises TypeError."""
+    with pytest.raises(TypeError, match="Expected a Basket object, got list"):
+        CatalogIndex(catalog).free_shipping_gap([])
@@ -0,0 +1,194 @@
+import random
+
+import pytest
+
+from basket_limits import BasketLimits
+from order_split import split_order
+from product_basket import Basket, Product
+from shipping_policy import ShippingPolicy
+
+
+def _units(baskets: list[Basket]) -> dict[int, int]:
+    """Returns the total quantity of each product over all baskets."""
+    units: dict[int, int] = {}
+    for basket in baskets:
+        for product, quantity in basket.iter_lines():
+            units[product.id] = units.get(product.id, 0) + quantity
+    return units
+
+
+def _assert_valid_split(baskets: list[Basket], lines, limits: BasketLimits) -> None:
+    """Asserts that the baskets hold exactly the order, each within the limits."""
+    expected: dict[int, int] = {}
+    for product, quantity in lines:
+        expected[product.id] = expected.get(product.id, 0) + quantity
+    assert _units(baskets) == expected, "The baskets should hold exactly the order"
+    for basket in baskets:
+        assert (
+            0 < basket.item_count <= limits.max_items
+        ), f"Item count should be within the limit, but got {basket.item_count}"
+        assert (
+            basket.total_weight <= limits.max_weight
+        ), f"Weight should be within the limit, but got {basket.total_weight}"
+
+
+# Positive tests
+def test_split_by_item_limit():
+    """Test that an order over MAX_ITEMS is split into full baskets."""
+    product = Product("Pen", 10, 1)
+
+    baskets = split_order([(product, 75)])
+
+    counts = [basket.item_count for basket in baskets]
+    assert counts == [30, 30, 15], f"Counts should be [30, 30, 15], but got {counts}"
+
+
+def test_split_by_weight_limit():
+    """Test that an order over MAX_WEIGHT is split by weight."""
+    product = Product("Dumbbell", 200, 30)
+
+    baskets = split_order([(product, 10)])
+
+    counts = [basket.item_count for basket in baskets]
+    assert counts == [3, 3, 3, 1], f"Counts should be [3, 3, 3, 1], but got {counts}"
+
+
+def test_split_fills_gaps_first_fit():
+    """Test that lighter lines fill the space heavier lines leave."""
+    lines = [
+        (Product("Chair", 100, 60), 1),
+        (Product("Lamp", 100, 40), 1),
+        (Product("Desk", 100, 50), 2),
+    ]
+
+    baskets = split_order(lines)
+
+    weights = sorted(basket.total_weight for basket in baskets)
+    assert weights == [100, 100], f"Weights should be [100, 100], but got {weights}"
+
+
+def test_split_random_orders():
+    """Test random orders against the limits and the brute-force basket count."""
+    rng = random.Random(7)
+    limits = BasketLimits(max_items=30, max_weight=100)
+    for _ in range(30):
+        lines = [
+            (Product(f"Product {i}", rng.randint(1, 800), rng.randint(1, 40)), q)
+            for i, q in enumerate(rng.choices(range(1, 6), k=rng.randint(1, 60)))
+        ]
+        brute_force = [Basket()]
+        for product, quantity in lines:
+            for _ in range(quantity):
+                if not brute_force[-1].can_add(product):
+                    brute_force.append(Basket())
+                brute_force[-1].add_product(product)
+
+        for optimize_shipping in (False, True):
+            baskets = split_order(lines, limits, optimize_shipping=optimize_shipping)
+            _assert_valid_split(baskets, lines, limits)
+            assert len(baskets) <= len(
+                brute_force
+            ), f"Should use at most {len(brute_force)} baskets, got {len(baskets)}"
+
+
+def test_optimize_shipping_lowers_total_shipping():
+    """Test that optimizing moves units to lift a basket to a cheaper tier."""
+    limits = BasketLimits(max_items=4, max_weight=100)
+    lines = [(Product("Kettle", 300, 20), 3), (Product("Mug", 100, 15), 3)]
+
+    plain = split_order(lines, limits)
+    optimized = split_order(lines, limits, optimize_shipping=True)
+
+    _assert_valid_split(optimized, lines, limits)
+    assert len(optimized) == len(plain) == 2, "Both splits should use 2 baskets"
+    plain_cost = sum(basket.get_shipping_cost for basket in plain)
+    optimized_cost = sum(basket.get_shipping_cost for basket in optimized)
+    assert plain_cost == 250, f"Plain shipping should be 250, but got {plain_cost}"
+    assert (
+        optimized_cost == 200
+    ), f"Optimized shipping should be 200, but got {optimized_cost}"
+
+
+def test_split_uses_limits_and_policy():
+    """Test that the baskets are created with the given limits and policy."""
+    limits = BasketLimits(max_items=5, max_weight=1000)
+    policy = ShippingPolicy((100,), (10, 0))
+
+    baskets = split_order([(Product("Pen", 10, 1), 12)], limits, policy)
+
+    assert [basket.item_count for basket in baskets] == [5, 5, 2]
+    for basket in baskets:
+        assert basket.limits is limits, "Baskets should use the given limits"
+        assert basket.shipping_policy is policy, "Baskets should use the policy"
+
+
+def test_repeated_products_are_combined():
+    """Test that a product listed twice is one line per basket."""
+    product = Product("Pen", 10, 1)
+
+    (basket,) = split_order([(product, 2), (product, 3)])
+
+    assert basket.line_items == [
+        (product, 5)
+    ], f"The basket should hold one line of 5, but got {basket.line_items}"
+
+
+# Boundary tests
+def test_split_empty_order():
+    """Test that an empty order gives no baskets."""
+    assert split_order([]) == [], "An empty order should give no baskets"
+
+
+def test_split_product_at_weight_limit():
+    """Test that products weighing exactly MAX_WEIGHT go one per basket."""
+    product = Product("Anvil", 500, Basket.MAX_WEIGHT)
+
+    baskets = split_order([(product, 3)])
+
+    assert len(baskets) == 3, f"Should use 3 baskets, but got {len(baskets)}"
+
+
+def test_split_order_of_thousands_of_lines():
+    """Test a 5,000-line order against the limits."""
+    rng = random.Random(1)
+    limits = BasketLimits(max_items=30, max_weight=100)
+    lines = [
+        (Product(f"Product {i}", rng.randint(1, 800), rng.randint(1, 20)), 3)
+        for i in range(5000)
+    ]
+
+    baskets = split_order(lines, limits)
+
+    _assert_valid_split(baskets, lines, limits)
+
+
+# Negative tests
+def test_split_product_over_weight_limit():
+    """Test that a product heavier than MAX_WEIGHT raises ValueError."""
+    with pytest.raises(
+        ValueError,
+        match=r"Exceeded maximum weight of products in the basket \(100 units\).",
+    ):
+        split_order([(Product("Piano", 5000, 101), 1)])
+
+
+@pytest.mark.parametrize(
+    "lines, message",
+    [
+        ([("Pen", 1)], "Expected a Product object, got str"),
+        ([(Product("Pen", 10, 1), 0)], "Expected a positive integer, got int"),
+        ([(Product("Pen", 10, 1), 1.5)], "Expected a positive integer, got float"),
+    ],
+)
+def test_split_invalid_lines(lines, message):
+    """Test that invalid order lines raise TypeError."""
+    with pytest.raises(TypeError, match=message):
+        split_order(lines)
+
+
+def test_split_invalid_settings():
+    """Test that invalid limits and shipping policies raise TypeError."""
+    with pytest.raises(TypeError, match="Expected a BasketLimits object, got dict"):
+        split_order([], limits={})
+    with pytest.raises(TypeError, match="Expected a ShippingPolicy object, got int"):
+        split_order([], shipping_policy=1)
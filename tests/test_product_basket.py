@@ -2,7 +2,8 @@ from typing import Any, Hashable, Union
 
 import pytest
 
-from product_basket import Product
+from product_basket import Basket, PricePreview, Product
+from shipping_policy import ShippingPolicy
 
 
 # Positive tests
@@ -255,6 +256,87 @@ def test_mixed_operations(basket):
     ), f"The final price should be {expected_price} units, but got {basket.total_price}"
 
 
+def test_running_totals_match_products(basket):
+    """
+    Test that the running totals stay equal to sums over the product list.
+
+    The aggregates are updated by every add and delete, so after a mixed
+    sequence of operations they must match a full recomputation.
+    """
+    tv = Product("TV", 800, 20)
+    kettle = Product("Kettle", 300, 3)
+    flash_drive = Product("Flash Drive", 100, 1)
+
+    basket.add_product(tv, 1)
+    basket.add_product(kettle, 2)
+    basket.add_product(flash_drive, 5)
+    basket.delete_product(kettle.id)
+    basket.add_product(kettle, 1)
+    basket.delete_product(999)
+
+    products = basket.list_products
+    assert basket.total_price == sum(
+        p.price for p in products
+    ), f"The total price should match the product list, but got {basket.total_price}"
+    assert basket.total_weight == sum(
+        p.weight for p in products
+    ), f"The total weight should match the product list, but got {basket.total_weight}"
+    assert basket.item_count == len(
+        products
+    ), f"The item count should be {len(products)}, but got {basket.item_count}"
+
+
+def test_line_items(basket):
+    """
+    Test that line items hold one (product, quantity) pair per distinct product.
+
+    Re-adding a product increases the quantity of its existing line, and
+    `iter_lines()` yields the same pairs as `line_items`.
+    """
+    kettle = Product("Kettle", 300, 3)
+    toaster = Product("Toaster", 400, 4)
+
+    basket.add_product(kettle, 2)
+    basket.add_product(toaster, 1)
+    basket.add_product(kettle, 3)
+
+    assert basket.line_items == [
+        (kettle, 5),
+        (toaster, 1),
+    ], f"Expected one line per distinct product, but got {basket.line_items}"
+    assert (
+        list(basket.iter_lines()) == basket.line_items
+    ), "iter_lines() should yield the same pairs as line_items"
+    assert (
+        len(basket._products) == 2
+    ), f"The basket should store 2 lines, but stores {len(basket._products)}"
+
+    basket.delete_product(kettle.id)
+    assert basket.line_items == [
+        (toaster, 1)
+    ], f"After deleting the kettle only the toaster line should remain, but got {basket.line_items}"
+
+
+def test_add_products_bulk(basket):
+    """Test adding several products at once with add_products."""
+    tv = Product("TV", 800, 20)
+    kettle = Product("Kettle", 300, 3)
+
+    basket.add_product(kettle, 1)
+    basket.add_products([(tv, 1), (kettle, 2)])
+
+    assert basket.line_items == [
+        (kettle, 3),
+        (tv, 1),
+    ], f"Expected the kettle line to grow and a TV line to be added, but got {basket.line_items}"
+    assert (
+        basket.total_price == 800 + 3 * 300
+    ), f"The total price should be 1700 units, but got {basket.total_price}"
+    assert (
+        basket.total_weight == 20 + 3 * 3
+    ), f"The total weight should be 29 units, but got {basket.total_weight}"
+
+
 def test_list_products_returns_copy(basket):
     """Test that `list_products` returns a copy of the product list, not the internal list itself.
 
@@ -293,6 +375,108 @@ def test_list_products_multiple_calls_return_new_instance(basket):
     ), f"The second call to list_products should return 2 products, but got {len(products_second_call)}"
 
 
+def test_products_view(basket):
+    """
+    Test the read-only products view.
+
+    Verifies that:
+    - Iterating the view yields the same products as `list_products`.
+    - `len()` and `in` work without building a list.
+    - The view is live: it reflects later mutations of the basket.
+    """
+    kettle = Product("Kettle", 300, 3)
+    toaster = Product("Toaster", 400, 4)
+    basket.add_product(kettle, 2)
+
+    view = basket.products_view
+    basket.add_product(toaster, 1)
+
+    assert (
+        list(view) == basket.list_products
+    ), "Iterating the view should yield the same products as list_products"
+    assert len(view) == 3, f"The view should contain 3 products, but got {len(view)}"
+    assert kettle in view, "The kettle should be in the view"
+    assert (
+        Product("Kettle", 300, 3) not in view
+    ), "A different product should not be in the view"
+    assert "Kettle" not in view, "A non-product should not be in the view"
+
+    basket.delete_product(kettle.id)
+    assert (
+        len(view) == 1 and kettle not in view
+    ), "The view should reflect the deletion of the kettle"
+
+
+@pytest.mark.parametrize("mutation", ["add", "delete"])
+def test_products_view_stale_iteration(basket, mutation: str):
+    """Test that mutating the basket while iterating its view raises RuntimeError."""
+    kettle = Product("Kettle", 300, 3)
+    toaster = Product("Toaster", 400, 4)
+    basket.add_product(kettle, 2)
+    basket.add_product(toaster, 1)
+
+    iterator = iter(basket.products_view)
+    next(iterator)
+    if mutation == "add":
+        basket.add_product(kettle, 1)
+    else:
+        basket.delete_product(toaster.id)
+
+    with pytest.raises(RuntimeError, match="Basket changed during iteration"):
+        next(iterator)
+
+
+def test_list_products_returns_fresh_list(basket):
+    """Test that list_products builds a new list that the basket does not keep."""
+    kettle = Product("Kettle", 300, 3)
+    basket.add_product(kettle, 2)
+
+    first = basket.list_products
+    first.clear()
+    second = basket.list_products
+
+    assert second == [
+        kettle,
+        kettle,
+    ], f"Clearing a returned list should not change the basket, but got {second}"
+    assert basket.get_price == basket.get_price == 700
+
+
+@pytest.mark.parametrize(
+    "mutation",
+    ["add_product", "add_products", "delete_product", "policy_change"],
+)
+def test_cached_values_not_returned_after_mutation(mutation: str):
+    """Test that no cached value survives a mutation of the basket or its policy."""
+    policy = ShippingPolicy((500, 1000), (250, 100, 0))
+    basket = Basket(shipping_policy=policy)
+    kettle = Product("Kettle", 300, 3)
+    toaster = Product("Toaster", 400, 4)
+    basket.add_product(kettle, 1)
+    basket.add_product(toaster, 1)
+    assert (basket.list_products, basket.get_shipping_cost, basket.get_price) == (
+        [kettle, toaster],
+        100,
+        800,
+    )
+
+    if mutation == "add_product":
+        basket.add_product(kettle, 1)
+        expected = ([kettle, kettle, toaster], 0, 1000)
+    elif mutation == "add_products":
+        basket.add_products([(toaster, 1)])
+        expected = ([kettle, toaster, toaster], 0, 1100)
+    elif mutation == "delete_product":
+        basket.delete_product(toaster.id)
+        expected = ([kettle], 250, 550)
+    else:
+        policy.set_tiers((1000,), (50, 0))
+        expected = ([kettle, toaster], 50, 750)
+
+    actual = (basket.list_products, basket.get_shipping_cost, basket.get_price)
+    assert actual == expected, f"Expected {expected} after {mutation}, but got {actual}"
+
+
 def test_unique_product_ids():
     """Test that each product has a unique identifier."""
     product1 = Product("iPhone 14", 100, 1)
@@ -332,6 +516,268 @@ def test_sequential_operations_unique_ids(basket):
     ), f"New product {product_c} should not have the same ID as the deleted product ({id_a}), but got {product_c.id}"
 
 
+def test_remove_quantity(basket):
+    """Test removing some units of a line, then the rest of it."""
+    kettle = Product("Kettle", 300, 3)
+    basket.add_product(kettle, 5)
+    basket.get_price
+
+    basket.remove_quantity(kettle.id, 2)
+
+    assert basket.line_items == [
+        (kettle, 3)
+    ], f"Expected 3 kettles to remain, but got {basket.line_items}"
+    assert (
+        basket.total_price == 900
+    ), f"The total price should be 900 units, but got {basket.total_price}"
+    assert (
+        basket.total_weight == 9
+    ), f"The total weight should be 9 units, but got {basket.total_weight}"
+    assert (
+        basket.get_price == 1000
+    ), f"The final price should be 1000 units, but got {basket.get_price}"
+
+    basket.remove_quantity(kettle.id, 10)
+
+    assert basket.line_items == [], "Removing every unit should drop the line"
+    assert (
+        basket.item_count == 0 and basket.get_price == 0
+    ), f"The basket should be empty, but holds {basket.item_count} units"
+
+
+@pytest.mark.parametrize(
+    "quantity, expected_count, expected_price",
+    [(1, 1, 650), (4, 4, 1600), (2, 2, 900)],
+)
+def test_set_quantity(basket, quantity: int, expected_count: int, expected_price: int):
+    """Test setting the quantity of a line up, down or to the same value."""
+    toaster = Product("Toaster", 400, 4)
+    basket.add_product(toaster, 2)
+
+    basket.set_quantity(toaster.id, quantity)
+
+    assert (
+        basket.item_count == expected_count
+    ), f"The basket should hold {expected_count} units, but got {basket.item_count}"
+    assert (
+        basket.get_price == expected_price
+    ), f"The final price should be {expected_price} units, but got {basket.get_price}"
+    assert len(basket.list_products) == expected_count
+
+
+def test_set_quantity_zero_drops_line(basket):
+    """Test that setting a quantity to 0 removes the line."""
+    toaster = Product("Toaster", 400, 4)
+    kettle = Product("Kettle", 300, 3)
+    basket.add_products([(toaster, 2), (kettle, 1)])
+
+    basket.set_quantity(toaster.id, 0)
+
+    assert basket.line_items == [
+        (kettle, 1)
+    ], f"Only the kettle should remain, but got {basket.line_items}"
+    assert toaster not in basket.products_view
+
+
+def test_quantity_changes_invalidate_views(basket):
+    """Test that partial removals invalidate cached values and live views."""
+    kettle = Product("Kettle", 300, 3)
+    basket.add_product(kettle, 3)
+    products_before = basket.list_products
+    iterator = iter(basket.products_view)
+    next(iterator)
+
+    basket.remove_quantity(kettle.id)
+
+    assert len(basket.list_products) == 2 and len(products_before) == 3
+    with pytest.raises(RuntimeError, match="Basket changed during iteration"):
+        next(iterator)
+
+
+@pytest.mark.parametrize(
+    "strategy, expected",
+    [
+        ("sum", {"kettle": 3, "toaster": 2, "iron": 1}),
+        ("max", {"kettle": 2, "toaster": 2, "iron": 1}),
+        ("replace", {"kettle": 1, "toaster": 2, "iron": 1}),
+    ],
+)
+def test_merge_strategies(basket, strategy: str, expected: dict[str, int]):
+    """Test merging a guest basket into an account basket with each strategy."""
+    kettle = Product("kettle", 300, 3)
+    toaster = Product("toaster", 400, 4)
+    iron = Product("iron", 150, 2)
+    basket.add_products([(kettle, 2), (toaster, 2)])
+    guest = Basket()
+    guest.add_products([(kettle, 1), (iron, 1)])
+
+    basket.merge(guest, strategy=strategy)
+
+    quantities = {product.name: quantity for product, quantity in basket.line_items}
+    assert (
+        quantities == expected
+    ), f"Expected quantities {expected} after '{strategy}', but got {quantities}"
+    assert basket.item_count == sum(expected.values())
+    assert basket.total_price == sum(
+        product.price * quantity for product, quantity in basket.line_items
+    ), "The running totals should match the merged lines"
+    assert guest.line_items == [
+        (kettle, 1),
+        (iron, 1),
+    ], "The guest basket is not modified"
+
+
+def test_diff(basket):
+    """Test that diff returns per-product quantity deltas between two baskets."""
+    kettle = Product("Kettle", 300, 3)
+    toaster = Product("Toaster", 400, 4)
+    iron = Product("Iron", 150, 2)
+    basket.add_products([(kettle, 2), (toaster, 1)])
+    other = Basket()
+    other.add_products([(kettle, 5), (iron, 1)])
+
+    deltas = basket.diff(other)
+
+    assert deltas == {
+        kettle.id: 3,
+        toaster.id: -1,
+        iron.id: 1,
+    }, f"Unexpected deltas {deltas}"
+    assert basket.diff(basket) == {}, "A basket has no diff with itself"
+    assert other.diff(basket) == {
+        product_id: -change for product_id, change in deltas.items()
+    }, "The reverse diff should negate every delta"
+
+
+def test_diff_then_merge_syncs_baskets(basket):
+    """Test that applying a diff, or merging with 'replace', syncs two baskets."""
+    kettle = Product("Kettle", 300, 3)
+    toaster = Product("Toaster", 400, 4)
+    basket.add_product(kettle, 2)
+    other = Basket()
+    other.add_products([(kettle, 1), (toaster, 3)])
+
+    products = {product.id: product for product, _ in other.line_items}
+    for product_id, change in basket.diff(other).items():
+        if change > 0:
+            basket.add_product(products[product_id], change)
+        else:
+            basket.remove_quantity(product_id, -change)
+
+    assert basket.diff(other) == {}, "The baskets should be in sync"
+    assert basket.get_price == other.get_price
+
+
+@pytest.mark.parametrize(
+    "weight, expected",
+    [(1, 25), (3, 25), (4, 23), (10, 9), (95, 1), (96, 0)],
+)
+def test_max_addable(basket, weight: int, expected: int):
+    """Test how many more units fit, bounded by the item or the weight limit."""
+    basket.add_product(Product("Kettle", 300, 1), 5)
+    product = Product("Item", 10, weight)
+
+    assert (
+        basket.max_addable(product) == expected
+    ), f"Expected {expected} more units to fit, but got {basket.max_addable(product)}"
+    assert expected == 0 or basket.can_add(product, expected)
+    assert basket.can_add(product, expected + 1) is False
+
+
+def test_capacity_queries_have_no_side_effects(basket):
+    """Test that capacity queries never change the basket."""
+    kettle = Product("Kettle", 300, 3)
+    basket.add_product(kettle, 2)
+    version = basket._version
+
+    basket.max_addable(kettle)
+    basket.can_add(kettle, 50)
+    basket.max_addable_many([kettle])
+
+    assert basket._version == version, "Capacity queries must not mutate the basket"
+    assert basket.line_items == [(kettle, 2)]
+
+
+def test_max_addable_many(basket):
+    """Test that a listing page is evaluated like individual max_addable calls."""
+    basket.add_product(Product("Heater", 100, 40), 1)
+    listing = [Product(f"Item {w}", 10, w) for w in (1, 2, 7, 30, 61)]
+
+    assert basket.max_addable_many(listing) == [
+        basket.max_addable(product) for product in listing
+    ]
+    assert basket.max_addable_many(listing) == [29, 29, 8, 2, 0]
+    assert basket.max_addable_many([]) == []
+
+
+def test_snapshot_shares_lines_until_mutation(basket):
+    """Test that a snapshot shares line storage until one side is changed."""
+    kettle = Product("Kettle", 300, 3)
+    toaster = Product("Toaster", 500, 4)
+    basket.add_products([(kettle, 2), (toaster, 1)])
+
+    clone = basket.snapshot()
+    assert clone._products is basket._products, "Lines should be shared"
+    assert clone.get_price == basket.get_price == 1100
+
+    clone.add_product(kettle, 1)
+    clone.remove_quantity(toaster.id)
+
+    assert clone._products is not basket._products, "A change should copy the lines"
+    assert basket.line_items == [(kettle, 2), (toaster, 1)], "The original is unchanged"
+    assert clone.line_items == [(kettle, 3)]
+    assert (basket.get_price, clone.get_price) == (1100, 1000)
+
+
+def test_snapshot_isolates_original_mutations(basket):
+    """Test that changing the original leaves earlier snapshots untouched."""
+    kettle = Product("Kettle", 300, 3)
+    basket.add_product(kettle, 2)
+    first = basket.snapshot()
+    basket.set_quantity(kettle.id, 5)
+    second = basket.snapshot()
+    basket.delete_product(kettle.id)
+
+    assert first.line_items == [(kettle, 2)] and first.total_weight == 6
+    assert second.line_items == [(kettle, 5)] and second.total_weight == 15
+    assert basket.line_items == [] and basket.get_price == 0
+
+
+def test_snapshot_keeps_configuration(basket):
+    """Test that a snapshot keeps the shipping policy and limits."""
+    policy = ShippingPolicy((100,), (50, 0))
+    original = Basket(shipping_policy=policy)
+    original.add_product(Product("Pen", 10, 1), 3)
+
+    clone = original.snapshot()
+
+    assert clone.shipping_policy is policy and clone.limits is original.limits
+    assert clone.get_shipping_cost == 50
+
+
+@pytest.mark.parametrize(
+    "quantity, expected",
+    [
+        (1, PricePreview(600, 6, 100, 700, None)),
+        (2, PricePreview(900, 9, 100, 1000, None)),
+        (3, PricePreview(1200, 12, 0, 1200, None)),
+    ],
+)
+def test_preview_add(basket, quantity: int, expected: PricePreview):
+    """Test that preview_add returns the totals add_product would produce."""
+    kettle = Product("Kettle", 300, 3)
+    basket.add_product(kettle, 1)
+    version = basket._version
+
+    preview = basket.preview_add(kettle, quantity)
+
+    assert preview == expected, f"Expected {expected}, but got {preview}"
+    assert basket._version == version, "A preview must not change the basket"
+    basket.add_product(kettle, quantity)
+    assert (basket.total_price, basket.total_weight) == preview[:2]
+    assert (basket.get_shipping_cost, basket.get_price) == preview[2:4]
+
+
 # Boundary tests
 def test_product_immutability():
     """Test that Product properties are read-only."""
@@ -387,6 +833,51 @@ def test_reaching_max_weight_limit(basket):
         basket.add_product(product, 1)
 
 
+@pytest.mark.parametrize(
+    "items, message",
+    [
+        (
+            [(Product("Keyboard", 50, 1), 20), (Product("Mouse", 20, 1), 11)],
+            "Exceeded maximum number of items in the basket",
+        ),
+        (
+            [(Product("Heater", 200, 10), 5), (Product("Fan", 100, 51), 1)],
+            "Exceeded maximum weight of products in the basket",
+        ),
+    ],
+)
+def test_add_products_limits_are_atomic(basket, items: list, message: str):
+    """Test that add_products adds nothing when the whole batch exceeds a limit.
+
+    Each item fits on its own, but together they exceed the limit, so the
+    basket must stay unchanged.
+    """
+    existing = Product("Flash Drive", 100, 1)
+    basket.add_product(existing, 1)
+
+    with pytest.raises(ValueError, match=message):
+        basket.add_products(items)
+
+    assert basket.line_items == [
+        (existing, 1)
+    ], f"The basket should be unchanged after a rejected batch, but got {basket.line_items}"
+    assert (
+        basket.total_price == 100
+    ), f"The total price should stay 100 units, but got {basket.total_price}"
+
+
+def test_add_products_up_to_limit(basket):
+    """Test that add_products accepts a batch that exactly reaches both limits."""
+    basket.add_products([(Product("Heater", 200, 10), 5), (Product("Fan", 100, 2), 25)])
+
+    assert (
+        len(basket.list_products) == basket.MAX_ITEMS
+    ), f"There should be 30 products in the basket, but got {len(basket.list_products)}"
+    assert (
+        basket.total_weight == basket.MAX_WEIGHT
+    ), f"The total weight should be 100 units, but got {basket.total_weight}"
+
+
 def test_extreme_values(basket):
     """Test handling of extreme values for price and weight.
 
@@ -419,6 +910,86 @@ def test_extreme_values(basket):
 
 from typing import Any
 
+
+def test_set_quantity_up_to_limits(basket):
+    """Test that set_quantity may fill the basket exactly to its limits, and no more."""
+    flash_drive = Product("Flash Drive", 10, 1)
+    basket.add_product(flash_drive, 1)
+
+    basket.set_quantity(flash_drive.id, basket.MAX_ITEMS)
+    assert (
+        basket.item_count == basket.MAX_ITEMS
+    ), f"The basket should hold 30 units, but got {basket.item_count}"
+
+    with pytest.raises(
+        ValueError, match="Exceeded maximum number of items in the basket"
+    ):
+        basket.set_quantity(flash_drive.id, basket.MAX_ITEMS + 1)
+
+    heater = Product("Heater", 100, 40)
+    basket.delete_product(flash_drive.id)
+    basket.add_product(heater, 1)
+    with pytest.raises(
+        ValueError, match="Exceeded maximum weight of products in the basket"
+    ):
+        basket.set_quantity(heater.id, 3)
+    assert (
+        basket.line_items == [(heater, 1)] and basket.total_weight == 40
+    ), "A rejected set_quantity must leave the basket unchanged"
+
+
+def test_merge_limits_are_checked_once(basket):
+    """Test that the limits are checked once, against the merged result."""
+    flash_drive = Product("Flash Drive", 10, 1)
+    heater = Product("Heater", 100, 40)
+    basket.add_product(flash_drive, 20)
+    guest = Basket()
+    guest.add_product(flash_drive, 10)
+
+    basket.merge(guest)
+    assert (
+        basket.item_count == basket.MAX_ITEMS
+    ), f"The basket should hold 30 units, but got {basket.item_count}"
+
+    guest.add_product(heater, 1)
+    with pytest.raises(
+        ValueError, match="Exceeded maximum number of items in the basket"
+    ):
+        basket.merge(guest)
+    assert basket.line_items == [
+        (flash_drive, 30)
+    ], "A rejected merge must leave the basket unchanged"
+
+    basket.merge(guest, strategy="replace")
+    assert basket.line_items == [(flash_drive, 10), (heater, 1)]
+
+
+def test_max_addable_is_exact(basket):
+    """Test that exactly max_addable more units can be added, and no more."""
+    heater = Product("Heater", 100, 7)
+    basket.add_product(heater, 3)
+
+    fits = basket.max_addable(heater)
+    basket.add_product(heater, fits)
+
+    assert basket.max_addable(heater) == 0 and not basket.can_add(heater)
+    with pytest.raises(ValueError):
+        basket.add_product(heater, 1)
+
+
+def test_preview_add_limit_violations(basket):
+    """Test that preview_add reports the limit an addition would exceed."""
+    flash_drive = Product("Flash Drive", 10, 1)
+    heater = Product("Heater", 100, 41)
+    basket.add_product(flash_drive, 20)
+
+    assert basket.preview_add(flash_drive, 10).violation is None
+    assert basket.preview_add(flash_drive, 11).violation == "max_items"
+    assert basket.preview_add(heater, 2).violation == "max_weight"
+    assert basket.preview_add(heater, 2).total_weight == 102
+    assert basket.item_count == 20, "A rejected preview must not change the basket"
+
+
 # Negative tests
 import pytest
 
@@ -481,6 +1052,26 @@ def test_invalid_data_in_basket_methods(
         basket.add_product(invalid_product, invalid_quantity)
 
 
+@pytest.mark.parametrize(
+    "invalid_item, message",
+    [
+        (("TV", 2), "Expected a Product object, got str"),
+        ((Product("Kettle", 300, 3), 0), "Expected a positive integer, got int"),
+        ((Product("Laptop", 1200, 5), "two"), "Expected a positive integer, got str"),
+    ],
+)
+def test_add_products_invalid_data(basket, invalid_item: tuple, message: str):
+    """Test that add_products raises the same TypeError as add_product and adds nothing."""
+    valid = Product("Flash Drive", 100, 1)
+
+    with pytest.raises(TypeError, match=message):
+        basket.add_products([(valid, 1), invalid_item])
+
+    assert (
+        basket.list_products == []
+    ), f"No products should be added from an invalid batch, but got {basket.list_products}"
+
+
 def test_delete_nonexistent_product(basket):
     """Test deleting a non-existent product."""
     basket.delete_product(999)
@@ -548,3 +1139,112 @@ def test_delete_product_invalid_unhashable_key(basket, invalid_key: Any):
         f"The basket should remain unchanged after attempting to delete with an unhashable key, "
         f"but the number of products changed from {count_before} to {len(basket.list_products)}"
     )
+
+
+@pytest.mark.parametrize("invalid_key", [[1], {1: "a"}])
+def test_delete_product_unhashable_key_empty_basket(basket, invalid_key: Any):
+    """Test that an empty basket ignores an unhashable key, as it always has."""
+    basket.delete_product(invalid_key)
+
+    assert basket.item_count == 0, "The empty basket should stay empty"
+    basket.add_product(Product("Kettle", 300, 3), 1)
+    with pytest.raises(TypeError):
+        basket.delete_product(invalid_key)
+
+
+@pytest.mark.parametrize("product_id", [999, "invalid_id", 1.5, (1,)])
+def test_quantity_changes_ignore_unknown_ids(basket, product_id: Hashable):
+    """Test that remove_quantity and set_quantity ignore unknown or invalid hashable IDs."""
+    product = Product("Blender", 100, 1)
+    basket.add_product(product, 2)
+
+    basket.remove_quantity(product_id, 1)
+    basket.set_quantity(product_id, 5)
+
+    assert basket.line_items == [
+        (product, 2)
+    ], f"The basket should remain unchanged, but got {basket.line_items}"
+
+
+@pytest.mark.parametrize("product_id", [[1], {1: "a"}])
+def test_quantity_changes_unhashable_id(basket, product_id: Any):
+    """Test that remove_quantity and set_quantity raise TypeError for unhashable IDs."""
+    product = Product("Blender", 100, 1)
+    basket.add_product(product, 2)
+
+    with pytest.raises(TypeError):
+        basket.remove_quantity(product_id, 1)
+    with pytest.raises(TypeError):
+        basket.set_quantity(product_id, 1)
+
+    assert basket.line_items == [(product, 2)], "The basket should remain unchanged"
+
+
+@pytest.mark.parametrize("quantity", [0, -1, 1.5, "2", None])
+def test_remove_quantity_invalid_quantity(basket, quantity: Any):
+    """Test that remove_quantity requires a positive integer quantity."""
+    product = Product("Blender", 100, 1)
+    basket.add_product(product, 2)
+
+    with pytest.raises(TypeError, match="Expected a positive integer"):
+        basket.remove_quantity(product.id, quantity)
+    assert basket.item_count == 2, "The basket should remain unchanged"
+
+
+@pytest.mark.parametrize("quantity", [-1, 1.5, "2", None])
+def test_set_quantity_invalid_quantity(basket, quantity: Any):
+    """Test that set_quantity requires a non-negative integer quantity."""
+    product = Product("Blender", 100, 1)
+    basket.add_product(product, 2)
+
+    with pytest.raises(TypeError, match="Expected a non-negative integer"):
+        basket.set_quantity(product.id, quantity)
+    assert basket.item_count == 2, "The basket should remain unchanged"
+
+
+@pytest.mark.parametrize("other", [None, [], "basket"])
+def test_merge_and_diff_invalid_basket(basket, other: Any):
+    """Test that merge and diff only accept baskets."""
+    with pytest.raises(TypeError, match="Expected a Basket object"):
+        basket.merge(other)
+    with pytest.raises(TypeError, match="Expected a Basket object"):
+        basket.diff(other)
+
+
+def test_merge_unknown_strategy(basket):
+    """Test that an unknown merge strategy is rejected."""
+    with pytest.raises(ValueError, match="Unknown merge strategy"):
+        basket.merge(Basket(), strategy="min")
+
+
+@pytest.mark.parametrize("product", [None, "TV", 42])
+def test_capacity_queries_invalid_product(basket, product: Any):
+    """Test that capacity queries require Product objects."""
+    with pytest.raises(TypeError, match="Expected a Product object"):
+        basket.max_addable(product)
+    with pytest.raises(TypeError, match="Expected a Product object"):
+        basket.can_add(product)
+    with pytest.raises(TypeError, match="Expected a Product object"):
+        basket.max_addable_many([Product("Kettle", 300, 3), product])
+
+
+@pytest.mark.parametrize("quantity", [0, -1, 1.5, "2"])
+def test_can_add_invalid_quantity(basket, quantity: Any):
+    """Test that can_add requires a positive integer quantity, like add_product."""
+    with pytest.raises(TypeError, match="Expected a positive integer"):
+        basket.can_add(Product("Kettle", 300, 3), quantity)
+
+
+@pytest.mark.parametrize(
+    "product, quantity, message",
+    [
+        ("TV", 1, "Expected a Product object"),
+        (None, 1, "Expected a Product object"),
+        (Product("Kettle", 300, 3), 0, "Expected a positive integer"),
+        (Product("Kettle", 300, 3), "2", "Expected a positive integer"),
+    ],
+)
+def test_preview_add_invalid_data(basket, product: Any, quantity: Any, message: str):
+    """Test that preview_add rejects the same inputs as add_product."""
+    with pytest.raises(TypeError, match=message):
+        basket.preview_add(product, quantity)
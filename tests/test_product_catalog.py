@@ -0,0 +1,123 @@
+import tracemalloc
+
+import pytest
+
+from product_basket import Product, ProductCatalog
+
+
+class _DictProduct:
+    """A dict-backed copy of Product, used as the memory baseline."""
+
+    def __init__(self, name: str, price: int, weight: int) -> None:
+        self._id = 0
+        self._name = name
+        self._price = price
+        self._weight = weight
+
+
+def _bytes_per_instance(factory, count: int = 10_000) -> float:
+    """Measures the average number of bytes allocated per created instance."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        instances = [factory(f"Product {i}", i + 1, 1) for i in range(count)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(instances) == count
+    return (after - before) / count
+
+
+# Positive tests
+def test_product_has_no_instance_dict():
+    """Test that Product is slotted and carries no per-instance __dict__."""
+    product = Product("Laptop", 1200, 5)
+
+    assert not hasattr(
+        product, "__dict__"
+    ), "Product instances should not have a __dict__"
+
+
+def test_product_memory_per_instance():
+    """
+    Test that a slotted Product uses less memory than a dict-backed one.
+
+    The names are created in both measurements, so the difference comes from
+    the instance layout alone.
+    """
+    slotted = _bytes_per_instance(Product)
+    dict_backed = _bytes_per_instance(_DictProduct)
+
+    assert slotted < dict_backed, (
+        f"A slotted Product should be smaller than a dict-backed one, "
+        f"but got {slotted:.0f} vs {dict_backed:.0f} bytes per product"
+    )
+
+
+def test_catalog_get_or_create_returns_shared_instance():
+    """Test that identical catalog entries resolve to the same Product instance."""
+    catalog = ProductCatalog()
+
+    first = catalog.get_or_create("Kettle", 300, 3)
+    second = catalog.get_or_create("Kettle", 300, 3)
+    other = catalog.get_or_create("Kettle", 350, 3)
+
+    assert first is second, "Identical entries should return the same instance"
+    assert first is not other, "Entries with different prices should not be shared"
+    assert catalog.get(first.id) is first, "get() should return the interned instance"
+    assert (
+        len(catalog) == 2
+    ), f"The catalog should hold 2 products, but got {len(catalog)}"
+
+
+def test_catalog_intern_by_id():
+    """Test that interning keeps the first instance registered under an ID."""
+    catalog = ProductCatalog()
+    product = Product("Toaster", 400, 4)
+
+    assert catalog.intern(product) is product, "A new product should be registered"
+    assert catalog.intern(product) is product, "Re-interning should be idempotent"
+    assert product.id in catalog, "The interned product ID should be in the catalog"
+    assert (
+        catalog.get_or_create("Toaster", 400, 4) is product
+    ), "An interned product should also be found by its attributes"
+
+
+def test_catalog_products_in_basket(basket):
+    """Test that interned products from a catalog behave like regular products in a basket."""
+    catalog = ProductCatalog()
+
+    basket.add_product(catalog.get_or_create("Kettle", 300, 3), 2)
+    basket.add_product(catalog.get_or_create("Kettle", 300, 3), 1)
+
+    assert basket.line_items == [
+        (catalog.get_or_create("Kettle", 300, 3), 3)
+    ], f"Both additions should land on one line, but got {basket.line_items}"
+
+
+# Negative tests
+def test_catalog_get_unknown_id():
+    """Test that looking up an unknown ID returns None."""
+    catalog = ProductCatalog()
+
+    assert catalog.get(999) is None, "An unknown ID should return None"
+    assert 999 not in catalog, "An unknown ID should not be in the catalog"
+
+
+@pytest.mark.parametrize("invalid_product", ["TV", None, 1])
+def test_catalog_intern_invalid_type(invalid_product):
+    """Test that interning something other than a Product raises TypeError."""
+    catalog = ProductCatalog()
+
+    with pytest.raises(TypeError, match="Expected a Product object"):
+        catalog.intern(invalid_product)
+
+
+def test_catalog_invalid_product_not_registered():
+    """Test that a failed creation leaves the catalog unchanged."""
+    catalog = ProductCatalog()
+
+    with pytest.raises(ValueError, match="Product price must be at least 1 unit"):
+        catalog.get_or_create("Defective Product", 0, 1)
+
+    assert len(catalog) == 0, "A failed creation should not register a product"
@@ -0,0 +1,206 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from product_basket import Product
+from product_ids import (
+    BlockIdAllocator,
+    CounterIdAllocator,
+    IdAllocator,
+    LocalBlockSource,
+    PrefixedIdAllocator,
+    SharedBlockSource,
+)
+
+PRODUCTS_PER_TASK = 2_000
+
+
+@pytest.fixture
+def restore_allocator():
+    """Fixture that restores the default Product ID allocator after a test."""
+    previous = Product._id_allocator
+    yield
+    Product.set_id_allocator(previous)
+
+
+def _create_prefixed_ids(worker_id: int) -> list[int]:
+    """Creates products in a worker process with a worker-prefixed allocator."""
+    Product.set_id_allocator(PrefixedIdAllocator(node_id=1, worker_id=worker_id))
+    return [Product("Item", 1, 1).id for _ in range(PRODUCTS_PER_TASK)]
+
+
+def _install_block_allocator(source: SharedBlockSource) -> None:
+    """Pool initializer that installs a block allocator over a shared source."""
+    Product.set_id_allocator(BlockIdAllocator(source, block_size=128))
+
+
+def _send_lease_error(source: LocalBlockSource, connection) -> None:
+    """Leases from an inherited source in a child and sends the error raised."""
+    try:
+        source.lease(1)
+    except RuntimeError as error:
+        connection.send(str(error))
+    else:
+        connection.send("")
+
+
+def _create_ids(_: int) -> list[int]:
+    """Creates products with whichever allocator the worker has installed."""
+    return [Product("Item", 1, 1).id for _ in range(PRODUCTS_PER_TASK)]
+
+
+# Positive tests
+def test_default_allocator_is_sequential(restore_allocator):
+    """Test that the default counter allocator hands out increasing IDs."""
+    Product.set_id_allocator(CounterIdAllocator(100))
+
+    ids = [Product("Item", 1, 1).id for _ in range(3)]
+
+    assert ids == [100, 101, 102], f"Expected sequential IDs, but got {ids}"
+
+
+def test_set_id_allocator_returns_previous(restore_allocator):
+    """Test that installing an allocator returns the one it replaces."""
+    first = CounterIdAllocator()
+    Product.set_id_allocator(first)
+
+    assert (
+        Product.set_id_allocator(CounterIdAllocator()) is first
+    ), "set_id_allocator should return the previously installed allocator"
+
+
+def test_block_allocator_leases_blocks():
+    """Test that a block allocator touches its source once per block."""
+    source = LocalBlockSource(start=1)
+    allocator = BlockIdAllocator(source, block_size=10)
+
+    ids = [allocator.next_id() for _ in range(25)]
+
+    assert ids == list(range(1, 26)), f"Expected IDs 1..25, but got {ids}"
+    assert (
+        source.lease(1) == 31
+    ), "Three blocks of 10 IDs should have been leased from the source"
+
+
+def test_block_allocator_unique_across_threads(restore_allocator):
+    """Test that products created from many threads get unique IDs."""
+    Product.set_id_allocator(BlockIdAllocator(LocalBlockSource(), block_size=64))
+    results: list[list[int]] = [[] for _ in range(8)]
+
+    def create(index: int) -> None:
+        results[index] = [Product("Item", 1, 1).id for _ in range(PRODUCTS_PER_TASK)]
+
+    threads = [threading.Thread(target=create, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [product_id for chunk in results for product_id in chunk]
+    assert len(ids) == 8 * PRODUCTS_PER_TASK
+    assert len(set(ids)) == len(ids), "Product IDs created from threads must be unique"
+
+
+def test_prefixed_allocator_layout():
+    """Test that prefixed IDs encode the node and worker and fit in 63 bits."""
+    allocator = PrefixedIdAllocator(node_id=65535, worker_id=4095)
+
+    product_id = allocator.next_id()
+
+    assert product_id < 1 << 63, "Prefixed IDs must fit in a signed 64-bit integer"
+    assert product_id >> PrefixedIdAllocator.SEQUENCE_BITS == (65535 << 12) | 4095
+    assert (
+        PrefixedIdAllocator(0, 0).next_id() != 0
+    ), "The first ID of node 0 / worker 0 should not be 0"
+
+
+def test_prefixed_ids_unique_across_processes():
+    """Test that worker-prefixed IDs created in separate processes never collide."""
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        chunks = list(pool.map(_create_prefixed_ids, range(8)))
+
+    ids = [product_id for chunk in chunks for product_id in chunk]
+    assert len(set(ids)) == len(ids), "Prefixed IDs from different workers collided"
+
+
+def test_shared_block_ids_unique_across_processes():
+    """Test that blocks leased from a shared source never overlap across processes."""
+    source = SharedBlockSource()
+    with ProcessPoolExecutor(
+        max_workers=4, initializer=_install_block_allocator, initargs=(source,)
+    ) as pool:
+        chunks = list(pool.map(_create_ids, range(8)))
+
+    ids = [product_id for chunk in chunks for product_id in chunk]
+    assert len(ids) == 8 * PRODUCTS_PER_TASK
+    assert len(set(ids)) == len(ids), "IDs leased from a shared source collided"
+
+
+def test_block_ids_unique_after_fork(restore_allocator):
+    """Test that forked workers do not reuse the block leased before the fork."""
+    Product.set_id_allocator(BlockIdAllocator(SharedBlockSource(), block_size=100))
+    before_fork = Product("Item", 1, 1).id
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=2, mp_context=context) as pool:
+        chunks = list(pool.map(_create_ids, range(4)))
+    after_fork = [Product("Item", 1, 1).id for _ in range(5)]
+
+    ids = [before_fork, *after_fork, *(i for chunk in chunks for i in chunk)]
+    assert len(set(ids)) == len(ids), "IDs from the parent and its forks collided"
+
+
+def test_prefixed_ids_in_basket(basket, restore_allocator):
+    """Test that products with large prefixed IDs can be added and deleted."""
+    Product.set_id_allocator(PrefixedIdAllocator(node_id=3, worker_id=7))
+    kettle = Product("Kettle", 300, 3)
+    toaster = Product("Toaster", 400, 4)
+
+    basket.add_product(kettle, 2)
+    basket.add_product(toaster, 1)
+    basket.delete_product(kettle.id)
+
+    assert basket.line_items == [
+        (toaster, 1)
+    ], f"Only the toaster should remain, but got {basket.line_items}"
+
+
+# Negative tests
+def test_id_allocator_is_abstract():
+    """Test that an allocator without next_id cannot be instantiated."""
+    with pytest.raises(TypeError, match="abstract"):
+        IdAllocator()
+
+
+def test_set_invalid_id_allocator():
+    """Test that installing something other than an IdAllocator raises TypeError."""
+    with pytest.raises(TypeError, match="Expected an IdAllocator object"):
+        Product.set_id_allocator(lambda: 1)
+
+
+@pytest.mark.parametrize("node_id, worker_id", [(-1, 0), (1 << 16, 0), (0, 1 << 12)])
+def test_prefixed_allocator_out_of_range(node_id: int, worker_id: int):
+    """Test that out-of-range node or worker prefixes are rejected."""
+    with pytest.raises(ValueError, match="must be in"):
+        PrefixedIdAllocator(node_id, worker_id)
+
+
+def test_local_block_source_refuses_forked_child():
+    """Test that a forked child cannot lease the parent's next local block."""
+    source = LocalBlockSource(start=11)
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    child = context.Process(target=_send_lease_error, args=(source, sender))
+    child.start()
+    error = receiver.recv()
+    child.join()
+
+    assert "forked process" in error, f"Leasing should fail, but got {error!r}"
+    assert source.lease(3) == 11, "The parent should keep leasing from 11"
+
+
+def test_block_allocator_invalid_block_size():
+    """Test that a block size below 1 is rejected."""
+    with pytest.raises(ValueError, match="Block size must be at least 1"):
+        BlockIdAllocator(LocalBlockSource(), block_size=0)
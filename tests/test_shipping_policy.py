@@ -0,0 +1,146 @@
+import pytest
+
+from basket_batch import BasketBatch
+from product_basket import Basket, Product
+from shipping_policy import DEFAULT_SHIPPING_POLICY, ShippingPolicy
+
+
+def _linear_quote(thresholds: list[int], costs: list[int], total_price: int) -> int:
+    """Reference implementation: scan the tiers from the top."""
+    if total_price == 0:
+        return 0
+    for threshold, cost in reversed(list(zip(thresholds, costs[1:]))):
+        if total_price >= threshold:
+            return cost
+    return costs[0]
+
+
+# Positive tests
+@pytest.mark.parametrize(
+    "total_price, expected_shipping",
+    [(0, 0), (1, 250), (499, 250), (500, 100), (999, 100), (1000, 0), (10**9, 0)],
+)
+def test_default_policy_tiers(total_price: int, expected_shipping: int):
+    """Test that the default policy reproduces the original shipping tiers."""
+    assert (
+        DEFAULT_SHIPPING_POLICY.quote(total_price) == expected_shipping
+    ), f"The shipping cost for {total_price} should be {expected_shipping} units"
+
+
+@pytest.mark.parametrize(
+    "total_price, expected_threshold",
+    [(0, 500), (499, 500), (500, 1000), (999, 1000), (1000, None)],
+)
+def test_next_threshold(total_price: int, expected_threshold: int | None):
+    """Test that next_threshold returns the breakpoint of the next tier."""
+    threshold = DEFAULT_SHIPPING_POLICY.next_threshold(total_price)
+    assert (
+        threshold == expected_threshold
+    ), f"The next threshold should be {expected_threshold}, but got {threshold}"
+
+
+def test_policy_with_many_breakpoints():
+    """Test a regional table with dozens of breakpoints against a linear scan."""
+    thresholds = list(range(100, 5001, 100))
+    costs = [500 - 10 * i for i in range(len(thresholds) + 1)]
+    policy = ShippingPolicy(thresholds, costs)
+
+    for total_price in range(0, 5200, 7):
+        assert policy.quote(total_price) == _linear_quote(
+            thresholds, costs, total_price
+        ), f"Unexpected shipping cost for total price {total_price}"
+
+
+def test_policy_memoizes_quotes_per_version():
+    """Test that quotes are memoized and never reused after the tiers change."""
+    policy = ShippingPolicy((500,), (250, 0))
+
+    assert policy.quote(300) == 250
+    assert (policy.version, 300) in policy._cache, "The quote should be memoized"
+
+    policy.set_tiers((200,), (50, 10))
+
+    assert policy.quote(300) == 10, "A quote from the old tiers must not be reused"
+    assert policy.version == 2, f"The version should be 2, but got {policy.version}"
+
+
+def test_policy_cache_is_bounded():
+    """Test that the quote cache never grows beyond its configured size."""
+    policy = ShippingPolicy((500,), (250, 0), cache_size=10)
+
+    for total_price in range(1, 100):
+        policy.quote(total_price)
+
+    assert len(policy._cache) <= 10, f"The cache grew to {len(policy._cache)} entries"
+
+
+def test_basket_uses_its_shipping_policy():
+    """Test that a basket configured with a regional policy quotes with it."""
+    policy = ShippingPolicy((300, 2000), (400, 150, 0))
+    basket = Basket(shipping_policy=policy)
+    basket.add_product(Product("Kettle", 300, 3), 2)
+
+    assert basket.shipping_policy is policy
+    assert (
+        basket.get_shipping_cost == 150
+    ), f"The shipping cost should be 150 units, but got {basket.get_shipping_cost}"
+    assert (
+        basket.get_price == 750
+    ), f"The final price should be 750 units, but got {basket.get_price}"
+
+
+def test_batch_uses_shipping_policy():
+    """Test that batch pricing matches baskets quoted with the same policy."""
+    policy = ShippingPolicy((300, 2000), (400, 150, 0))
+    baskets = []
+    for quantity in range(1, 8):
+        basket = Basket(shipping_policy=policy)
+        basket.add_product(Product("Kettle", 300, 3), quantity)
+        baskets.append(basket)
+    baskets.append(Basket(shipping_policy=policy))
+
+    batch = BasketBatch.from_baskets(baskets, shipping_policy=policy)
+
+    assert batch.get_shipping_cost.tolist() == [b.get_shipping_cost for b in baskets]
+    assert batch.get_price.tolist() == [b.get_price for b in baskets]
+
+
+def test_batch_uses_each_basket_policy():
+    """Test that a batch prices each basket with its own policy by default."""
+    policies = [None, ShippingPolicy((2000,), (999, 0)), ShippingPolicy((100,), (7, 0))]
+    baskets = []
+    for policy in policies * 2:
+        basket = Basket(shipping_policy=policy)
+        basket.add_product(Product("Kettle", 300, 3), len(baskets) + 1)
+        baskets.append(basket)
+    baskets.append(Basket(shipping_policy=policies[1]))
+
+    batch = BasketBatch.from_baskets(baskets)
+
+    expected = [b.get_shipping_cost for b in baskets]
+    assert (
+        batch.get_shipping_cost.tolist() == expected
+    ), f"Shipping costs should be {expected}, but got {batch.get_shipping_cost}"
+    assert batch.get_price.tolist() == [b.get_price for b in baskets]
+
+
+# Negative tests
+@pytest.mark.parametrize(
+    "thresholds, costs, message",
+    [
+        ((500, 1000), (250, 100), "exactly one more cost than thresholds"),
+        ((1000, 500), (250, 100, 0), "strictly increasing"),
+        ((500, 500), (250, 100, 0), "strictly increasing"),
+        ((500,), (250, -1), "must not be negative"),
+    ],
+)
+def test_invalid_policy(thresholds: tuple, costs: tuple, message: str):
+    """Test that malformed tier tables are rejected."""
+    with pytest.raises(ValueError, match=message):
+        ShippingPolicy(thresholds, costs)
+
+
+def test_basket_invalid_shipping_policy():
+    """Test that a basket rejects a shipping policy of the wrong type."""
+    with pytest.raises(TypeError, match="Expected a ShippingPolicy object"):
+        Basket(shipping_policy={500: 250})
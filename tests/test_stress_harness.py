@@ -0,0 +1,85 @@
+from basket_limits import BasketLimits
+from product_basket import Basket
+from tests.stress_harness import check, generate, main, run, sequence_seed, shrink
+
+
+class _LeakyDeleteBasket(Basket):
+    """A basket with a planted bug: deleting a line keeps its weight."""
+
+    def delete_product(self, product_id):
+        line = self._products.get(product_id)
+        super().delete_product(product_id)
+        if line is not None:
+            self._total_weight += line.product.weight * line.quantity
+
+
+def _leaky_basket(limits: BasketLimits) -> Basket:
+    return _LeakyDeleteBasket(limits=limits)
+
+
+def _first_failing_seed(basket_factory, length: int = 200) -> int:
+    """Returns the first sequence seed on which the factory's basket fails."""
+    for index in range(1000):
+        seed = sequence_seed(0, index)
+        if check(seed, generate(seed, length), basket_factory) is not None:
+            return seed
+    raise AssertionError("The planted bug was never found")
+
+
+# Positive tests
+def test_basket_matches_reference_model():
+    """Test that Basket agrees with the reference model on random sequences."""
+    total, failure = run(20_000, seed=1)
+
+    assert failure is None, f"Basket disagrees with the model: {failure}"
+    assert total == 20_000, f"Expected 20000 operations, but ran {total}"
+
+
+def test_run_across_processes():
+    """Test that a run can be spread over worker processes."""
+    total, failure = run(4_000, seed=2, workers=2, length=100)
+
+    assert failure is None, f"Basket disagrees with the model: {failure}"
+    assert total == 4_000, f"Expected 4000 operations, but ran {total}"
+
+
+def test_sequences_are_reproducible():
+    """Test that a seed always generates the same sequence."""
+    seed = sequence_seed(3, 7)
+
+    assert generate(seed, 100) == generate(seed, 100)
+    assert generate(seed, 100) != generate(seed + 1, 100)
+    assert check(seed, generate(seed, 100)) is None
+
+
+def test_main_reports_success(capsys):
+    """Test that the command line run reports agreement and exits with 0."""
+    assert main(["--operations", "1000", "--seed", "4"]) == 0
+    assert "agrees with the reference model" in capsys.readouterr().out
+
+
+# Boundary tests
+def test_shrinks_to_minimal_reproducer():
+    """Test that a failing sequence is shrunk to the two steps that trigger the bug."""
+    seed = _first_failing_seed(_leaky_basket)
+
+    minimal = shrink(seed, generate(seed, 200), _leaky_basket)
+
+    assert len(minimal) == 2, f"Expected an add and a delete, but got {minimal}"
+    assert minimal[0][0] in ("add_product", "add_products")
+    assert minimal[1][0] == "delete_product"
+    assert check(seed, minimal, _leaky_basket) is not None
+    assert check(seed, minimal) is None, "The reproducer passes on the real Basket"
+
+
+# Negative tests
+def test_error_mismatch_is_reported():
+    """Test that a basket raising where the model does not is a failure."""
+
+    def looser_limits(limits: BasketLimits) -> Basket:
+        return Basket(limits=BasketLimits(limits.max_items + 5, limits.max_weight))
+
+    seed = _first_failing_seed(looser_limits)
+    step, message = check(seed, generate(seed, 200), looser_limits)
+
+    assert "model raised ('ValueError'" in message, f"Unexpected report {message}"